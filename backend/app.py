@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, make_response, send_file, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_mail import Mail, Message
@@ -10,30 +10,76 @@ import bcrypt
 import json
 import random
 import string
-from datetime import datetime, timedelta, timezone
-import openpyxl
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
+from datetime import date, datetime, timedelta, timezone
 import io
+import csv
+import re
+import time
+import uuid
+import hashlib
+import functools
+import sqlite3
+import tempfile
+from collections import Counter, defaultdict
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
 
 from config import Config
+from background import register_periodic, start_periodic_jobs, submit_task
+from cache import Cache, LocalCache, create_cache
+from compression import init_compression
+from events import EventHub, format_sse
+from exports import (
+    TABULAR_FORMATS, XLSX_MIMETYPE, merge_xlsx, spool_chunks, stream_zip, tabular_chunks, tabular_response,
+    write_pdf_report, write_xlsx, write_zip
+)
+from http_cache import ResponseCache
+from json_provider import FastJSONProvider
+from form_schemas import (
+    CHOICE_FIELD_TYPES, FormSchemaError, parse_form_schema, validate_form_response
+)
+from parallel_exports import build_branch_reports
+from previews import ensure_preview, render_preview
+from storage import (
+    certificate_key, form_prefix, form_response_prefix, form_staging_prefix, get_storage,
+    legacy_form_response_prefix, legacy_form_staging_prefix, normalize_certificate_key, resolve_certificate_key,
+    resolve_form_response_prefix, send_stored_file
+)
+from utils import format_date, format_datetime
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = FastJSONProvider(app)
 
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 db = SQLAlchemy(app)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets background workers write (job progress, reaper batches) while
+    # a request or export is still reading from another connection
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.close()
 # Normalize Gmail app password (allow spaces in .env but strip for SMTP auth)
 if isinstance(app.config.get('MAIL_PASSWORD'), str):
     app.config['MAIL_PASSWORD'] = app.config['MAIL_PASSWORD'].replace(' ', '')
 
 mail = Mail(app)
-CORS(app)
+# Retry-After tells event pollers on another origin when to come back
+CORS(app, expose_headers=['Retry-After'])
+init_compression(app)
+
+@app.before_request
+def ensure_background_jobs():
+    # Started lazily so importing the app (init_db.py, scripts) spawns no threads
+    start_periodic_jobs(app)
 
 # Time helpers
 def utcnow_naive():
@@ -86,6 +132,9 @@ class Student(db.Model):
     year = db.Column(db.String(10))
     password = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=utcnow_naive)
+    __table_args__ = (
+        db.Index('ix_students_roster', 'branch', 'year', 'section', 'id'),
+    )
 
 class Admin(db.Model):
     __tablename__ = 'admins'
@@ -145,6 +194,12 @@ class Form(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=utcnow_naive)
     form_fields = db.Column(db.Text)  # JSON string containing form fields
+    schema_version = db.Column(db.Integer, nullable=False, default=1)  # Bump whenever form_fields changes
+    deleted_at = db.Column(db.DateTime)  # Tombstone; files and rows are reaped in the background
+    closed_at = db.Column(db.DateTime)  # Set by the lifecycle job when the deadline passes
+    __table_args__ = (
+        db.Index('ix_forms_branch_active_deadline', 'branch', 'is_active', 'deadline'),
+    )
 
 class FormResponse(db.Model):
     __tablename__ = 'form_responses'
@@ -153,8 +208,254 @@ class FormResponse(db.Model):
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     responses = db.Column(db.Text)  # JSON string containing responses
     submitted_at = db.Column(db.DateTime, default=utcnow_naive)
+    __table_args__ = (
+        db.Index('ix_form_responses_form_student', 'form_id', 'student_id'),
+    )
+
+class FormAnswer(db.Model):
+    """One answered value of a form response, typed so answers can be filtered and counted in SQL.
+
+    Derived from FormResponse.responses, which stays the source of truth.
+    Multi-valued answers (checkboxes, several files) get a row per value.
+    """
+    __tablename__ = 'form_answers'
+    id = db.Column(db.Integer, primary_key=True)
+    response_id = db.Column(db.Integer, db.ForeignKey('form_responses.id'), nullable=False, index=True)
+    form_id = db.Column(db.Integer, db.ForeignKey('forms.id'), nullable=False)
+    field_id = db.Column(db.String(50), nullable=False)
+    value_text = db.Column(db.Text, nullable=False)
+    value_number = db.Column(db.Float)  # Set for number fields
+    value_date = db.Column(db.Date)  # Set for date fields
+    __table_args__ = (
+        db.Index('ix_form_answers_form_field_value', 'form_id', 'field_id', 'value_text'),
+    )
+
+class FormOptionCount(db.Model):
+    """Responses that picked each option of a choice field, kept current on submit"""
+    __tablename__ = 'form_option_counts'
+    form_id = db.Column(db.Integer, db.ForeignKey('forms.id'), primary_key=True)
+    field_id = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.String(255), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class FormFieldCount(db.Model):
+    """Responses answering a field and values given (files uploaded, options checked)"""
+    __tablename__ = 'form_field_counts'
+    form_id = db.Column(db.Integer, db.ForeignKey('forms.id'), primary_key=True)
+    field_id = db.Column(db.String(50), primary_key=True)
+    answered = db.Column(db.Integer, nullable=False, default=0)
+    value_count = db.Column(db.Integer, nullable=False, default=0)
+
+class FormDailyCount(db.Model):
+    """Responses submitted to a form per UTC day"""
+    __tablename__ = 'form_daily_counts'
+    form_id = db.Column(db.Integer, db.ForeignKey('forms.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class FormDeletion(db.Model):
+    __tablename__ = 'form_deletions'
+    id = db.Column(db.Integer, primary_key=True)
+    form_id = db.Column(db.Integer, nullable=False, index=True)  # No FK: the form row is reaped last
+    admin_id = db.Column(db.Integer, db.ForeignKey('admins.id'))
+    status = db.Column(db.String(20), db.CheckConstraint("status IN ('Pending', 'Running', 'Done')"), default='Pending')
+    responses_total = db.Column(db.Integer, default=0)
+    responses_deleted = db.Column(db.Integer, default=0)
+    files_deleted = db.Column(db.Integer, default=0)
+    requested_at = db.Column(db.DateTime, default=utcnow_naive)
+    updated_at = db.Column(db.DateTime, default=utcnow_naive)
+    completed_at = db.Column(db.DateTime)
+
+class DataVersion(db.Model):
+    """Counter bumped on every write to a data set, for invalidating derived data"""
+    __tablename__ = 'data_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=utcnow_naive)
+
+class ReportJob(db.Model):
+    __tablename__ = 'report_jobs'
+    id = db.Column(db.String(32), primary_key=True)
+    admin_id = db.Column(db.Integer, db.ForeignKey('admins.id'))
+    kind = db.Column(db.String(30), nullable=False)
+    export_type = db.Column(db.String(10), nullable=False)
+    params = db.Column(db.Text, nullable=False)  # JSON string of the normalized request
+    params_hash = db.Column(db.String(64), nullable=False, index=True)
+    data_version = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), db.CheckConstraint("status IN ('Pending', 'Running', 'Done', 'Failed')"), default='Pending')
+    progress = db.Column(db.Integer, default=0)  # Percent
+    total_rows = db.Column(db.Integer)
+    artifact_key = db.Column(db.String(255))
+    download_name = db.Column(db.String(100))
+    mimetype = db.Column(db.String(100))
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=utcnow_naive)
+    completed_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class Event(db.Model):
+    """Outbox of change notifications pushed to connected clients (see events.py)"""
+    __tablename__ = 'events'
+    id = db.Column(db.Integer, primary_key=True)
+    channel = db.Column(db.String(120), nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    data = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=utcnow_naive, index=True)
+    seq = db.Column(db.Integer)  # Position in commit order, assigned by sequence_events()
+    __table_args__ = (
+        db.Index('ix_events_seq', 'seq', unique=True),
+        db.Index('ix_events_channel_seq', 'channel', 'seq'),
+    )
+
+# Columns added after the first release; db.create_all() does not alter existing tables
+# table -> {column: (type, constraints)}; types are compiled for the database in use
+SCHEMA_ADDITIONS = {
+    'forms': {
+        'deleted_at': (db.DateTime(), ''),
+        'schema_version': (db.Integer(), 'NOT NULL DEFAULT 1'),
+        'closed_at': (db.DateTime(), ''),
+    },
+    'events': {
+        'seq': (db.Integer(), ''),
+    },
+}
+
+def ensure_schema():
+    """Create missing tables, and add columns and indexes introduced since the database was created"""
+    db.create_all()
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table, columns in SCHEMA_ADDITIONS.items():
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name, (column_type, constraints) in columns.items():
+                if name not in existing:
+                    ddl = f'{column_type.compile(dialect=conn.dialect)} {constraints}'.rstrip()
+                    conn.execute(db.text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
 
 # Utility functions
+# Dialects whose INSERT supports on_conflict_do_update
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+def supports_upsert():
+    return db.engine.dialect.name in UPSERT_INSERTS
+
+def dialect_insert(model):
+    """INSERT supporting on_conflict_do_update; only for dialects in UPSERT_INSERTS"""
+    insert = UPSERT_INSERTS.get(db.engine.dialect.name)
+    if insert is None:
+        raise NotImplementedError(f'No upsert support for the {db.engine.dialect.name} dialect')
+    return insert(model)
+
+def update_or_insert(model, key, values, changes):
+    """Upsert for dialects without on_conflict_do_update.
+
+    Applies changes to the row matching key, or inserts key and values when
+    there is none. A row inserted concurrently makes the insert fail inside
+    its savepoint, and the update is then applied to that row instead.
+    """
+    where = [getattr(model, column) == value for column, value in key.items()]
+    if db.session.execute(db.update(model).where(*where).values(changes)).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(db.insert(model).values(**key, **values))
+    except IntegrityError:
+        db.session.execute(db.update(model).where(*where).values(changes))
+
+def bump_data_version(*names):
+    """Record a write to the named data sets; call before the commit making it.
+
+    Cache entries tagged with the names are invalidated once the commit succeeds.
+    """
+    db.session.info.setdefault('invalidate_tags', set()).update(names)
+    now = utcnow_naive()
+    for name in names:
+        if not supports_upsert():
+            update_or_insert(
+                DataVersion, {'name': name}, {'version': 1, 'updated_at': now},
+                {'version': DataVersion.version + 1, 'updated_at': now}
+            )
+            continue
+        db.session.execute(
+            dialect_insert(DataVersion)
+            .values(name=name, version=1, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=['name'],
+                set_={'version': DataVersion.version + 1, 'updated_at': now}
+            )
+        )
+
+def current_data_version(*names):
+    """Return a token that changes whenever any of the named data sets is written"""
+    versions = dict(db.session.query(DataVersion.name, DataVersion.version).filter(DataVersion.name.in_(names)))
+    return '.'.join(str(versions.get(name, 0)) for name in names)
+
+# Derived data shared by every worker when CACHE_BACKEND=redis (see cache.py)
+cache = create_cache(app.config)
+
+def cache_key(key, *data_sets):
+    """Key for a cache entry derived from the named data sets.
+
+    Tag invalidation only reaches the cache of the process that commits, so
+    with the per-process backend the key also carries the data sets' current
+    version (as roster_size does): a write through any worker changes it.
+    """
+    if cache.backend.shared:
+        return key
+    return f'{key}@{current_data_version(*data_sets)}'
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_committed_tags(session):
+    tags = session.info.pop('invalidate_tags', None)
+    if tags:
+        cache.invalidate(*tags)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_rolled_back_tags(session):
+    session.info.pop('invalidate_tags', None)
+
+# Rendered GET responses, shared by every request this process serves
+response_cache = ResponseCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_MAX_BYTES)
+
+def versioned(*data_sets):
+    """Serve a GET endpoint conditionally, with an ETag derived from data versions.
+
+    data_sets are DataVersion names, or callables building a scoped name from
+    the request (e.g. one counter per admin); every write to them must
+    bump_data_version(). The ETag hashes the request URL with the current
+    versions, so a matching If-None-Match is answered with 304 before the
+    view runs, and rendered bodies are reused from response_cache.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            names = [name(request) if callable(name) else name for name in data_sets]
+            # Versions are read before the view runs, so a body is never older than its ETag
+            token = current_data_version(*names)
+            etag = hashlib.sha1(f"{request.full_path}|{token}".encode('utf-8')).hexdigest()
+            
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                cached = response_cache.get(etag)
+                if cached:
+                    body, mimetype = cached
+                    response = Response(body, mimetype=mimetype)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    response_cache.put(etag, response.get_data(), response.mimetype)
+            response.set_etag(etag)
+            # Let browsers keep the body but revalidate it on every use
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
 def hash_password(password):
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
@@ -331,6 +632,9 @@ ADMIN_CREDENTIALS = {
     'super@admin': {'password': 'Superadmin@srit', 'branch': 'SUPER ADMIN', 'role': 'superadmin'}
 }
 
+def is_super_admin(admin):
+    return ADMIN_CREDENTIALS.get('super@admin', {}).get('branch') == admin.branch
+
 # Routes
 @app.route('/api/auth/student/send-otp', methods=['POST'])
 def send_registration_otp():
@@ -412,7 +716,11 @@ def student_register():
         )
         
         db.session.add(new_student)
+        bump_data_version('students')
         db.session.commit()
+        roster_sizes.clear()
+        # A lookup of the new id before it existed may have cached None
+        cache.invalidate(f'student:{new_student.id}')
         
         return jsonify({'message': 'Student registered successfully'}), 201
         
@@ -593,25 +901,41 @@ def get_student_profile():
         if not student_id:
             return jsonify({'error': 'Student ID is required'}), 400
         
-        student = db.session.get(Student, student_id)
-        if not student:
+        profile = student_profile(student_id)
+        if not profile:
             return jsonify({'error': 'Student not found'}), 404
         
-        return jsonify({
-            'id': student.id,
-            'name': student.name,
-            'rollnumber': student.rollnumber,
-            'email': student.email,
-            'phone': student.phone,
-            'gender': student.gender,
-            'branch': student.branch,
-            'section': student.section,
-            'year': student.year
-        }), 200
+        return jsonify(profile), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def student_profile_to_dict(student):
+    return {
+        'id': student.id,
+        'name': student.name,
+        'rollnumber': student.rollnumber,
+        'email': student.email,
+        'phone': student.phone,
+        'gender': student.gender,
+        'branch': student.branch,
+        'section': student.section,
+        'year': student.year
+    }
+
+def student_profile(student_id):
+    """Return a student's profile dict, or None if there is no such student, through the cache"""
+    try:
+        student_id = int(student_id)
+    except (TypeError, ValueError):
+        return None
+    
+    def load():
+        student = db.session.get(Student, student_id)
+        return student_profile_to_dict(student) if student else None
+    
+    return cache.get_or_set(cache_key(f'student:{student_id}', 'students'), load, tags=(f'student:{student_id}',))
+
 @app.route('/api/student/profile', methods=['PUT'])
 def update_student_profile():
     try:
@@ -643,7 +967,10 @@ def update_student_profile():
         if 'year' in data:
             student.year = data['year']
         
+        bump_data_version('students')
         db.session.commit()
+        roster_sizes.clear()
+        cache.invalidate(f'student:{student.id}')
         
         return jsonify({'message': 'Profile updated successfully'}), 200
         
@@ -675,8 +1002,8 @@ def upload_certificate():
         
         # Save file
         filename = f"{student.rollnumber}_{event_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        file_path = certificate_key(filename)
+        get_storage().put(file_path, file.stream, content_type='application/pdf')
         
         # Parse dates
         start_date_obj = None
@@ -702,14 +1029,24 @@ def upload_certificate():
         )
         
         db.session.add(certificate)
+        db.session.flush()
+        publish_certificate_event(
+            'certificate-uploaded', certificate.branch, 'Pending', [(certificate, None)],
+            certificate=admin_certificate_to_dict(certificate, student.rollnumber, student.section)
+        )
+        bump_data_version('certificates')
         db.session.commit()
         
+        # Render the review thumbnail off the request path
+        submit_task(app, render_preview, file_path)
+        
         return jsonify({'message': 'Certificate uploaded successfully'}), 201
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/student/certificates', methods=['GET'])
+@versioned('certificates')
 def get_student_certificates():
     try:
         student_id = request.args.get('student_id')
@@ -718,24 +1055,23 @@ def get_student_certificates():
         
         certificates = Certificate.query.filter_by(student_id=student_id).all()
         
-        certificate_list = []
-        for cert in certificates:
-            certificate_list.append({
-                'id': cert.id,
-                'certificate_name': cert.certificate_name,
-                'event_type': cert.event_type,
-                'start_date': cert.start_date.strftime('%Y-%m-%d') if cert.start_date else None,
-                'end_date': cert.end_date.strftime('%Y-%m-%d') if cert.end_date else None,
-                'status': cert.status,
-                'uploaded_at': cert.uploaded_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'file_path': cert.file_path
-            })
-        
-        return jsonify({'certificates': certificate_list}), 200
+        return jsonify({'certificates': [student_certificate_to_dict(cert) for cert in certificates]}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def student_certificate_to_dict(cert):
+    return {
+        'id': cert.id,
+        'certificate_name': cert.certificate_name,
+        'event_type': cert.event_type,
+        'start_date': format_date(cert.start_date),
+        'end_date': format_date(cert.end_date),
+        'status': cert.status,
+        'uploaded_at': format_datetime(cert.uploaded_at),
+        'file_path': cert.file_path
+    }
+
 @app.route('/api/student/certificate/<int:certificate_id>/download', methods=['GET'])
 def download_certificate(certificate_id):
     try:
@@ -743,13 +1079,14 @@ def download_certificate(certificate_id):
         if not certificate:
             return jsonify({'error': 'Certificate not found'}), 404
         
-        if not os.path.exists(certificate.file_path):
+        file_key = resolve_certificate_key(certificate.file_path)
+        if not file_key:
             return jsonify({'error': 'Certificate file not found'}), 404
         
-        return send_file(
-            certificate.file_path,
+        return send_stored_file(
+            file_key,
             as_attachment=True,
-            download_name=os.path.basename(certificate.file_path),
+            download_name=file_key.rsplit('/', 1)[-1],
             mimetype='application/pdf'
         )
         
@@ -763,11 +1100,12 @@ def view_certificate(certificate_id):
         if not certificate:
             return jsonify({'error': 'Certificate not found'}), 404
         
-        if not os.path.exists(certificate.file_path):
+        file_key = resolve_certificate_key(certificate.file_path)
+        if not file_key:
             return jsonify({'error': 'Certificate file not found'}), 404
         
-        return send_file(
-            certificate.file_path,
+        return send_stored_file(
+            file_key,
             as_attachment=False,
             mimetype='application/pdf'
         )
@@ -775,7 +1113,33 @@ def view_certificate(certificate_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/student/certificate/<int:certificate_id>/preview', methods=['GET'])
+def preview_certificate(certificate_id):
+    try:
+        certificate = db.session.get(Certificate, certificate_id)
+        if not certificate:
+            return jsonify({'error': 'Certificate not found'}), 404
+        
+        file_key = resolve_certificate_key(certificate.file_path)
+        if not file_key:
+            return jsonify({'error': 'Certificate file not found'}), 404
+        
+        # Previews are rendered on upload; fall back to rendering once on a miss
+        preview_key = ensure_preview(file_key)
+        if not preview_key:
+            return jsonify({'error': 'Preview not available'}), 404
+        
+        return send_stored_file(
+            preview_key,
+            mimetype='image/webp',
+            max_age=app.config['PREVIEW_CACHE_SECONDS']
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/admin/dashboard', methods=['GET'])
+@versioned('certificates', 'students')
 def admin_dashboard():
     try:
         # Get admin branch from request headers or query params
@@ -786,12 +1150,6 @@ def admin_dashboard():
         if admin_branch:
             query = query.filter_by(branch=admin_branch)
         
-        # Get statistics filtered by branch
-        total_certificates = query.count()
-        pending_certificates = query.filter_by(status='Pending').count()
-        approved_certificates = query.filter_by(status='Approved').count()
-        rejected_certificates = query.filter_by(status='Rejected').count()
-        
         # Get recent certificates filtered by branch
         recent_certificates = query.order_by(Certificate.uploaded_at.desc()).limit(10).all()
         
@@ -804,22 +1162,33 @@ def admin_dashboard():
                 'rollnumber': student.rollnumber if student else 'N/A',
                 'event_type': cert.event_type,
                 'status': cert.status,
-                'uploaded_at': cert.uploaded_at.strftime('%Y-%m-%d %H:%M:%S')
+                'uploaded_at': format_datetime(cert.uploaded_at)
             })
         
         return jsonify({
-            'statistics': {
-                'total_certificates': total_certificates,
-                'pending_certificates': pending_certificates,
-                'approved_certificates': approved_certificates,
-                'rejected_certificates': rejected_certificates
-            },
+            'statistics': certificate_statistics(admin_branch),
             'recent_certificates': recent_list
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def certificate_statistics(branch=None):
+    """Certificate totals by status for a branch (or all branches), through the cache"""
+    def count():
+        query = db.session.query(Certificate.status, db.func.count(Certificate.id))
+        if branch:
+            query = query.filter(Certificate.branch == branch)
+        counts = dict(query.group_by(Certificate.status).all())
+        return {
+            'total_certificates': sum(counts.values()),
+            'pending_certificates': counts.get('Pending', 0),
+            'approved_certificates': counts.get('Approved', 0),
+            'rejected_certificates': counts.get('Rejected', 0)
+        }
+    
+    return cache.get_or_set(cache_key(f'dashboard_stats:{branch or "*"}', 'certificates'), count, tags=('certificates',))
+
 @app.route('/api/admin/certificates', methods=['GET'])
 def get_admin_certificates():
     try:
@@ -841,33 +1210,29 @@ def get_admin_certificates():
         if status:
             query = query.filter_by(status=status)
         
-        certificates = query.order_by(Certificate.uploaded_at.desc()).all()
-        
-        certificate_list = []
-        for cert in certificates:
-            student = db.session.get(Student, cert.student_id)
-            certificate_list.append({
-                'id': cert.id,
-                'student_name': cert.name,
-                'rollnumber': student.rollnumber if student else 'N/A',
-                'email': cert.email,
-                'branch': cert.branch,
-                'section': student.section if student else 'N/A',
-                'year': cert.year,
-                'certificate_name': cert.certificate_name,
-                'event_type': cert.event_type,
-                'start_date': cert.start_date.strftime('%Y-%m-%d') if cert.start_date else None,
-                'end_date': cert.end_date.strftime('%Y-%m-%d') if cert.end_date else None,
-                'status': cert.status,
-                'uploaded_at': cert.uploaded_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'file_path': cert.file_path
-            })
+        rows = (
+            query.outerjoin(Student, Student.id == Certificate.student_id)
+            .with_entities(Certificate, Student.rollnumber, Student.section)
+            .order_by(Certificate.uploaded_at.desc())
+            .all()
+        )
         
-        return jsonify({'certificates': certificate_list}), 200
+        return jsonify({'certificates': [admin_certificate_to_dict(*row) for row in rows]}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def admin_certificate_to_dict(cert, rollnumber, section):
+    return {
+        **student_certificate_to_dict(cert),
+        'student_name': cert.name,
+        'rollnumber': rollnumber or 'N/A',
+        'email': cert.email,
+        'branch': cert.branch,
+        'section': section if rollnumber is not None else 'N/A',
+        'year': cert.year
+    }
+
 @app.route('/api/admin/students', methods=['GET'])
 def get_admin_students():
     try:
@@ -904,58 +1269,84 @@ def get_admin_students():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+STUDENT_EXPORT_COLUMNS = [
+    ('id', 'ID'), ('name', 'Name'), ('rollnumber', 'Roll Number'), ('email', 'Email'), ('phone', 'Phone'),
+    ('gender', 'Gender'), ('branch', 'Branch'), ('section', 'Section'), ('year', 'Year'), ('created_at', 'Created At')
+]
+
+def student_export_query(filters):
+    query = Student.query
+    if filters.get('branch'):
+        query = query.filter_by(branch=filters['branch'])
+    if filters.get('year'):
+        query = query.filter_by(year=filters['year'])
+    if filters.get('section'):
+        query = query.filter_by(section=filters['section'])
+    return query
+
+def student_export_rows(query):
+    return query.order_by(Student.id).yield_per(500)
+
+def student_records(students):
+    for student in students:
+        yield {
+            'id': student.id,
+            'name': student.name,
+            'rollnumber': student.rollnumber,
+            'email': student.email,
+            'phone': student.phone,
+            'gender': student.gender,
+            'branch': student.branch,
+            'section': student.section,
+            'year': student.year,
+            'created_at': student.created_at.isoformat()
+        }
+
+def build_students_export(query, export_type, progress=None):
+    """Write a students export to a spooled file.
+
+    Returns (file, mimetype, download_name). progress, if given, wraps the
+    row stream to report how far the export has got.
+    """
+    students = student_export_rows(query)
+    if progress:
+        students = progress(students)
+    
+    if export_type in TABULAR_FORMATS:
+        mimetype, extension = TABULAR_FORMATS[export_type]
+        chunks = tabular_chunks(export_type, STUDENT_EXPORT_COLUMNS, student_records(students))
+        return spool_chunks(chunks), mimetype, f'students_report.{extension}'
+    
+    headers = ['ID', 'Name', 'Roll Number', 'Email', 'Phone', 'Gender', 'Branch', 'Section', 'Year', 'Created At']
+    rows = (
+        [
+            student.id,
+            student.name,
+            student.rollnumber,
+            student.email,
+            student.phone or 'N/A',
+            student.gender or 'N/A',
+            student.branch or 'N/A',
+            student.section or 'N/A',
+            student.year or 'N/A',
+            format_datetime(student.created_at)
+        ]
+        for student in students
+    )
+    return write_xlsx("Students Report", headers, rows), XLSX_MIMETYPE, 'students_report.xlsx'
+
 @app.route('/api/admin/students/download', methods=['GET'])
 def download_students_excel():
     try:
-        branch = request.args.get('branch')
-        year = request.args.get('year')
-        section = request.args.get('section')
+        export_type = request.args.get('type', 'excel')  # excel, csv or ndjson
+        query = student_export_query(request.args)
         
-        query = Student.query
-        if branch:
-            query = query.filter_by(branch=branch)
-        if year:
-            query = query.filter_by(year=year)
-        if section:
-            query = query.filter_by(section=section)
+        if export_type in TABULAR_FORMATS:
+            records = student_records(student_export_rows(query))
+            return tabular_response(export_type, STUDENT_EXPORT_COLUMNS, records, 'students_report')
         
-        students = query.all()
-        
-        # Create Excel workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Students Report"
-        
-        # Headers
-        headers = ['ID', 'Name', 'Roll Number', 'Email', 'Phone', 'Gender', 'Branch', 'Section', 'Year', 'Created At']
-        ws.append(headers)
-        
-        # Data
-        for student in students:
-            ws.append([
-                student.id,
-                student.name,
-                student.rollnumber,
-                student.email,
-                student.phone or 'N/A',
-                student.gender or 'N/A',
-                student.branch or 'N/A',
-                student.section or 'N/A',
-                student.year or 'N/A',
-                student.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name='students_report.xlsx'
-        )
+        output, mimetype, download_name = build_students_export(query, export_type)
+        return send_file(output, mimetype=mimetype, as_attachment=True, download_name=download_name)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -977,7 +1368,10 @@ def update_certificate_status():
         if not certificate:
             return jsonify({'error': 'Certificate not found'}), 404
         
+        if certificate.status != status:
+            publish_certificate_event('certificate-status', certificate.branch, status, [(certificate, certificate.status)])
         certificate.status = status
+        bump_data_version('certificates')
         db.session.commit()
         
         return jsonify({'message': 'Certificate status updated successfully'}), 200
@@ -999,9 +1393,15 @@ def bulk_update_certificate_status():
             return jsonify({'error': 'Invalid status'}), 400
         
         certificates = Certificate.query.filter(Certificate.id.in_(certificate_ids)).all()
+        changes = defaultdict(list)  # branch -> [(certificate, previous status)]
         for certificate in certificates:
+            if certificate.status != status:
+                changes[certificate.branch].append((certificate, certificate.status))
             certificate.status = status
+        for branch, branch_changes in changes.items():
+            publish_certificate_event('certificate-status', branch, status, branch_changes)
         
+        bump_data_version('certificates')
         db.session.commit()
         
         return jsonify({'message': f'Updated {len(certificates)} certificates successfully'}), 200
@@ -1009,7 +1409,28 @@ def bulk_update_certificate_status():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def publish_certificate_event(event_type, branch, status, changes, certificate=None):
+    """Tell the admins of a branch that certificates moved to status, with the counter deltas.
+
+    changes are (certificate, previous status) pairs, the previous status
+    being None for an upload. They are counted per year and event type so a
+    dashboard can adjust its statistics and filtered analytics in place.
+    """
+    groups = Counter((cert.year, cert.event_type, previous) for cert, previous in changes)
+    data = {
+        'status': status,
+        'ids': [cert.id for cert, _ in changes],
+        'groups': [
+            {'year': year, 'event_type': kind, 'previous_status': previous, 'count': count}
+            for (year, kind, previous), count in groups.items()
+        ]
+    }
+    if certificate:
+        data['certificate'] = certificate
+    publish_event(f'admins:{branch}', event_type, data)
+
 @app.route('/api/admin/analytics', methods=['GET'])
+@versioned('certificates')
 def get_analytics():
     try:
         # Get filter parameters
@@ -1124,150 +1545,484 @@ def admin_change_password():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+REPORT_FILTERS = ('year', 'branch', 'status', 'event_type')
+
+def certificate_report_query(filters):
+    """Build the certificate query for the report filters (e.g. request.args).
+
+    Returns None when no filter is applied, since reports over every
+    certificate are refused.
+    """
+    year = filters.get('year')
+    branch = filters.get('branch')
+    status = filters.get('status')
+    event_type = filters.get('event_type')
+    
+    if not any([year, branch, status, event_type]):
+        return None
+    
+    query = Certificate.query
+    
+    if year:
+        query = query.filter_by(year=year)
+    if branch:
+        query = query.filter_by(branch=branch)
+    if status:
+        query = query.filter_by(status=status)
+    if event_type:
+        query = query.filter_by(event_type=event_type)
+    
+    return query
+
+def certificate_report_rows(query):
+    """Stream (certificate, roll number) pairs for a report query in id order"""
+    return (
+        query.outerjoin(Student, Student.id == Certificate.student_id)
+        .with_entities(Certificate, Student.rollnumber)
+        .order_by(Certificate.id)
+        .yield_per(500)
+    )
+
+CERTIFICATE_EXPORT_COLUMNS = [
+    ('id', 'ID'), ('student_name', 'Student Name'), ('rollnumber', 'Roll Number'), ('email', 'Email'),
+    ('branch', 'Branch'), ('year', 'Year'), ('certificate_name', 'Certificate Name'), ('event_type', 'Event Type'),
+    ('start_date', 'Start Date'), ('end_date', 'End Date'), ('status', 'Status'), ('uploaded_at', 'Uploaded At'),
+    ('certificate_url', 'Certificate PDF')
+]
+
 @app.route('/api/admin/report', methods=['GET'])
 def generate_report():
     try:
-        report_type = request.args.get('type', 'excel')  # excel or pdf
-        year = request.args.get('year')
-        branch = request.args.get('branch')
-        status = request.args.get('status')
+        report_type = request.args.get('type', 'excel')  # excel, pdf, csv or ndjson
         
         # Check if at least one filter is applied
-        if not any([year, branch, status]):
+        query = certificate_report_query(request.args)
+        if query is None:
             return jsonify({'error': 'Please select at least one filter (Year, Branch, or Status) before downloading the report'}), 400
         
-        query = Certificate.query
+        if report_type in TABULAR_FORMATS:
+            records = certificate_records(certificate_report_rows(query), request.host_url.rstrip('/'))
+            return tabular_response(report_type, CERTIFICATE_EXPORT_COLUMNS, records, 'certificates_report')
         
-        if year:
-            query = query.filter_by(year=year)
-        if branch:
-            query = query.filter_by(branch=branch)
-        if status:
-            query = query.filter_by(status=status)
+        output, mimetype, download_name = build_certificate_report(query, report_type, request.host_url.rstrip('/'))
+        return send_file(output, mimetype=mimetype, as_attachment=True, download_name=download_name)
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/report/zip', methods=['GET'])
+def download_certificates_zip():
+    try:
+        query = certificate_report_query(request.args)
+        if query is None:
+            return jsonify({'error': 'Please select at least one filter (Year, Branch, or Status) before downloading the certificates'}), 400
         
-        certificates = query.all()
+        rows = certificate_report_rows(query)
+        
+        storage = get_storage()
+        
+        def archive_entries():
+            # The manifest grows with the row count, so it is kept on disk until the end
+            manifest = tempfile.TemporaryFile()
+            try:
+                yield from certificate_archive_entries(manifest)
+            finally:
+                manifest.close()
+        
+        def certificate_archive_entries(manifest):
+            manifest_text = io.TextIOWrapper(manifest, encoding='utf-8', newline='')
+            writer = csv.writer(manifest_text)
+            writer.writerow(['ID', 'Student Name', 'Roll Number', 'Email', 'Branch', 'Year', 'Certificate Name', 'Event Type', 'Start Date', 'End Date', 'Status', 'Uploaded At', 'File'])
+            for cert, rollnumber in rows:
+                arcname = None
+                # One GET per certificate: the stored key is used as is, without existence checks
+                file_key = normalize_certificate_key(cert.file_path) if cert.file_path else None
+                try:
+                    stored = storage.fetch(file_key) if file_key else None
+                except (FileNotFoundError, ValueError):
+                    stored = None  # Missing file, or a path that is not a valid key
+                if stored:
+                    arcname = f"certificates/{cert.id}_{file_key.rsplit('/', 1)[-1]}"
+                    yield arcname, stored
+                writer.writerow([
+                    cert.id,
+                    cert.name,
+                    rollnumber or 'N/A',
+                    cert.email,
+                    cert.branch,
+                    cert.year,
+                    cert.certificate_name or cert.event_type,
+                    cert.event_type,
+                    format_date(cert.start_date) or 'N/A',
+                    format_date(cert.end_date) or 'N/A',
+                    cert.status,
+                    format_datetime(cert.uploaded_at),
+                    arcname or 'File not found'
+                ])
+            manifest_text.flush()
+            manifest_text.detach()  # Leaves the file open for the archive
+            manifest.seek(0)
+            yield 'manifest.csv', manifest
+        
+        return Response(
+            stream_with_context(stream_zip(archive_entries())),
+            mimetype='application/zip',
+            headers={'Content-Disposition': 'attachment; filename=certificates.zip'}
+        )
         
-        if report_type == 'excel':
-            return generate_excel_report(certificates)
-        else:
-            return generate_pdf_report(certificates)
-            
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def generate_excel_report(certificates):
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Certificates Report"
-    
-    # Headers
-    headers = ['ID', 'Student Name', 'Roll Number', 'Email', 'Branch', 'Year', 'Certificate Name', 'Event Type', 'Start Date', 'End Date', 'Status', 'Uploaded At', 'Certificate PDF']
-    ws.append(headers)
-    
-    # Data
-    for cert in certificates:
-        student = db.session.get(Student, cert.student_id)
+def certificate_excel_rows(certificates):
+    for cert, rollnumber in certificates:
         # Create a proper download link that will work when the Excel file is opened
         certificate_pdf_link = f"=HYPERLINK(\"http://localhost:5000/api/student/certificate/{cert.id}/download\", \"Download Certificate\")" if cert.file_path else "N/A"
-        ws.append([
+        yield [
             cert.id,
             cert.name,
-            student.rollnumber if student else 'N/A',
+            rollnumber or 'N/A',
             cert.email,
             cert.branch,
             cert.year,
             cert.certificate_name or cert.event_type,
             cert.event_type,
-            cert.start_date.strftime('%Y-%m-%d') if cert.start_date else 'N/A',
-            cert.end_date.strftime('%Y-%m-%d') if cert.end_date else 'N/A',
+            format_date(cert.start_date) or 'N/A',
+            format_date(cert.end_date) or 'N/A',
             cert.status,
-            cert.uploaded_at.strftime('%Y-%m-%d %H:%M:%S'),
+            format_datetime(cert.uploaded_at),
             certificate_pdf_link
-        ])
-    
-    # Save to bytes
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    return send_file(
-        output,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        as_attachment=True,
-        download_name='certificates_report.xlsx'
-    )
-
-def generate_pdf_report(certificates):
-    buffer = io.BytesIO()
-    
-    # Create PDF with watermark in landscape mode
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(letter))
-    elements = []
-    
-    # Title with smaller font
-    styles = getSampleStyleSheet()
-    title_style = styles['Title']
-    title_style.fontSize = 14
-    title = Paragraph("Certificate Reports", title_style)
-    elements.append(title)
-    
+        ]
+
+def certificate_records(certificates, download_base):
+    for cert, rollnumber in certificates:
+        yield {
+            'id': cert.id,
+            'student_name': cert.name,
+            'rollnumber': rollnumber,
+            'email': cert.email,
+            'branch': cert.branch,
+            'year': cert.year,
+            'certificate_name': cert.certificate_name or cert.event_type,
+            'event_type': cert.event_type,
+            'start_date': cert.start_date.isoformat() if cert.start_date else None,
+            'end_date': cert.end_date.isoformat() if cert.end_date else None,
+            'status': cert.status,
+            'uploaded_at': cert.uploaded_at.isoformat(),
+            'certificate_url': f"{download_base}/api/student/certificate/{cert.id}/download" if cert.file_path else None
+        }
+
+def certificate_pdf_rows(certificates):
     # Data with reduced columns for better fit
-    data = [['ID', 'Student Name', 'Roll Number', 'Email', 'Branch', 'Year', 'Event Type', 'Status', 'Uploaded At']]
-    
-    for cert in certificates:
-        student = db.session.get(Student, cert.student_id)
-        data.append([
+    for cert, rollnumber in certificates:
+        yield [
             str(cert.id),
             cert.name[:20] + '...' if len(cert.name) > 20 else cert.name,  # Truncate long names
-            student.rollnumber if student else 'N/A',
+            rollnumber or 'N/A',
             cert.email[:25] + '...' if len(cert.email) > 25 else cert.email,  # Truncate long emails
             cert.branch[:15] + '...' if len(cert.branch) > 15 else cert.branch,  # Truncate long branch names
             str(cert.year),
             cert.event_type[:12] + '...' if len(cert.event_type) > 12 else cert.event_type,  # Truncate event type
             cert.status,
-            cert.uploaded_at.strftime('%Y-%m-%d')  # Only date, not time
-        ])
+            format_date(cert.uploaded_at.date())  # Only date, not time
+        ]
+
+# Fixed widths keep the columns aligned across the per-page tables
+PDF_REPORT_COLUMN_WIDTHS = [35, 95, 70, 125, 80, 35, 70, 50, 55]
+
+def build_certificate_report(query, report_type, download_base, progress=None):
+    """Write a certificate report to a spooled file.
+
+    Returns (file, mimetype, download_name). Roll numbers come from the same
+    query so rows need no extra lookups; progress, if given, wraps the row
+    stream to report how far the report has got.
+    """
+    certificates = certificate_report_rows(query)
+    if progress:
+        certificates = progress(certificates)
     
-    table = Table(data, repeatRows=1)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 8),  # Smaller header font
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 6),  # Much smaller data font
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),  # Thinner grid
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
+    if report_type == 'excel':
+        headers = ['ID', 'Student Name', 'Roll Number', 'Email', 'Branch', 'Year', 'Certificate Name', 'Event Type', 'Start Date', 'End Date', 'Status', 'Uploaded At', 'Certificate PDF']
+        output = write_xlsx("Certificates Report", headers, certificate_excel_rows(certificates))
+        return output, XLSX_MIMETYPE, 'certificates_report.xlsx'
     
-    elements.append(table)
+    if report_type in TABULAR_FORMATS:
+        mimetype, extension = TABULAR_FORMATS[report_type]
+        records = certificate_records(certificates, download_base)
+        output = spool_chunks(tabular_chunks(report_type, CERTIFICATE_EXPORT_COLUMNS, records))
+        return output, mimetype, f'certificates_report.{extension}'
     
-    # Build PDF with watermark
-    def add_watermark(canvas, doc):
-        canvas.saveState()
-        canvas.setFont('Helvetica-Bold', 60)
-        canvas.setFillColor(colors.orange)
-        canvas.setFillAlpha(0.3)
-        canvas.rotate(45)
-        canvas.drawString(200, 0, "SRIT")
-        canvas.restoreState()
+    headers = ['ID', 'Student Name', 'Roll Number', 'Email', 'Branch', 'Year', 'Event Type', 'Status', 'Uploaded At']
+    output = write_pdf_report(
+        "Certificate Reports",
+        headers,
+        certificate_pdf_rows(certificates),
+        col_widths=PDF_REPORT_COLUMN_WIDTHS,
+        watermark="SRIT"
+    )
+    return output, 'application/pdf', 'certificates_report.pdf'
+
+# ========== Report jobs ==========
+# Exports run on the background worker pool and are stored under reports/.
+# A finished artifact is reused for identical requests until it expires or
+# the data it was built from changes (see DataVersion).
+
+# kind -> (export types, accepted filters, data sets the export reads).
+# 'branches' is the super admin's certificate report for every department.
+REPORT_JOB_KINDS = {
+    'certificates': (('excel', 'pdf', 'csv', 'ndjson'), REPORT_FILTERS, ('certificates', 'students')),
+    'students': (('excel', 'csv', 'ndjson'), ('branch', 'year', 'section'), ('students',)),
+    'branches': (('excel', 'pdf', 'csv', 'ndjson'), ('year', 'status', 'event_type'), ('certificates', 'students')),
+}
+
+def report_job_to_dict(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'type': job.export_type,
+        'status': job.status,
+        'progress': job.progress,
+        'total_rows': job.total_rows,
+        'download_name': job.download_name,
+        'error': job.error,
+        'created_at': job.created_at,
+        'completed_at': job.completed_at,
+        'expires_at': job.expires_at
+    }
+
+def report_job_query(kind, filters):
+    if kind == 'certificates':
+        return certificate_report_query(filters)
+    return student_export_query(filters)
+
+def update_report_job(job_id, **values):
+    """Update a job row on its own connection, outside the worker's session.
+
+    Returns False if the job no longer exists (evicted while running).
+    """
+    with db.engine.begin() as conn:
+        result = conn.execute(db.update(ReportJob).where(ReportJob.id == job_id).values(**values))
+    return result.rowcount == 1
+
+def report_job_progress(job_id, total_rows, every=500):
+    """Return a wrapper for a row stream that records the percentage done"""
+    def track(rows):
+        done = 0
+        for row in rows:
+            yield row
+            done += 1
+            if done % every == 0 and total_rows:
+                update_report_job(job_id, progress=min(99, done * 100 // total_rows))
+    return track
+
+def department_branches():
+    """Return (short code, branch) for every department, e.g. ('CSE', 'COMPUTER SCIENCE ...')"""
+    return [
+        (employee_id.split('@', 1)[1].upper(), creds['branch'])
+        for employee_id, creds in ADMIN_CREDENTIALS.items()
+        if creds.get('role') != 'superadmin'
+    ]
+
+def build_branches_export(job_id, export_type, params):
+    """Build the certificate report of every department in parallel processes.
+
+    Excel reports are merged into one workbook with a sheet per department;
+    other types are bundled into a ZIP with a file per department.
+    """
+    branches = department_branches()
     
-    doc.build(elements, onFirstPage=add_watermark, onLaterPages=add_watermark)
-    buffer.seek(0)
+    def on_progress(done):
+        update_report_job(job_id, progress=min(99, done * 100 // len(branches)))
     
-    return send_file(
-        buffer,
-        mimetype='application/pdf',
-        as_attachment=True,
-        download_name='certificates_report.pdf'
-    )
+    with tempfile.TemporaryDirectory() as out_dir:
+        paths = build_branch_reports(
+            [branch for _, branch in branches],
+            export_type,
+            params['filters'],
+            params['base_url'],
+            out_dir,
+            app.config['EXPORT_PROCESSES'],
+            on_progress
+        )
+        if export_type == 'excel':
+            output = merge_xlsx([(code, paths[branch]) for code, branch in branches])
+            return output, XLSX_MIMETYPE, 'certificates_all_branches.xlsx'
+        
+        # Worker files are named '<index>_<download name>'
+        output = write_zip([
+            (f"{code}_{os.path.basename(paths[branch]).split('_', 1)[1]}", paths[branch])
+            for code, branch in branches
+        ])
+        return output, 'application/zip', f'certificates_all_branches_{export_type}.zip'
+
+def run_report_job(job_id):
+    claimed = ReportJob.query.filter_by(id=job_id, status='Pending').update({'status': 'Running'}, synchronize_session=False)
+    db.session.commit()
+    if not claimed:
+        return
+    
+    job = db.session.get(ReportJob, job_id)
+    params = json.loads(job.params)
+    storage = get_storage()
+    artifact_key = None
+    try:
+        if job.kind == 'branches':
+            output, mimetype, download_name = build_branches_export(job_id, job.export_type, params)
+        else:
+            query = report_job_query(job.kind, params['filters'])
+            total_rows = query.order_by(None).count()
+            update_report_job(job_id, total_rows=total_rows)
+            progress = report_job_progress(job_id, total_rows)
+            
+            if job.kind == 'certificates':
+                output, mimetype, download_name = build_certificate_report(query, job.export_type, params['base_url'], progress)
+            else:
+                output, mimetype, download_name = build_students_export(query, job.export_type, progress)
+        db.session.rollback()  # End the read transaction before writing
+        
+        artifact_key = f"reports/{job_id}/{download_name}"
+        with output:
+            storage.put(artifact_key, output, content_type=mimetype)
+        
+        now = utcnow_naive()
+        finished = update_report_job(
+            job_id,
+            status='Done',
+            progress=100,
+            artifact_key=artifact_key,
+            download_name=download_name,
+            mimetype=mimetype,
+            completed_at=now,
+            expires_at=now + timedelta(seconds=app.config['REPORT_JOB_TTL_SECONDS'])
+        )
+        if not finished:
+            storage.delete(artifact_key)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Report job {job_id} failed: {e}")
+        if artifact_key:
+            storage.delete(artifact_key)
+        update_report_job(job_id, status='Failed', error=str(e), completed_at=utcnow_naive())
+
+def evict_report_jobs():
+    """Delete expired report jobs and their artifacts"""
+    storage = get_storage()
+    expired = ReportJob.query.filter(ReportJob.expires_at < utcnow_naive()).all()
+    for job in expired:
+        if job.artifact_key:
+            storage.delete_prefix(f"reports/{job.id}/")
+        db.session.delete(job)
+    db.session.commit()
+
+register_periodic('report-jobs-gc', Config.REPORT_JOB_GC_INTERVAL_SECONDS, evict_report_jobs)
+
+@app.route('/api/admin/reports', methods=['POST'])
+def create_report_job():
+    try:
+        data = request.get_json() or {}
+        kind = data.get('kind', 'certificates')
+        export_type = data.get('type', 'excel')
+        
+        if kind not in REPORT_JOB_KINDS:
+            return jsonify({'error': 'Invalid report kind'}), 400
+        export_types, allowed_filters, data_sets = REPORT_JOB_KINDS[kind]
+        if export_type not in export_types:
+            return jsonify({'error': 'Invalid report type'}), 400
+        
+        if kind == 'branches':
+            # Every department's certificates: the super admin's report only
+            admin = db.session.get(Admin, data.get('admin_id')) if data.get('admin_id') else None
+            if not admin or not is_super_admin(admin):
+                return jsonify({'error': 'Access denied'}), 403
+        
+        filters = {key: value for key, value in (data.get('filters') or {}).items() if key in allowed_filters and value}
+        if kind == 'certificates' and not filters:
+            return jsonify({'error': 'Please select at least one filter (Year, Branch, or Status) before downloading the report'}), 400
+        
+        params = {'kind': kind, 'type': export_type, 'filters': filters}
+        if kind in ('certificates', 'branches'):
+            params['base_url'] = request.host_url.rstrip('/')
+        params_json = json.dumps(params, sort_keys=True)
+        params_hash = hashlib.sha256(params_json.encode('utf-8')).hexdigest()
+        data_version = current_data_version(*data_sets)
+        now = utcnow_naive()
+        
+        # Reuse a finished or in-flight job for the same request and data
+        cached = ReportJob.query.filter(
+            ReportJob.params_hash == params_hash,
+            ReportJob.data_version == data_version,
+            ReportJob.status.in_(['Pending', 'Running', 'Done']),
+            ReportJob.expires_at > now
+        ).order_by(ReportJob.created_at.desc()).first()
+        if cached:
+            return jsonify({'job': report_job_to_dict(cached)}), 200
+        
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            admin_id=data.get('admin_id'),
+            kind=kind,
+            export_type=export_type,
+            params=params_json,
+            params_hash=params_hash,
+            data_version=data_version,
+            # An unfinished job stops being reused (and is evicted) after this
+            expires_at=now + timedelta(seconds=app.config['REPORT_JOB_TIMEOUT_SECONDS'])
+        )
+        db.session.add(job)
+        db.session.commit()
+        
+        submit_task(app, run_report_job, job.id)
+        
+        return jsonify({'job': report_job_to_dict(job)}), 202
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/reports/<job_id>', methods=['GET'])
+def get_report_job(job_id):
+    try:
+        job = db.session.get(ReportJob, job_id)
+        if not job:
+            return jsonify({'error': 'Report job not found or expired'}), 404
+        
+        return jsonify({'job': report_job_to_dict(job)}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/reports/<job_id>/download', methods=['GET'])
+def download_report_job(job_id):
+    try:
+        job = db.session.get(ReportJob, job_id)
+        if not job:
+            return jsonify({'error': 'Report job not found or expired'}), 404
+        if job.status != 'Done':
+            return jsonify({'error': 'Report is not ready yet'}), 409
+        
+        return send_stored_file(
+            job.artifact_key,
+            mimetype=job.mimetype,
+            as_attachment=True,
+            download_name=job.download_name
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 # Form Management API Endpoints
 
+# Parsed form_fields. Always kept in this process: the caller already holds
+# the JSON, so only the parsing is worth saving, not a round trip to Redis.
+schema_cache = Cache(LocalCache(Config.FORM_SCHEMA_CACHE_SIZE), default_ttl=None)
+
+def form_schema(form):
+    """Return the parsed fields of a form (a shared tuple; do not modify)"""
+    return schema_cache.get_or_set(
+        f'form_schema:{form.id}:{form.schema_version}',
+        lambda: parse_form_schema(form.form_fields),
+        tags=(f'form:{form.id}',)
+    )
+
 @app.route('/api/admin/forms', methods=['POST'])
 def create_form():
     try:
@@ -1282,6 +2037,12 @@ def create_form():
         if not admin:
             return jsonify({'error': 'Admin not found'}), 404
         
+        form_fields = json.dumps(data['form_fields'])
+        try:
+            parse_form_schema(form_fields)
+        except FormSchemaError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Create new form
         new_form = Form(
             title=data['title'],
@@ -1289,10 +2050,15 @@ def create_form():
             admin_id=admin_id,
             branch=admin.branch,
             deadline=datetime.fromisoformat(data['deadline'].replace('Z', '+00:00')),
-            form_fields=json.dumps(data['form_fields'])
+            form_fields=form_fields
         )
         
         db.session.add(new_form)
+        db.session.flush()
+        publish_event(f'students:{new_form.branch}', 'form-created', {
+            'id': new_form.id, 'title': new_form.title, 'deadline': new_form.deadline
+        })
+        bump_data_version('forms')
         db.session.commit()
         
         # Send email notifications to students in the same branch
@@ -1312,7 +2078,7 @@ Your department admin has created a new form: "{new_form.title}"
 
 Description: {new_form.description}
 
-Deadline: {new_form.deadline.strftime('%Y-%m-%d %H:%M:%S')}
+Deadline: {format_datetime(new_form.deadline)}
 
 Please log in to your student dashboard to fill out this form.
 
@@ -1339,7 +2105,7 @@ def get_admin_forms():
         if not admin_id:
             return jsonify({'error': 'Admin ID required'}), 400
         
-        forms = Form.query.filter_by(admin_id=admin_id).order_by(Form.created_at.desc()).all()
+        forms = Form.query.filter_by(admin_id=admin_id, deleted_at=None).order_by(Form.created_at.desc()).all()
         
         forms_data = []
         for form in forms:
@@ -1351,9 +2117,9 @@ def get_admin_forms():
                 'title': form.title,
                 'description': form.description,
                 'branch': form.branch,
-                'deadline': form.deadline.isoformat(),
+                'deadline': form.deadline,
                 'is_active': form.is_active,
-                'created_at': form.created_at.isoformat(),
+                'created_at': form.created_at,
                 'response_count': response_count
             })
         
@@ -1370,32 +2136,170 @@ def get_form_responses(form_id):
             return jsonify({'error': 'Admin ID required'}), 400
         
         # Verify admin owns this form
-        form = Form.query.filter_by(id=form_id, admin_id=admin_id).first()
+        form = Form.query.filter_by(id=form_id, admin_id=admin_id, deleted_at=None).first()
         if not form:
             return jsonify({'error': 'Form not found or access denied'}), 404
         
-        responses = FormResponse.query.filter_by(form_id=form_id).all()
-        
-        responses_data = []
-        for response in responses:
-            student = db.session.get(Student, response.student_id)
-            responses_data.append({
-                'id': response.id,
-                'student_name': student.name if student else 'Unknown',
-                'student_rollnumber': student.rollnumber if student else 'Unknown',
-                'student_email': student.email if student else 'Unknown',
-                'responses': json.loads(response.responses),
-                'submitted_at': response.submitted_at.isoformat()
-            })
+        # Optional projection: fields=<id>,<id> limits the answers returned per response
+        field_ids = [field_id.strip() for field_id in request.args.get('fields', '').split(',') if field_id.strip()]
+        responses = filter_responses_by_answers(FormResponse.query.filter_by(form_id=form_id), form_id, request.args)
+        rows = (
+            responses.outerjoin(Student, Student.id == FormResponse.student_id)
+            .with_entities(
+                FormResponse.id, FormResponse.responses, FormResponse.submitted_at,
+                Student.name, Student.rollnumber, Student.email
+            )
+            .order_by(FormResponse.id)
+        )
+        
+        # Bulk consumers can stream every matching response instead of paging
+        if request.args.get('format') == 'ndjson':
+            records = (form_response_record(row, field_ids) for row in rows.yield_per(500))
+            return tabular_response('ndjson', FORM_RESPONSE_RECORD_COLUMNS, records, f'form_responses_{form.id}')
+        
+        # Keyset pagination: pass the previous page's next_after to continue
+        after = request.args.get('after', type=int)
+        limit = max(1, min(request.args.get('limit', RESPONSES_PAGE_SIZE, type=int), RESPONSES_MAX_PAGE_SIZE))
+        if after:
+            rows = rows.filter(FormResponse.id > after)
+        page = rows.limit(limit + 1).all()
+        has_more = len(page) > limit
+        page = page[:limit]
+        
+        if any(key.startswith('answer_') and value for key, value in request.args.items()):
+            total = responses.count()
+        else:
+            # Unfiltered totals come from the summary counters
+            total = db.session.query(db.func.coalesce(db.func.sum(FormDailyCount.count), 0)).filter(FormDailyCount.form_id == form_id).scalar()
         
         return jsonify({
             'form': {
                 'id': form.id,
                 'title': form.title,
                 'description': form.description,
-                'form_fields': json.loads(form.form_fields)
+                'form_fields': form_schema(form)
             },
-            'responses': responses_data
+            'responses': [form_response_record(row, field_ids) for row in page],
+            'total': total,
+            'next_after': page[-1].id if has_more else None
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+RESPONSES_PAGE_SIZE = 50
+RESPONSES_MAX_PAGE_SIZE = 500
+
+FORM_RESPONSE_RECORD_COLUMNS = [
+    ('id', 'Response ID'), ('student_name', 'Student Name'), ('student_rollnumber', 'Roll Number'),
+    ('student_email', 'Student Email'), ('responses', 'Responses'), ('submitted_at', 'Submission Date')
+]
+
+def form_response_record(row, field_ids=None):
+    """Serialize a (id, responses, submitted_at, name, rollnumber, email) row"""
+    response_id, responses, submitted_at, name, rollnumber, email = row
+    answers = json.loads(responses)
+    if field_ids:
+        answers = {field_id: answers[field_id] for field_id in field_ids if field_id in answers}
+    return {
+        'id': response_id,
+        'student_name': name or 'Unknown',
+        'student_rollnumber': rollnumber or 'Unknown',
+        'student_email': email or 'Unknown',
+        'responses': answers,
+        'submitted_at': submitted_at.isoformat()
+    }
+
+@app.route('/api/admin/forms/<int:form_id>/answers/<field_id>/counts', methods=['GET'])
+def get_form_answer_counts(form_id, field_id):
+    try:
+        admin_id = request.args.get('admin_id')
+        if not admin_id:
+            return jsonify({'error': 'Admin ID required'}), 400
+        
+        form = Form.query.filter_by(id=form_id, admin_id=admin_id, deleted_at=None).first()
+        if not form:
+            return jsonify({'error': 'Form not found or access denied'}), 404
+        
+        # answer_<field_id> filters narrow the counted responses, e.g. one year of study
+        responses = filter_responses_by_answers(FormResponse.query.filter_by(form_id=form_id), form_id, request.args)
+        counts = (
+            db.session.query(FormAnswer.value_text, db.func.count(db.distinct(FormAnswer.response_id)))
+            .filter(
+                FormAnswer.form_id == form_id,
+                FormAnswer.field_id == field_id,
+                FormAnswer.response_id.in_(responses.with_entities(FormResponse.id))
+            )
+            .group_by(FormAnswer.value_text)
+            .order_by(db.func.count(db.distinct(FormAnswer.response_id)).desc(), FormAnswer.value_text)
+            .all()
+        )
+        
+        return jsonify({
+            'field_id': field_id,
+            'counts': [{'value': value, 'count': count} for value, count in counts],
+            'total_responses': responses.count()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/forms/<int:form_id>/summary', methods=['GET'])
+def get_form_summary(form_id):
+    try:
+        admin_id = request.args.get('admin_id')
+        if not admin_id:
+            return jsonify({'error': 'Admin ID required'}), 400
+        
+        form = Form.query.filter_by(id=form_id, admin_id=admin_id, deleted_at=None).first()
+        if not form:
+            return jsonify({'error': 'Form not found or access denied'}), 404
+        
+        # Read from the counters kept by update_form_summary, not the responses
+        field_counts = {row.field_id: row for row in FormFieldCount.query.filter_by(form_id=form_id)}
+        option_counts = {}
+        for row in FormOptionCount.query.filter_by(form_id=form_id):
+            option_counts.setdefault(row.field_id, {})[row.value] = row.count
+        daily_counts = FormDailyCount.query.filter_by(form_id=form_id).order_by(FormDailyCount.day).all()
+        eligible = roster_size(form.branch)
+        
+        fields = []
+        for field in form_schema(form):
+            field_id = str(field['id'])
+            counts = field_counts.get(field_id)
+            summary = {
+                'id': field['id'],
+                'label': field['label'],
+                'type': field['type'],
+                'answered': counts.answered if counts else 0
+            }
+            if field['type'] in CHOICE_FIELD_TYPES:
+                chosen = option_counts.get(field_id, {})
+                # Declared options first, in form order, then any other submitted values
+                values = list(field.get('options') or []) + sorted(set(chosen) - set(field.get('options') or []))
+                summary['options'] = [{'value': value, 'count': chosen.get(value, 0)} for value in values]
+            elif field['type'] == 'file':
+                summary['files_uploaded'] = counts.value_count if counts else 0
+            fields.append(summary)
+        
+        daily = []
+        total = 0
+        for row in daily_counts:
+            total += row.count
+            daily.append({
+                'date': row.day,
+                'count': row.count,
+                'cumulative': total,
+                'response_rate': round(total * 100 / eligible, 1) if eligible else None
+            })
+        
+        return jsonify({
+            'form_id': form.id,
+            'total_responses': total,
+            'eligible_students': eligible,
+            'response_rate': round(total * 100 / eligible, 1) if eligible else None,
+            'fields': fields,
+            'daily': daily
         }), 200
         
     except Exception as e:
@@ -1409,106 +2313,71 @@ def download_form_responses_excel(form_id):
             return jsonify({'error': 'Admin ID required'}), 400
         
         # Verify admin owns this form
-        form = Form.query.filter_by(id=form_id, admin_id=admin_id).first()
+        form = Form.query.filter_by(id=form_id, admin_id=admin_id, deleted_at=None).first()
         if not form:
             return jsonify({'error': 'Form not found or access denied'}), 404
         
-        responses = FormResponse.query.filter_by(form_id=form_id).all()
+        responses = filter_responses_by_answers(FormResponse.query.filter_by(form_id=form_id), form_id, request.args)
         
-        if not responses:
+        if not db.session.query(responses.exists()).scalar():
             return jsonify({'error': 'No responses found for this form'}), 404
         
-        # Create Excel workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Form Responses"
-        
         # Get form fields
-        form_fields = json.loads(form.form_fields)
+        form_fields = form_schema(form)
+        
+        export_type = request.args.get('type', 'excel')  # excel, csv or ndjson
+        if export_type in TABULAR_FORMATS:
+            return form_responses_tabular(form, form_fields, responses, export_type)
         
         # Create headers
         headers = ['Student Name', 'Roll Number', 'Student Email', 'Submission Date']
         for field in form_fields:
             headers.append(field['label'])
         
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col, value=header)
-        
-        # Write data
-        for row, response in enumerate(responses, 2):
-            student = db.session.get(Student, response.student_id)
-            responses_data = json.loads(response.responses)
-            
-            # Basic student info
-            ws.cell(row=row, column=1, value=student.name if student else 'Unknown')
-            ws.cell(row=row, column=2, value=student.rollnumber if student else 'Unknown')
-            ws.cell(row=row, column=3, value=student.email if student else 'Unknown')
-            ws.cell(row=row, column=4, value=response.submitted_at.strftime('%Y-%m-%d %H:%M:%S'))
-            
-            # Form field responses
-            for col, field in enumerate(form_fields, 5):
-                field_id = str(field['id'])
-                value = responses_data.get(field_id, '')
+        # One storage listing answers every file-existence check below
+        file_keys = form_response_file_keys(form_id)
+        field_types = [(str(field['id']), field['type']) for field in form_fields]
+        
+        def file_link(response_id, filename):
+            # Remove temp_ prefix for display
+            display_name = filename.replace('temp_', '') if filename.startswith('temp_') else filename
+            if (form_response_prefix(form_id, response_id) + filename in file_keys
+                    or legacy_form_response_prefix(form_id, response_id) + filename in file_keys):
+                download_url = f"http://localhost:5000/api/admin/forms/{form_id}/responses/{response_id}/files/{filename}?admin_id={admin_id}"
+                return f'=HYPERLINK("{download_url}","{display_name}")'
+            # File doesn't exist, show filename without link
+            return f'File not found: {display_name}'
+        
+        def response_rows():
+            for response, name, rollnumber, email in form_response_rows(responses):
+                responses_data = json.loads(response.responses)
                 
-                # Handle different field types
-                if field['type'] in ['checkbox', 'radio', 'select'] and isinstance(value, list):
-                    value = ', '.join(value)
-                elif field['type'] == 'file' and value:
-                    # Create downloadable link for file uploads only if files exist
-                    if isinstance(value, list):
-                        # Multiple files
-                        file_links = []
-                        for i, filename in enumerate(value):
-                            # Check if file exists
-                            file_path = os.path.join('uploads', 'forms', str(form_id), str(response.id), filename)
-                            if os.path.exists(file_path):
-                                # Remove temp_ prefix for display
-                                display_name = filename.replace('temp_', '') if filename.startswith('temp_') else filename
-                                download_url = f"http://localhost:5000/api/admin/forms/{form_id}/responses/{response.id}/files/{filename}?admin_id={admin_id}"
-                                file_links.append(f'=HYPERLINK("{download_url}","{display_name}")')
-                            else:
-                                # File doesn't exist, show filename without link
-                                display_name = filename.replace('temp_', '') if filename.startswith('temp_') else filename
-                                file_links.append(f'File not found: {display_name}')
-                        value = ' | '.join(file_links)
-                    else:
-                        # Single file
-                        # Check if file exists
-                        file_path = os.path.join('uploads', 'forms', str(form_id), str(response.id), value)
-                        if os.path.exists(file_path):
-                            # Remove temp_ prefix for display
-                            display_name = value.replace('temp_', '') if value.startswith('temp_') else value
-                            download_url = f"http://localhost:5000/api/admin/forms/{form_id}/responses/{response.id}/files/{value}?admin_id={admin_id}"
-                            value = f'=HYPERLINK("{download_url}","{display_name}")'
-                        else:
-                            # File doesn't exist, show filename without link
-                            display_name = value.replace('temp_', '') if value.startswith('temp_') else value
-                            value = f'File not found: {display_name}'
+                # Basic student info
+                row = [
+                    name or 'Unknown',
+                    rollnumber or 'Unknown',
+                    email or 'Unknown',
+                    format_datetime(response.submitted_at)
+                ]
                 
-                ws.cell(row=row, column=col, value=value)
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save to bytes
-        excel_file = io.BytesIO()
-        wb.save(excel_file)
-        excel_file.seek(0)
+                # Form field responses
+                for field_id, field_type in field_types:
+                    value = responses_data.get(field_id, '')
+                    
+                    # Handle different field types
+                    if field_type in ['checkbox', 'radio', 'select'] and isinstance(value, list):
+                        value = ', '.join(value)
+                    elif field_type == 'file' and value:
+                        # Create downloadable link for file uploads only if files exist
+                        filenames = value if isinstance(value, list) else [value]
+                        value = ' | '.join(file_link(response.id, filename) for filename in filenames)
+                    
+                    row.append(value)
+                yield row
         
         return send_file(
-            excel_file,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            write_xlsx("Form Responses", headers, response_rows(), autosize=True),
+            mimetype=XLSX_MIMETYPE,
             as_attachment=True,
             download_name=f'form_responses_{form.title.replace(" ", "_")}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         )
@@ -1516,6 +2385,45 @@ def download_form_responses_excel(form_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def form_response_rows(responses):
+    """Stream (response, student name, roll number, email) with students joined in"""
+    return (
+        responses.outerjoin(Student, Student.id == FormResponse.student_id)
+        .with_entities(FormResponse, Student.name, Student.rollnumber, Student.email)
+        .order_by(FormResponse.id)
+        .yield_per(500)
+    )
+
+def form_response_file_keys(form_id):
+    """Return the keys of every stored file of a form's submitted responses"""
+    prefix = form_prefix(form_id)
+    staged = (prefix + 'staging/', legacy_form_staging_prefix(form_id))
+    return {obj.key for obj in get_storage().list_prefix(prefix) if not obj.key.startswith(staged)}
+
+def form_responses_tabular(form, form_fields, responses, export_type):
+    """Stream raw answers keyed by field; file fields hold the uploaded filenames"""
+    columns = [
+        ('response_id', 'Response ID'), ('student_name', 'Student Name'), ('rollnumber', 'Roll Number'),
+        ('student_email', 'Student Email'), ('submitted_at', 'Submission Date')
+    ]
+    columns += [(f"field_{field['id']}", field['label']) for field in form_fields]
+    
+    def records():
+        for response, name, rollnumber, email in form_response_rows(responses):
+            answers = json.loads(response.responses)
+            record = {
+                'response_id': response.id,
+                'student_name': name,
+                'rollnumber': rollnumber,
+                'student_email': email,
+                'submitted_at': response.submitted_at.isoformat()
+            }
+            for field in form_fields:
+                record[f"field_{field['id']}"] = answers.get(str(field['id']))
+            yield record
+    
+    return tabular_response(export_type, columns, records(), f'form_responses_{form.id}')
+
 @app.route('/api/student/forms/<int:form_id>/response', methods=['GET'])
 def get_student_form_response(form_id):
     try:
@@ -1534,7 +2442,7 @@ def get_student_form_response(form_id):
         
         return jsonify({
             'responses': json.loads(response.responses),
-            'submitted_at': response.submitted_at.isoformat()
+            'submitted_at': response.submitted_at
         }), 200
         
     except Exception as e:
@@ -1548,7 +2456,7 @@ def download_form_file(form_id, response_id, filename):
             return jsonify({'error': 'Admin ID required'}), 400
         
         # Verify admin owns this form
-        form = Form.query.filter_by(id=form_id, admin_id=admin_id).first()
+        form = Form.query.filter_by(id=form_id, admin_id=admin_id, deleted_at=None).first()
         if not form:
             return jsonify({'error': 'Form not found or access denied'}), 404
         
@@ -1557,69 +2465,310 @@ def download_form_file(form_id, response_id, filename):
         if not response:
             return jsonify({'error': 'Response not found'}), 404
         
-        # Construct file path
-        file_path = os.path.join('uploads', 'forms', str(form_id), str(response_id), filename)
+        # Construct file key
+        storage = get_storage()
+        response_prefix = resolve_form_response_prefix(form_id, response_id)
+        file_key = response_prefix + filename
         
         # Check if file exists
-        if not os.path.exists(file_path):
-            # Check if directory exists
-            response_dir = os.path.join('uploads', 'forms', str(form_id), str(response_id))
-            if not os.path.exists(response_dir):
-                return jsonify({'error': f'Response directory not found: {response_dir}'}), 404
+        if not storage.exists(file_key):
+            # List available files for this response
+            available_files = [obj.key[len(response_prefix):] for obj in storage.list_prefix(response_prefix)]
+            if not available_files:
+                return jsonify({'error': f'Response directory not found: {response_prefix}'}), 404
             
-            # List available files in the directory
-            available_files = os.listdir(response_dir) if os.path.exists(response_dir) else []
             return jsonify({
                 'error': f'File not found: {filename}',
                 'available_files': available_files,
-                'searched_path': file_path
+                'searched_path': file_key
             }), 404
         
-        return send_file(file_path, as_attachment=True)
+        return send_stored_file(file_key, as_attachment=True)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/student/forms', methods=['GET'])
+@versioned('students', 'forms', 'form_responses')
 def get_student_forms():
     try:
         student_id = request.args.get('student_id')
         if not student_id:
             return jsonify({'error': 'Student ID required'}), 400
         
-        student = db.session.get(Student, student_id)
-        if not student:
+        profile = student_profile(student_id)
+        if not profile:
             return jsonify({'error': 'Student not found'}), 404
         
-        # Get active forms for student's branch
-        forms = Form.query.filter_by(
-            branch=student.branch,
-            is_active=True
-        ).filter(Form.deadline > datetime.utcnow()).order_by(Form.created_at.desc()).all()
-        
-        forms_data = []
-        for form in forms:
-            # Check if student has already responded
-            existing_response = FormResponse.query.filter_by(
-                form_id=form.id,
-                student_id=student_id
-            ).first()
-            
-            forms_data.append({
-                'id': form.id,
-                'title': form.title,
-                'description': form.description,
-                'deadline': form.deadline.isoformat(),
-                'created_at': form.created_at.isoformat(),
-                'form_fields': json.loads(form.form_fields),
-                'has_responded': existing_response is not None
-            })
+        forms_data = [student_form_to_dict(form, has_responded) for form, has_responded in student_open_forms(profile)]
         
         return jsonify({'forms': forms_data}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def student_open_forms(profile):
+    """Return (form, has_responded) for the active forms of a student's branch, in one query"""
+    rows = (
+        db.session.query(Form, FormResponse.id)
+        .outerjoin(FormResponse, db.and_(FormResponse.form_id == Form.id, FormResponse.student_id == profile['id']))
+        .filter(Form.branch == profile['branch'], Form.is_active.is_(True), Form.deadline > datetime.utcnow())
+        .order_by(Form.created_at.desc())
+    )
+    return [(form, response_id is not None) for form, response_id in rows]
+
+def student_form_to_dict(form, has_responded):
+    return {
+        'id': form.id,
+        'title': form.title,
+        'description': form.description,
+        'deadline': form.deadline,
+        'created_at': form.created_at,
+        'form_fields': form_schema(form),
+        'has_responded': has_responded
+    }
+
+@app.route('/api/student/home', methods=['GET'])
+@versioned('students', 'certificates', 'forms', 'form_responses')
+def get_student_home():
+    """Everything the student dashboard and navbar show, in three queries.
+
+    A client revalidating with If-None-Match gets an empty 304 without any
+    of them running when nothing changed.
+    """
+    try:
+        student_id = request.args.get('student_id')
+        if not student_id:
+            return jsonify({'error': 'Student ID is required'}), 400
+        
+        profile = student_profile(student_id)
+        if not profile:
+            return jsonify({'error': 'Student not found'}), 404
+        
+        certificates = Certificate.query.filter_by(student_id=profile['id']).all()
+        forms = student_open_forms(profile)
+        
+        return jsonify({
+            'profile': profile,
+            'certificates': [student_certificate_to_dict(cert) for cert in certificates],
+            'forms': [student_form_to_dict(form, has_responded) for form, has_responded in forms],
+            'unresponded_count': sum(1 for _, has_responded in forms if not has_responded)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Staged form uploads
+UPLOAD_SESSION_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+def form_answer_rows(form_id, response_id, form_fields, responses):
+    """Return the form_answers rows for a submitted response, one per answered value"""
+    rows = []
+    for field in form_fields:
+        field_id = str(field['id'])
+        value = responses.get(field_id)
+        for item in (value if isinstance(value, list) else [value]):
+            if item is None or item == '':
+                continue
+            row = {
+                'response_id': response_id,
+                'form_id': form_id,
+                'field_id': field_id,
+                'value_text': str(item),
+                'value_number': None,
+                'value_date': None
+            }
+            try:
+                if field.get('type') == 'number':
+                    row['value_number'] = float(item)
+                elif field.get('type') == 'date':
+                    row['value_date'] = datetime.fromisoformat(str(item)).date()
+            except ValueError:
+                pass  # Unparseable input is still kept as text
+            rows.append(row)
+    return rows
+
+def store_form_answers(form_id, response_id, form_fields, responses):
+    rows = form_answer_rows(form_id, response_id, form_fields, responses)
+    if rows:
+        db.session.execute(db.insert(FormAnswer), rows)
+    return rows
+
+def increment_counts(model, rows, *columns):
+    """Add the given columns of each row onto the stored counters, creating missing rows"""
+    if not rows:
+        return
+    if not supports_upsert():
+        key_columns = [column.name for column in model.__table__.primary_key]
+        for row in rows:
+            update_or_insert(
+                model, {column: row[column] for column in key_columns},
+                {column: value for column, value in row.items() if column not in key_columns},
+                {column: getattr(model, column) + row[column] for column in columns}
+            )
+        return
+    insert = dialect_insert(model)
+    db.session.execute(
+        insert.on_conflict_do_update(
+            index_elements=[column.name for column in model.__table__.primary_key],
+            set_={column: getattr(model, column) + insert.excluded[column] for column in columns}
+        ),
+        rows
+    )
+
+def update_form_summary(form_id, form_fields, answer_rows, submitted_at):
+    """Count one new response into the form's summary counters.
+
+    Touches a row per answered field and chosen option, never the other
+    responses, so submitting costs the same however many there are.
+    """
+    choice_fields = {str(field['id']) for field in form_fields if field.get('type') in CHOICE_FIELD_TYPES}
+    fields = {}
+    options = {}
+    for row in answer_rows:
+        field_id = row['field_id']
+        counts = fields.setdefault(field_id, {'form_id': form_id, 'field_id': field_id, 'answered': 1, 'value_count': 0})
+        counts['value_count'] += 1
+        if field_id in choice_fields:
+            value = row['value_text'][:255]
+            options[(field_id, value)] = {'form_id': form_id, 'field_id': field_id, 'value': value, 'count': 1}
+    
+    increment_counts(FormFieldCount, list(fields.values()), 'answered', 'value_count')
+    increment_counts(FormOptionCount, list(options.values()), 'count')
+    increment_counts(FormDailyCount, [{'form_id': form_id, 'day': submitted_at.date(), 'count': 1}], 'count')
+
+def rebuild_form_summary(form_id):
+    """Recompute a form's summary counters from form_answers and form_responses"""
+    form = db.session.get(Form, form_id)
+    form_fields = form_schema(form) if form else ()
+    choice_fields = [str(field['id']) for field in form_fields if field.get('type') in CHOICE_FIELD_TYPES]
+    for model in (FormOptionCount, FormFieldCount, FormDailyCount):
+        model.query.filter_by(form_id=form_id).delete(synchronize_session=False)
+    
+    answers = FormAnswer.query.filter_by(form_id=form_id)
+    fields = answers.with_entities(
+        FormAnswer.field_id, db.func.count(db.distinct(FormAnswer.response_id)), db.func.count()
+    ).group_by(FormAnswer.field_id)
+    options = answers.filter(FormAnswer.field_id.in_(choice_fields)).with_entities(
+        FormAnswer.field_id, db.func.substr(FormAnswer.value_text, 1, 255), db.func.count(db.distinct(FormAnswer.response_id))
+    ).group_by(FormAnswer.field_id, db.func.substr(FormAnswer.value_text, 1, 255))
+    day = db.func.date(FormResponse.submitted_at)
+    days = db.session.query(day, db.func.count()).filter(FormResponse.form_id == form_id).group_by(day)
+    
+    increment_counts(FormFieldCount, [
+        {'form_id': form_id, 'field_id': field_id, 'answered': answered, 'value_count': value_count}
+        for field_id, answered, value_count in fields
+    ], 'answered', 'value_count')
+    increment_counts(FormOptionCount, [
+        {'form_id': form_id, 'field_id': field_id, 'value': value, 'count': count}
+        for field_id, value, count in options
+    ], 'count')
+    increment_counts(FormDailyCount, [
+        # SQLite returns date() as text
+        {'form_id': form_id, 'day': date.fromisoformat(str(submitted_day)), 'count': count}
+        for submitted_day, count in days
+    ], 'count')
+
+def filter_responses_by_answers(query, form_id, args):
+    """Narrow a FormResponse query by answer_<field_id>=<value> arguments.
+
+    Every filter must match; a multi-valued answer matches if any of its
+    values does.
+    """
+    for key, value in args.items():
+        if not key.startswith('answer_') or value == '':
+            continue
+        query = query.filter(
+            db.select(FormAnswer.id).where(
+                FormAnswer.response_id == FormResponse.id,
+                FormAnswer.form_id == form_id,
+                FormAnswer.field_id == key[len('answer_'):],
+                FormAnswer.value_text == value
+            ).exists()
+        )
+    return query
+
+def referenced_form_files(form_fields, responses):
+    """Return the staged filenames referenced by the file fields of a response"""
+    filenames = []
+    for field in form_fields:
+        if field.get('type') != 'file':
+            continue
+        value = responses.get(str(field['id']))
+        values = value if isinstance(value, list) else [value]
+        for filename in values:
+            # Only plain names are accepted; anything path-like is ignored
+            if isinstance(filename, str) and filename and filename == os.path.basename(filename):
+                filenames.append(filename)
+    return filenames
+
+def collect_abandoned_uploads():
+    """Delete staged form uploads that were never submitted"""
+    storage = get_storage()
+    cutoff = time.time() - app.config['FORM_STAGING_TTL_SECONDS']
+    removed = 0
+    # One listing of every form's files; staged uploads are recognised by key:
+    #   forms/<form_id>/staging/<student_id>/<upload_session>/<filename>
+    #   forms/<form_id>/temp/<filename>  (legacy shared area)
+    last_activity = {}
+    for obj in storage.list_prefix('forms/'):
+        parts = obj.key.split('/')
+        if len(parts) >= 6 and parts[2] == 'staging':
+            # Group by upload session and keep sessions with recent activity
+            session_prefix = '/'.join(parts[:5]) + '/'
+            last_activity[session_prefix] = max(last_activity.get(session_prefix, 0), obj.modified)
+        elif len(parts) == 4 and parts[2] == 'temp' and obj.modified < cutoff:
+            storage.delete(obj.key)
+            removed += 1
+    for session_prefix, modified in last_activity.items():
+        if modified < cutoff:
+            storage.delete_prefix(session_prefix)
+            removed += 1
+    if removed:
+        print(f"Removed {removed} abandoned staged uploads")
+
+register_periodic('staging-gc', Config.FORM_STAGING_GC_INTERVAL_SECONDS, collect_abandoned_uploads)
+
+def close_expired_forms():
+    """Deactivate forms whose deadline has passed, in bulk, and finalize them.
+
+    A closed form can no longer be submitted to, so its staged uploads are
+    dropped and its summary counters are rebuilt once from the stored
+    answers to give the final figures.
+    """
+    batch_size = app.config['FORM_LIFECYCLE_BATCH_SIZE']
+    storage = get_storage()
+    closed = 0
+    while True:
+        now = utcnow_naive()
+        ids = [form_id for (form_id,) in db.session.query(Form.id).filter(
+            Form.is_active.is_(True),
+            Form.deadline <= now,
+            Form.deleted_at.is_(None)
+        ).order_by(Form.deadline).limit(batch_size)]
+        if not ids:
+            break
+        # Re-check is_active so a concurrent run does not finalize the same forms twice
+        ids = [form_id for form_id in ids if Form.query.filter(
+            Form.id == form_id, Form.is_active.is_(True)
+        ).update({'is_active': False, 'closed_at': now}, synchronize_session=False)]
+        for form_id in ids:
+            rebuild_form_summary(form_id)
+        for form_id, branch in db.session.query(Form.id, Form.branch).filter(Form.id.in_(ids)):
+            publish_event(f'students:{branch}', 'form-closed', {'id': form_id})
+        if ids:
+            bump_data_version('forms')
+        db.session.commit()
+        
+        for form_id in ids:
+            storage.delete_prefix(f"{form_prefix(form_id)}staging/")
+            storage.delete_prefix(legacy_form_staging_prefix(form_id))
+        closed += len(ids)
+    if closed:
+        print(f"Closed {closed} forms past their deadline")
+
+register_periodic('form-lifecycle', Config.FORM_LIFECYCLE_INTERVAL_SECONDS, close_expired_forms)
+
 @app.route('/api/student/forms/<int:form_id>/submit', methods=['POST'])
 def submit_form_response(form_id):
     try:
@@ -1630,6 +2779,16 @@ def submit_form_response(form_id):
         if not all([form_id, student_id, responses]):
             return jsonify({'error': 'Missing required fields'}), 400
         
+        try:
+            student_id = int(student_id)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid student id'}), 400
+        
+        # The session names a storage prefix, so reject it before touching storage
+        upload_session = data.get('upload_session')
+        if upload_session and not (isinstance(upload_session, str) and UPLOAD_SESSION_PATTERN.match(upload_session)):
+            return jsonify({'error': 'Invalid upload session'}), 400
+        
         # Check if form exists and is active
         form = Form.query.filter_by(id=form_id, is_active=True).first()
         if not form:
@@ -1648,6 +2807,20 @@ def submit_form_response(form_id):
         if existing_response:
             return jsonify({'error': 'You have already submitted a response to this form'}), 400
         
+        form_fields = form_schema(form)
+        try:
+            validate_form_response(form_fields, responses)
+        except FormSchemaError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Every referenced file must be in this student's own staging area
+        storage = get_storage()
+        staging_prefix = form_staging_prefix(form_id, student_id, upload_session)
+        referenced = referenced_form_files(form_fields, responses)
+        missing = [filename for filename in referenced if not storage.exists(staging_prefix + filename)]
+        if missing:
+            return jsonify({'error': f"Uploaded file not found, please upload it again: {', '.join(missing)}"}), 400
+        
         # Create new response
         new_response = FormResponse(
             form_id=form_id,
@@ -1656,26 +2829,30 @@ def submit_form_response(form_id):
         )
         
         db.session.add(new_response)
-        db.session.commit()
+        bump_data_version('form_responses')
+        db.session.flush()
         
-        # Move uploaded files from temp to final location
-        temp_dir = os.path.join('uploads', 'forms', str(form_id), 'temp')
-        final_dir = os.path.join('uploads', 'forms', str(form_id), str(new_response.id))
-        
-        if os.path.exists(temp_dir):
-            os.makedirs(final_dir, exist_ok=True)
-            for filename in os.listdir(temp_dir):
-                if filename.startswith('temp_'):
-                    # Move file to final location
-                    src_path = os.path.join(temp_dir, filename)
-                    dst_path = os.path.join(final_dir, filename)
-                    os.rename(src_path, dst_path)
-            
-            # Remove temp directory
-            try:
-                os.rmdir(temp_dir)
-            except OSError:
-                pass  # Directory not empty, leave it
+        answer_rows = store_form_answers(form_id, new_response.id, form_fields, responses)
+        update_form_summary(form_id, form_fields, answer_rows, new_response.submitted_at)
+        
+        # Move only the files this response references out of the student's staging area
+        final_prefix = form_response_prefix(form_id, new_response.id)
+        moved = []
+        try:
+            for filename in referenced:
+                src_key = staging_prefix + filename
+                dst_key = final_prefix + filename
+                storage.move(src_key, dst_key)
+                moved.append((src_key, dst_key))
+            db.session.commit()
+        except Exception:
+            # Put staged files back so the student can retry the submission
+            for src_key, dst_key in moved:
+                storage.move(dst_key, src_key)
+            raise
+        
+        # Anything left in the staging area was superseded by a re-upload
+        storage.delete_prefix(staging_prefix)
         
         return jsonify({'message': 'Form submitted successfully'}), 201
         
@@ -1713,19 +2890,20 @@ def upload_form_file(form_id):
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({'error': 'Only PDF files are allowed'}), 400
         
-        # Create upload directory structure
-        upload_dir = os.path.join('uploads', 'forms', str(form_id), 'temp')
-        os.makedirs(upload_dir, exist_ok=True)
+        upload_session = request.form.get('upload_session')
+        if upload_session and not UPLOAD_SESSION_PATTERN.match(upload_session):
+            return jsonify({'error': 'Invalid upload session'}), 400
         
-        # Save file with unique name
-        filename = f"temp_{field_id}_{int(datetime.utcnow().timestamp())}_{file.filename}"
-        file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
+        # Stage the file per (form, student, upload session) until the form is submitted
+        filename = secure_filename(f"temp_{field_id}_{int(datetime.utcnow().timestamp())}_{file.filename}")
+        file_path = form_staging_prefix(form_id, student_id, upload_session) + filename
+        get_storage().put(file_path, file.stream, content_type='application/pdf')
         
         return jsonify({
             'message': 'File uploaded successfully',
             'filename': filename,
-            'file_path': file_path
+            'file_path': file_path,
+            'upload_session': upload_session
         }), 201
         
     except Exception as e:
@@ -1738,29 +2916,15 @@ def get_form_notifications():
         if not student_id:
             return jsonify({'error': 'Student ID required'}), 400
         
-        student = db.session.get(Student, student_id)
-        if not student:
+        profile = student_profile(student_id)
+        if not profile:
             return jsonify({'error': 'Student not found'}), 404
         
         # Get unresponded active forms
-        forms = Form.query.filter_by(
-            branch=student.branch,
-            is_active=True
-        ).filter(Form.deadline > datetime.utcnow()).all()
-        
-        unresponded_forms = []
-        for form in forms:
-            existing_response = FormResponse.query.filter_by(
-                form_id=form.id,
-                student_id=student_id
-            ).first()
-            
-            if not existing_response:
-                unresponded_forms.append({
-                    'id': form.id,
-                    'title': form.title,
-                    'deadline': form.deadline.isoformat()
-                })
+        unresponded_forms = [
+            {'id': form.id, 'title': form.title, 'deadline': form.deadline}
+            for form, has_responded in student_open_forms(profile) if not has_responded
+        ]
         
         return jsonify({
             'unresponded_count': len(unresponded_forms),
@@ -1792,6 +2956,12 @@ def send_deadline_reminders():
         if not forms:
             return jsonify({'message': 'No forms with deadlines tomorrow'}), 200
         
+        for form in forms:
+            publish_event(f'students:{form.branch}', 'form-deadline', {
+                'id': form.id, 'title': form.title, 'deadline': form.deadline
+            })
+        db.session.commit()
+        
         sent_count = 0
         for form in forms:
             # Get students in the same branch who haven't responded
@@ -1850,44 +3020,94 @@ SAT Portal Team
         return jsonify({'error': str(e)}), 500
 
 # ========== Admin Forms: Unsubmitted Students ==========
+# Roster sizes per (branch, year, section) as (students data version, size)
+roster_sizes = {}
+
+def roster_query(branch, year=None, section=None):
+    query = Student.query.filter(Student.branch == branch)
+    if year:
+        query = query.filter(Student.year == year)
+    if section:
+        query = query.filter(Student.section == section)
+    return query
+
+def roster_size(branch, year=None, section=None):
+    """Return the number of students in a roster, cached per process.
+
+    Entries are checked against the 'students' data version, which every
+    student create and update bumps, so writes made through other processes
+    invalidate them too.
+    """
+    key = (branch, year or None, section or None)
+    version = current_data_version('students')
+    cached = roster_sizes.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+    size = roster_query(branch, year, section).count()
+    roster_sizes[key] = (version, size)
+    return size
+
+def unsubmitted_students_query(form_id, branch, year=None, section=None):
+    """Students of a roster without a response to the form, as an anti-join ordered by id"""
+    responded = db.select(FormResponse.id).where(
+        FormResponse.form_id == form_id,
+        FormResponse.student_id == Student.id
+    ).exists()
+    return roster_query(branch, year, section).filter(~responded).order_by(Student.id)
+
+def unsubmitted_count(form_id, branch, year=None, section=None):
+    responded = (
+        roster_query(branch, year, section)
+        .join(FormResponse, FormResponse.student_id == Student.id)
+        .filter(FormResponse.form_id == form_id)
+        .with_entities(db.func.count(db.distinct(Student.id)))
+        .scalar()
+    )
+    return roster_size(branch, year, section) - responded
+
+def unsubmitted_form_for_admin(form_id, admin_id):
+    """Return (admin, form, error response) for the unsubmitted-students endpoints"""
+    if not admin_id:
+        return None, None, (jsonify({'error': 'Admin ID required'}), 400)
+    
+    admin = db.session.get(Admin, admin_id)
+    if not admin:
+        return None, None, (jsonify({'error': 'Admin not found'}), 404)
+    
+    form = db.session.get(Form, form_id)
+    if not form or form.deleted_at:
+        return None, None, (jsonify({'error': 'Form not found'}), 404)
+    if form.admin_id != admin.id and not is_super_admin(admin):
+        # Allow super admin to view all
+        return None, None, (jsonify({'error': 'Access denied'}), 403)
+    return admin, form, None
+
+UNSUBMITTED_PAGE_SIZE = 100
+UNSUBMITTED_MAX_PAGE_SIZE = 500
+
 @app.route('/api/admin/forms/<int:form_id>/unsubmitted', methods=['GET'])
 def get_unsubmitted_students(form_id):
     try:
-        admin_id = request.args.get('admin_id')
-        if not admin_id:
-            return jsonify({'error': 'Admin ID required'}), 400
-
-        admin = db.session.get(Admin, admin_id)
-        if not admin:
-            return jsonify({'error': 'Admin not found'}), 404
-
-        form = db.session.get(Form, form_id)
-        if not form:
-            return jsonify({'error': 'Form not found'}), 404
-        if form.admin_id != admin.id and ADMIN_CREDENTIALS.get('super@admin', {}).get('branch') != admin.branch:
-            # Allow super admin to view all
-            return jsonify({'error': 'Access denied'}), 403
+        admin, form, error = unsubmitted_form_for_admin(form_id, request.args.get('admin_id'))
+        if error:
+            return error
 
         # Optional filters: year, section
         year = request.args.get('year')
         section = request.args.get('section')
+        # Keyset pagination: pass the previous page's next_after to continue
+        after = request.args.get('after', type=int)
+        limit = max(1, min(request.args.get('limit', UNSUBMITTED_PAGE_SIZE, type=int), UNSUBMITTED_MAX_PAGE_SIZE))
 
-        # Students in admin branch
-        students_query = Student.query.filter_by(branch=admin.branch)
-        if year:
-            students_query = students_query.filter_by(year=year)
-        if section:
-            students_query = students_query.filter_by(section=section)
-        all_students = students_query.all()
-
-        # Responded student ids
-        responded = FormResponse.query.with_entities(FormResponse.student_id).filter_by(form_id=form_id).all()
-        responded_ids = {sid for (sid,) in responded}
-
-        unsubmitted = [s for s in all_students if s.id not in responded_ids]
+        query = unsubmitted_students_query(form_id, admin.branch, year, section)
+        if after:
+            query = query.filter(Student.id > after)
+        page = query.limit(limit + 1).all()
+        has_more = len(page) > limit
+        page = page[:limit]
 
         data = []
-        for s in unsubmitted:
+        for s in page:
             data.append({
                 'id': s.id,
                 'name': s.name,
@@ -1900,52 +3120,28 @@ def get_unsubmitted_students(form_id):
                 'gender': s.gender
             })
 
-        return jsonify({'unsubmitted': data, 'count': len(data)}), 200
+        return jsonify({
+            'unsubmitted': data,
+            'count': unsubmitted_count(form_id, admin.branch, year, section),
+            'next_after': page[-1].id if has_more else None
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/admin/forms/<int:form_id>/unsubmitted/download', methods=['GET'])
 def download_unsubmitted_students_excel(form_id):
     try:
-        admin_id = request.args.get('admin_id')
-        if not admin_id:
-            return jsonify({'error': 'Admin ID required'}), 400
-
-        admin = db.session.get(Admin, admin_id)
-        if not admin:
-            return jsonify({'error': 'Admin not found'}), 404
-
-        form = db.session.get(Form, form_id)
-        if not form:
-            return jsonify({'error': 'Form not found'}), 404
-        if form.admin_id != admin.id and ADMIN_CREDENTIALS.get('super@admin', {}).get('branch') != admin.branch:
-            return jsonify({'error': 'Access denied'}), 403
+        admin, form, error = unsubmitted_form_for_admin(form_id, request.args.get('admin_id'))
+        if error:
+            return error
 
         # Filters
         year = request.args.get('year')
         section = request.args.get('section')
 
-        students_query = Student.query.filter_by(branch=admin.branch)
-        if year:
-            students_query = students_query.filter_by(year=year)
-        if section:
-            students_query = students_query.filter_by(section=section)
-        all_students = students_query.all()
-
-        responded = FormResponse.query.with_entities(FormResponse.student_id).filter_by(form_id=form_id).all()
-        responded_ids = {sid for (sid,) in responded}
-        unsubmitted = [s for s in all_students if s.id not in responded_ids]
-
-        # Build Excel
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Unsubmitted Students"
-
         headers = ['ID', 'Name', 'Roll Number', 'Email', 'Phone', 'Branch', 'Section', 'Year', 'Gender']
-        ws.append(headers)
-
-        for s in unsubmitted:
-            ws.append([
+        rows = (
+            [
                 s.id,
                 s.name,
                 s.rollnumber,
@@ -1955,28 +3151,15 @@ def download_unsubmitted_students_excel(form_id):
                 s.section or 'N/A',
                 s.year or 'N/A',
                 s.gender or 'N/A'
-            ])
-
-        # Autosize columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except Exception:
-                    pass
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+            ]
+            for s in unsubmitted_students_query(form_id, admin.branch, year, section).yield_per(500)
+        )
+        output = write_xlsx("Unsubmitted Students", headers, rows, autosize=True)
 
         filename = f'unsubmitted_students_form_{form_id}.xlsx'
         return send_file(
             output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            mimetype=XLSX_MIMETYPE,
             as_attachment=True,
             download_name=filename
         )
@@ -2001,6 +3184,19 @@ def superadmin_list_admins():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/superadmin/cache-stats', methods=['GET'])
+def superadmin_cache_stats():
+    """Hit/miss counters of this worker's caches"""
+    try:
+        return jsonify({
+            'backend': app.config['CACHE_BACKEND'],
+            'cache': cache.stats(),
+            'form_schemas': schema_cache.stats(),
+            'responses': {'hits': response_cache.hits, 'misses': response_cache.misses}
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/superadmin/admins/<int:admin_id>/password', methods=['PUT'])
 def superadmin_change_admin_password(admin_id):
     try:
@@ -2050,12 +3246,19 @@ def superadmin_send_message():
             return jsonify({'error': 'Admin not found'}), 404
         msg = AdminMessage(admin_id=admin_id, subject=subject, body=body)
         db.session.add(msg)
+        db.session.flush()
+        publish_event(f'admin:{admin.id}', 'admin-message', {'id': msg.id, 'subject': msg.subject})
+        bump_data_version(f'admin_messages:{admin.id}')
         db.session.commit()
         return jsonify({'message': 'Message sent to admin'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def admin_messages_version(req):
+    return f"admin_messages:{req.args.get('admin_id')}"
+
 @app.route('/api/admin/messages', methods=['GET'])
+@versioned(admin_messages_version)
 def admin_get_messages():
     try:
         admin_id = request.args.get('admin_id')
@@ -2070,7 +3273,7 @@ def admin_get_messages():
                 'subject': m.subject,
                 'body': m.body,
                 'is_read': m.is_read,
-                'created_at': m.created_at.isoformat()
+                'created_at': m.created_at
             })
         return jsonify({'messages': data, 'unread_count': unread_count}), 200
     except Exception as e:
@@ -2083,6 +3286,8 @@ def admin_mark_message_read(message_id):
         if not msg:
             return jsonify({'error': 'Message not found'}), 404
         msg.is_read = True
+        publish_event(f'admin:{msg.admin_id}', 'admin-message-read', {'id': msg.id})
+        bump_data_version(f'admin_messages:{msg.admin_id}')
         db.session.commit()
         return jsonify({'message': 'Message marked as read'}), 200
     except Exception as e:
@@ -2096,58 +3301,336 @@ def delete_form(form_id):
             return jsonify({'error': 'Admin ID required'}), 400
         
         # Get the form and verify admin ownership
-        form = Form.query.filter_by(id=form_id, admin_id=admin_id).first()
+        form = Form.query.filter_by(id=form_id, admin_id=admin_id, deleted_at=None).first()
         if not form:
             return jsonify({'error': 'Form not found or access denied'}), 404
         
-        # Get all responses for this form
-        responses = FormResponse.query.filter_by(form_id=form_id).all()
+        # Tombstone the form; its files and rows are removed by the background reaper
+        form.deleted_at = utcnow_naive()
+        form.is_active = False
+        deletion = FormDeletion(
+            form_id=form.id,
+            admin_id=form.admin_id,
+            responses_total=FormResponse.query.filter_by(form_id=form_id).count()
+        )
+        db.session.add(deletion)
+        publish_event(f'students:{form.branch}', 'form-closed', {'id': form.id})
+        bump_data_version('forms')
+        db.session.commit()
+        schema_cache.invalidate(f'form:{form_id}')
         
-        # Delete uploaded files for each response
-        for response in responses:
-            response_dir = os.path.join('uploads', 'forms', str(form_id), str(response.id))
-            if os.path.exists(response_dir):
-                try:
-                    # Remove all files in the response directory
-                    for filename in os.listdir(response_dir):
-                        file_path = os.path.join(response_dir, filename)
-                        if os.path.isfile(file_path):
-                            os.remove(file_path)
-                    # Remove the response directory
-                    os.rmdir(response_dir)
-                except Exception as e:
-                    print(f"Error deleting files for response {response.id}: {str(e)}")
-        
-        # Delete the form directory (including temp files)
-        form_dir = os.path.join('uploads', 'forms', str(form_id))
-        if os.path.exists(form_dir):
-            try:
-                # Remove all files and subdirectories
-                for root, dirs, files in os.walk(form_dir, topdown=False):
-                    for file in files:
-                        os.remove(os.path.join(root, file))
-                    for dir in dirs:
-                        os.rmdir(os.path.join(root, dir))
-                # Remove the form directory
-                os.rmdir(form_dir)
-            except Exception as e:
-                print(f"Error deleting form directory: {str(e)}")
+        submit_task(app, reap_deleted_forms)
         
-        # Delete all form responses from database
-        FormResponse.query.filter_by(form_id=form_id).delete()
+        return jsonify({
+            'message': 'Form deleted successfully. Responses and uploaded files are being removed in the background.',
+            'deletion': form_deletion_to_dict(deletion)
+        }), 202
         
-        # Delete the form from database
-        db.session.delete(form)
-        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/forms/<int:form_id>/deletion', methods=['GET'])
+def get_form_deletion_status(form_id):
+    try:
+        admin_id = request.args.get('admin_id')
+        if not admin_id:
+            return jsonify({'error': 'Admin ID required'}), 400
+        
+        deletion = FormDeletion.query.filter_by(form_id=form_id, admin_id=admin_id).order_by(FormDeletion.id.desc()).first()
+        if not deletion:
+            return jsonify({'error': 'No deletion found for this form'}), 404
         
-        return jsonify({'message': 'Form and all responses deleted successfully'}), 200
+        return jsonify({'deletion': form_deletion_to_dict(deletion)}), 200
         
     except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def form_deletion_to_dict(deletion):
+    return {
+        'form_id': deletion.form_id,
+        'status': deletion.status,
+        'responses_total': deletion.responses_total,
+        'responses_deleted': deletion.responses_deleted,
+        'files_deleted': deletion.files_deleted,
+        'requested_at': deletion.requested_at,
+        'completed_at': deletion.completed_at
+    }
+
+def claim_form_deletion(deletion_id):
+    """Atomically take ownership of a deletion so only one worker reaps it.
+
+    A Running deletion whose heartbeat is older than the lease belonged to a
+    worker that died, so it can be claimed again and resumed.
+    """
+    now = utcnow_naive()
+    stale = now - timedelta(seconds=app.config['FORM_REAPER_LEASE_SECONDS'])
+    claimed = FormDeletion.query.filter(
+        FormDeletion.id == deletion_id,
+        db.or_(
+            FormDeletion.status == 'Pending',
+            db.and_(FormDeletion.status == 'Running', FormDeletion.updated_at < stale)
+        )
+    ).update({'status': 'Running', 'updated_at': now}, synchronize_session=False)
+    db.session.commit()
+    return claimed == 1
+
+def reap_form(deletion):
+    """Delete a tombstoned form's files and rows in bounded, committed batches"""
+    batch_size = app.config['FORM_REAPER_BATCH_SIZE']
+    storage = get_storage()
+    prefix = form_prefix(deletion.form_id)
+    
+    while True:
+        batch = [obj.key for _, obj in zip(range(batch_size), storage.list_prefix(prefix))]
+        if not batch:
+            break
+        for key in batch:
+            storage.delete(key)
+        deletion.files_deleted += len(batch)
+        deletion.updated_at = utcnow_naive()
+        db.session.commit()
+    
+    while True:
+        ids = [response_id for (response_id,) in db.session.query(FormResponse.id).filter_by(form_id=deletion.form_id).limit(batch_size)]
+        if not ids:
+            break
+        FormAnswer.query.filter(FormAnswer.response_id.in_(ids)).delete(synchronize_session=False)
+        FormResponse.query.filter(FormResponse.id.in_(ids)).delete(synchronize_session=False)
+        deletion.responses_deleted += len(ids)
+        deletion.updated_at = utcnow_naive()
+        db.session.commit()
+    
+    for model in (FormOptionCount, FormFieldCount, FormDailyCount):
+        model.query.filter_by(form_id=deletion.form_id).delete(synchronize_session=False)
+    Form.query.filter_by(id=deletion.form_id).delete(synchronize_session=False)
+    deletion.status = 'Done'
+    deletion.completed_at = deletion.updated_at = utcnow_naive()
+    db.session.commit()
+    schema_cache.invalidate(f'form:{deletion.form_id}')
+
+def reap_deleted_forms():
+    """Finish every outstanding form deletion; safe to run from several workers"""
+    pending = FormDeletion.query.filter(FormDeletion.status != 'Done').order_by(FormDeletion.id).all()
+    for deletion in pending:
+        if claim_form_deletion(deletion.id):
+            db.session.refresh(deletion)
+            reap_form(deletion)
+
+register_periodic('form-reaper', Config.FORM_REAPER_INTERVAL_SECONDS, reap_deleted_forms)
+
+# ========== Event stream ==========
+# Write paths publish_event() in the transaction of their change. Every worker
+# pumps newly committed rows into its hub, which feeds the SSE streams and long
+# polls connected to it. Row ids are taken at insert, so on PostgreSQL an event
+# can commit after one with a higher id; clients therefore only see events once
+# sequence_events() has numbered them (seq, sent as the event id), which happens
+# after commit and in commit order, so a cursor never moves past an event that
+# is yet to arrive.
+EVENT_SEQUENCE_LOCK = 0x5A7E  # PostgreSQL advisory lock key serializing sequence_events()
+
+event_hub = EventHub(Config.EVENT_QUEUE_SIZE, Config.EVENT_MAX_SUBSCRIBERS)
+
+def publish_event(channel, event_type, data):
+    """Queue an event for the clients following channel; it is sent once the caller commits"""
+    db.session.add(Event(channel=channel, type=event_type, data=app.json.dumps(data)))
+
+def event_to_dict(row):
+    return {'id': row.seq, 'channel': row.channel, 'type': row.type, 'data': row.data}
+
+def events_after(channels, after_id, limit):
+    rows = (
+        Event.query.filter(Event.channel.in_(channels), Event.seq > after_id)
+        .order_by(Event.seq)
+        .limit(limit)
+    )
+    return [event_to_dict(row) for row in rows]
+
+def latest_event_id():
+    return db.session.query(db.func.max(Event.seq)).scalar() or 0
+
+def sequence_events():
+    """Number the committed events that have no seq yet, continuing after the highest seq.
+
+    Runs under an advisory lock on PostgreSQL, so numbering happens one worker
+    at a time and every seq is visible before a higher one is handed out. On
+    other databases a concurrent run fails on the unique seq index instead,
+    and the next pump retries.
+    """
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            db.session.execute(db.text('SELECT pg_advisory_xact_lock(:key)'), {'key': EVENT_SEQUENCE_LOCK})
+        pending = [event_id for (event_id,) in (
+            db.session.query(Event.id).filter(Event.seq.is_(None)).order_by(Event.id).limit(500)
+        )]
+        if pending:
+            last_seq = latest_event_id()
+            db.session.execute(
+                db.update(Event),
+                [{'id': event_id, 'seq': last_seq + offset} for offset, event_id in enumerate(pending, 1)]
+            )
+        db.session.commit()
+    except IntegrityError:
         db.session.rollback()
+
+def pump_events():
+    """Dispatch events sequenced since the last pump to this worker's subscribers"""
+    sequence_events()
+    if event_hub.last_id is None:
+        event_hub.last_id = latest_event_id()
+    while True:
+        rows = Event.query.filter(Event.seq > event_hub.last_id).order_by(Event.seq).limit(500).all()
+        if not rows:
+            break
+        event_hub.dispatch([event_to_dict(row) for row in rows])
+
+def prune_events():
+    cutoff = utcnow_naive() - timedelta(seconds=app.config['EVENT_RETENTION_SECONDS'])
+    Event.query.filter(Event.created_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+
+register_periodic('event-pump', Config.EVENT_PUMP_SECONDS, pump_events)
+register_periodic('event-gc', Config.EVENT_GC_INTERVAL_SECONDS, prune_events)
+
+def event_channels(args):
+    """Return the channels a student or admin follows, or None if neither is valid"""
+    if args.get('student_id'):
+        profile = student_profile(args['student_id'])
+        return [f"students:{profile['branch']}"] if profile else None
+    if args.get('admin_id'):
+        admin = db.session.get(Admin, args['admin_id'])
+        if not admin:
+            return None
+        branch = admin.branch
+        if is_super_admin(admin):
+            # Only the super admin may follow another department's dashboard
+            branch = args.get('branch') or branch
+        return [f'admin:{admin.id}', f'admins:{branch}']
+    return None
+
+def events_busy():
+    response = jsonify({'error': 'Too many open event streams, try again shortly'})
+    response.headers['Retry-After'] = str(app.config['EVENT_BUSY_RETRY_SECONDS'])
+    return response, 503
+
+def event_cursor(value):
+    """Parse a client's last seen event id, defaulting to the latest event"""
+    return int(value) if value and value.isdigit() else latest_event_id()
+
+@app.route('/api/events/stream', methods=['GET'])
+def event_stream():
+    """Server-sent events for a student (student_id) or an admin (admin_id).
+
+    Events after Last-Event-ID are replayed first. Streams end after
+    EVENT_STREAM_SECONDS, or when the client falls too far behind, and the
+    browser reconnects from the last id it saw. Each open stream holds a
+    worker thread, so past EVENT_MAX_SUBSCRIBERS this answers 503 and the
+    client falls back to long polling.
+    """
+    try:
+        channels = event_channels(request.args)
+        if not channels:
+            return jsonify({'error': 'A valid student_id or admin_id is required'}), 400
+        
+        # Subscribe before reading the backlog so nothing committed in between is lost
+        subscription = event_hub.subscribe(channels)
+        if subscription is None:
+            return events_busy()
+        try:
+            cursor = event_cursor(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+            backlog = events_after(channels, cursor, app.config['EVENT_BACKLOG_LIMIT'] + 1)
+            if len(backlog) > app.config['EVENT_BACKLOG_LIMIT']:
+                # Too much was missed to replay; tell the client to reload instead
+                backlog = [{'id': latest_event_id(), 'type': 'resync', 'data': '{}'}]
+        except Exception:
+            event_hub.unsubscribe(subscription)
+            raise
+        finally:
+            db.session.close()
+        
+        retry_ms = app.config['EVENT_RETRY_MS']
+        heartbeat = app.config['EVENT_HEARTBEAT_SECONDS']
+        deadline = time.monotonic() + app.config['EVENT_STREAM_SECONDS']
+        
+        def stream():
+            sent = cursor
+            try:
+                yield f'retry: {retry_ms}\n\n'
+                for item in backlog:
+                    yield format_sse(item)
+                    sent = max(sent, item['id'])
+                while time.monotonic() < deadline and not subscription.overflowed:
+                    message = subscription.get(heartbeat)
+                    if message is None:
+                        yield ': keep-alive\n\n'
+                    elif message['id'] > sent:
+                        yield format_sse(message)
+                        sent = message['id']
+            finally:
+                event_hub.unsubscribe(subscription)
+        
+        response = Response(
+            stream(),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        # Also frees the slot when the client leaves before the stream starts
+        response.call_on_close(lambda: event_hub.unsubscribe(subscription))
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/events/poll', methods=['GET'])
+def poll_events():
+    """Long-polling fallback for clients that cannot keep an event stream open.
+
+    Returns the events after `after` as soon as there are any, or an empty
+    list after `timeout` seconds. Without `after` it returns the current
+    cursor immediately. When every EVENT_MAX_SUBSCRIBERS slot is taken it
+    does not wait either, and Retry-After tells the client when to poll again.
+    """
+    try:
+        channels = event_channels(request.args)
+        if not channels:
+            return jsonify({'error': 'A valid student_id or admin_id is required'}), 400
+        
+        after = request.args.get('after', '')
+        if not after.isdigit():
+            return jsonify({'events': [], 'last_id': latest_event_id()}), 200
+        after = int(after)
+        timeout = min(request.args.get('timeout', app.config['EVENT_LONG_POLL_SECONDS'], type=float),
+                      app.config['EVENT_LONG_POLL_SECONDS'])
+        limit = app.config['EVENT_BACKLOG_LIMIT']
+        
+        subscription = event_hub.subscribe(channels)
+        try:
+            events = events_after(channels, after, limit + 1)
+            if len(events) > limit:
+                return jsonify({'events': [], 'last_id': latest_event_id(), 'resync': True}), 200
+            # Do not hold a database connection while waiting
+            db.session.close()
+            if not events and subscription is not None:
+                message = subscription.get(timeout)
+                if message is not None:
+                    events = [item for item in [message] + subscription.drain() if item['id'] > after]
+        finally:
+            if subscription is not None:
+                event_hub.unsubscribe(subscription)
+        
+        response = jsonify({
+            'events': [{'id': item['id'], 'type': item['type'], 'data': json.loads(item['data'])} for item in events],
+            'last_id': events[-1]['id'] if events else after
+        })
+        if subscription is None:
+            response.headers['Retry-After'] = str(app.config['EVENT_BUSY_RETRY_SECONDS'])
+        return response, 200
+        
+    except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        ensure_schema()
         sync_admin_credentials()
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
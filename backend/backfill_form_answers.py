@@ -0,0 +1,80 @@
+"""
+Populate form_answers for responses submitted before the table existed, then
+rebuild every form's summary counters from it.
+
+Responses are read in id order and their answers inserted in small committed
+batches. Responses that already have answer rows are skipped, so the script
+is idempotent and can be interrupted and re-run while the portal is serving
+traffic. Each form's summary is rebuilt in its own transaction; a response
+submitted to that form during its rebuild may be miscounted, so rebuild at
+a quiet time (re-running the script corrects it).
+
+Usage: python backfill_form_answers.py [--batch-size 500] [--pause 0.2]
+"""
+
+import argparse
+import json
+import time
+
+from app import app, db, ensure_schema, form_answer_rows, form_schema, rebuild_form_summary, Form, FormAnswer, FormResponse
+
+def backfill_form_answers(batch_size, pause):
+    filled = 0
+    last_id = 0
+    form_fields = {}
+    while True:
+        batch = (
+            db.session.query(FormResponse.id, FormResponse.form_id, FormResponse.responses)
+            .filter(
+                FormResponse.id > last_id,
+                ~db.select(FormAnswer.id).where(FormAnswer.response_id == FormResponse.id).exists()
+            )
+            .order_by(FormResponse.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        rows = []
+        for response_id, form_id, responses in batch:
+            if form_id not in form_fields:
+                form = db.session.get(Form, form_id)
+                form_fields[form_id] = form_schema(form) if form else ()
+            try:
+                answers = json.loads(responses) if responses else {}
+            except ValueError:
+                print(f"Skipping response {response_id}: responses are not valid JSON")
+                continue
+            rows.extend(form_answer_rows(form_id, response_id, form_fields[form_id], answers))
+
+        if rows:
+            db.session.execute(db.insert(FormAnswer), rows)
+        db.session.commit()
+        filled += len(batch)
+        print(f"Responses up to id {last_id}: {filled} backfilled")
+        time.sleep(pause)
+    return filled
+
+def rebuild_form_summaries():
+    form_ids = [form_id for (form_id,) in db.session.query(Form.id).filter(Form.deleted_at.is_(None)).order_by(Form.id)]
+    for form_id in form_ids:
+        rebuild_form_summary(form_id)
+        db.session.commit()
+    return len(form_ids)
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill the form_answers table')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.2, help='seconds to sleep between batches')
+    args = parser.parse_args()
+
+    with app.app_context():
+        ensure_schema()
+        filled = backfill_form_answers(args.batch_size, args.pause)
+        forms = rebuild_form_summaries()
+    print(f"Done: {filled} responses backfilled, {forms} form summaries rebuilt")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Render missing first-page previews for certificates uploaded earlier.
+
+Certificates are read in id order in batches; each batch's previews are
+rendered on the background pool and collected before the next batch is
+submitted, so at most one batch of renders is queued at a time. Certificates
+that already have a preview are skipped, so the script can be interrupted
+and re-run.
+
+Usage: python backfill_previews.py [--batch-size 100]
+"""
+
+import argparse
+
+from app import app, db, Certificate
+from background import submit_task
+from previews import preview_key_for, previews_supported, render_preview
+from storage import get_storage, resolve_certificate_key
+
+def render_batch(batch):
+    """Render the previews of one batch of (cert_id, file_key) and return how many succeeded"""
+    futures = [(cert_id, submit_task(app, render_preview, file_key)) for cert_id, file_key in batch]
+    rendered = 0
+    for cert_id, future in futures:
+        try:
+            if future.result():
+                rendered += 1
+        except Exception as e:
+            print(f"Failed to render preview for certificate {cert_id}: {e}")
+    return rendered
+
+def backfill_previews(batch_size):
+    if not previews_supported():
+        print("PyMuPDF is not installed; cannot render previews")
+        return
+
+    with app.app_context():
+        storage = get_storage()
+        missing = 0
+        rendered = 0
+        last_id = 0
+        while True:
+            certificates = (
+                db.session.query(Certificate.id, Certificate.file_path)
+                .filter(Certificate.id > last_id)
+                .order_by(Certificate.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not certificates:
+                break
+            last_id = certificates[-1].id
+
+            batch = []
+            for cert_id, file_path in certificates:
+                file_key = resolve_certificate_key(file_path)
+                if file_key and not storage.exists(preview_key_for(file_key)):
+                    batch.append((cert_id, file_key))
+            if batch:
+                missing += len(batch)
+                rendered += render_batch(batch)
+                print(f"Certificates up to id {last_id}: {rendered} of {missing} missing previews rendered")
+
+        print(f"Rendered {rendered} of {missing} missing previews")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render missing certificate previews')
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+    backfill_previews(args.batch_size)
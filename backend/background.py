@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+# Shared pool for work that should not block a request (preview rendering etc.)
+executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('BACKGROUND_WORKERS', '2')),
+    thread_name_prefix='sat-worker'
+)
+
+# Periodic maintenance jobs: (name, interval_seconds, func)
+_periodic_jobs = []
+_started = False
+_start_lock = threading.Lock()
+
+def submit_task(app, func, *args, **kwargs):
+    """Run func(*args, **kwargs) on the worker pool inside an app context"""
+    def run():
+        with app.app_context():
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                print(f"Background task {func.__name__} failed: {e}")
+                raise
+    return executor.submit(run)
+
+def register_periodic(name, interval_seconds, func):
+    """Register func to run every interval_seconds once jobs are started"""
+    _periodic_jobs.append((name, interval_seconds, func))
+
+def start_periodic_jobs(app):
+    """Start one daemon thread per registered periodic job (idempotent).
+
+    app.config['PERIODIC_JOBS'], if set, limits this to the jobs it names.
+    """
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        enabled = {name.strip() for name in app.config.get('PERIODIC_JOBS', '').split(',') if name.strip()}
+        for name, interval_seconds, func in _periodic_jobs:
+            if enabled and name not in enabled:
+                continue
+            thread = threading.Thread(
+                target=_run_periodic,
+                args=(app, name, interval_seconds, func),
+                name=f'sat-{name}',
+                daemon=True
+            )
+            thread.start()
+
+def _run_periodic(app, name, interval_seconds, func):
+    while True:
+        with app.app_context():
+            try:
+                func()
+            except Exception as e:
+                print(f"Periodic job {name} failed: {e}")
+        time.sleep(interval_seconds)
@@ -0,0 +1,99 @@
+"""
+Benchmark the all-departments certificate report.
+
+Builds a throwaway database with the same number of certificates in every
+department, then builds one report per department either one after the
+other in a single process (as a request for each department would) or in
+the export process pool with a given number of workers. Each case runs in
+its own process (see harness.py); peak RSS covers the parent only.
+
+Usage: python benchmarks/branch_exports.py [--per-branch 2000] [--type pdf] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import tempfile
+from datetime import datetime
+
+from harness import measure, print_header, print_row, run_case
+
+def use_workspace(workspace):
+    """Point the app at the benchmark database; call before importing app"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workspace, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workspace, 'uploads')
+
+def build_workspace(workspace, per_branch):
+    use_workspace(workspace)
+    from app import app, db, ensure_schema, department_branches, Certificate, Student
+
+    with app.app_context():
+        ensure_schema()
+        for code, branch in department_branches():
+            students = [
+                Student(
+                    name=f'Student {code} {i}', rollnumber=f'{code}{i:08d}', email=f'{code}{i}@example.com',
+                    password='x', branch=branch, year='I', section='A'
+                )
+                for i in range(per_branch)
+            ]
+            db.session.add_all(students)
+            db.session.flush()
+            db.session.add_all(
+                Certificate(
+                    student_id=student.id, certificate_name='Benchmark event', name=student.name,
+                    email=student.email, branch=branch, year='I', event_type='Workshop',
+                    file_path='missing.pdf', status='Pending', uploaded_at=datetime.utcnow()
+                )
+                for student in students
+            )
+        db.session.commit()
+
+def run_sequential(report_type, out_dir):
+    from app import app, department_branches
+    from parallel_exports import _build_branch_report
+
+    with app.app_context():
+        branches = [branch for _, branch in department_branches()]
+    paths = [
+        _build_branch_report(branch, report_type, {}, 'http://localhost:5000', out_dir, index)
+        for index, branch in enumerate(branches)
+    ]
+    return sum(os.path.getsize(path) for path in paths)
+
+def run_parallel(report_type, out_dir, workers):
+    from app import app, department_branches
+    from parallel_exports import build_branch_reports
+
+    with app.app_context():
+        branches = [branch for _, branch in department_branches()]
+    paths = build_branch_reports(branches, report_type, {}, 'http://localhost:5000', out_dir, workers)
+    return sum(os.path.getsize(path) for path in paths.values())
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the all-departments report')
+    parser.add_argument('--per-branch', type=int, default=2000)
+    parser.add_argument('--type', default='pdf', choices=['excel', 'pdf', 'csv', 'ndjson'])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--case', nargs=4, metavar=('WORKERS', 'WORKSPACE', 'TYPE', 'OUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        workers, workspace, report_type, out_dir = args.case
+        use_workspace(workspace)
+        if workers == '0':
+            measure(run_sequential, report_type, out_dir)
+        else:
+            measure(run_parallel, report_type, out_dir, int(workers))
+        return
+
+    print(f'{os.cpu_count()} CPUs, {args.type} reports')
+    print_header()
+    with tempfile.TemporaryDirectory() as workspace:
+        build_workspace(workspace, args.per_branch)
+        for workers in [0] + args.workers:
+            with tempfile.TemporaryDirectory() as out_dir:
+                mode = 'serial' if workers == 0 else f'{workers} procs'
+                print_row(args.per_branch, mode, run_case(__file__, workers, workspace, args.type, out_dir))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark the spreadsheet export engine against the old in-memory workbook.
+
+Rows are read from a throwaway SQLite database shaped like the students
+table; each case runs in its own process (see harness.py).
+
+Usage: python benchmarks/excel_export.py [--rows 10000 100000 500000] [--modes inmemory streaming]
+"""
+
+import argparse
+import io
+import os
+import sqlite3
+import tempfile
+
+from harness import measure, print_header, print_row, run_case
+
+HEADERS = ['ID', 'Name', 'Roll Number', 'Email', 'Phone', 'Gender', 'Branch', 'Section', 'Year', 'Created At']
+SELECT = 'SELECT id, name, rollnumber, email, phone, gender, branch, section, year, created_at FROM students ORDER BY id'
+
+def build_database(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE students (id INTEGER PRIMARY KEY, name TEXT, rollnumber TEXT, email TEXT, phone TEXT, '
+        'gender TEXT, branch TEXT, section TEXT, year TEXT, created_at TEXT)'
+    )
+    conn.executemany(
+        'INSERT INTO students VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            (i, f'Student {i}', f'{i:010d}', f'student{i}@example.com', f'9{i:09d}',
+             ('Male', 'Female')[i % 2], 'CSE', 'ABC'[i % 3], ('I', 'II', 'III', 'IV')[i % 4], '2025-01-01 09:00:00')
+            for i in range(1, rows + 1)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+def run_inmemory(engine):
+    import openpyxl
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        rows = conn.execute(text(SELECT)).all()
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(HEADERS)
+    for row in rows:
+        ws.append(list(row))
+    output = io.BytesIO()
+    wb.save(output)
+    return output.tell()
+
+def run_streaming(engine):
+    from sqlalchemy import text
+    from exports import write_xlsx
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=500).execute(text(SELECT))
+        output = write_xlsx('Students Report', HEADERS, (list(row) for row in result), autosize=True)
+    size = output.seek(0, io.SEEK_END)
+    output.close()
+    return size
+
+MODES = {'inmemory': run_inmemory, 'streaming': run_streaming}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark xlsx exports')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 500000])
+    parser.add_argument('--modes', nargs='+', default=['inmemory', 'streaming'])
+    parser.add_argument('--case', nargs=2, metavar=('MODE', 'DB'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        from sqlalchemy import create_engine
+        mode, db_path = args.case
+        measure(MODES[mode], create_engine(f'sqlite:///{db_path}'))
+        return
+
+    print_header()
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            db_path = os.path.join(tmp, f'students_{rows}.db')
+            build_database(db_path, rows)
+            for mode in args.modes:
+                print_row(rows, mode, run_case(__file__, mode, db_path))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark the form responses spreadsheet export.
+
+Builds a throwaway database and upload folder holding one form with five
+file fields and two choice fields, answered by every student with one
+small file per file field. Then it times the export endpoint against the
+previous per-row implementation (a student lookup and storage checks per
+response, an in-memory workbook and a full rescan for column widths).
+Each case runs in its own process (see harness.py).
+
+Usage: python benchmarks/form_responses_export.py [--responses 2000] [--modes legacy current]
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from harness import measure, print_header, print_row, run_case
+
+FILE_FIELDS = 5
+FORM_FIELDS = (
+    [{'id': i, 'label': f'Document {i}', 'type': 'file'} for i in range(1, FILE_FIELDS + 1)] +
+    [
+        {'id': FILE_FIELDS + 1, 'label': 'Year of study', 'type': 'radio', 'options': ['I', 'II', 'III', 'IV']},
+        {'id': FILE_FIELDS + 2, 'label': 'Interests', 'type': 'checkbox', 'options': ['AI', 'Web', 'Systems']}
+    ]
+)
+
+def use_workspace(workspace):
+    """Point the app at the benchmark database and uploads; call before importing app"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workspace, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workspace, 'uploads')
+
+def build_workspace(workspace, responses):
+    use_workspace(workspace)
+    from app import app, db, ensure_schema, Admin, Form, FormResponse, Student
+    from storage import form_response_prefix, get_storage
+
+    with app.app_context():
+        ensure_schema()
+        admin = Admin(name='Bench', employee_id='bench@cse', email='bench@example.com', password='x', branch='CSE')
+        db.session.add(admin)
+        db.session.flush()
+        form = Form(
+            title='Benchmark form', admin_id=admin.id, branch='CSE',
+            deadline=datetime.utcnow() + timedelta(days=7), form_fields=json.dumps(FORM_FIELDS)
+        )
+        db.session.add(form)
+        db.session.flush()
+
+        storage = get_storage()
+        for i in range(responses):
+            student = Student(
+                name=f'Student {i}', rollnumber=f'{i:010d}', email=f'student{i}@example.com',
+                password='x', branch='CSE', year='I', section='A'
+            )
+            db.session.add(student)
+            db.session.flush()
+            answers = {str(field['id']): f"temp_{field['id']}_1700000000_doc{i}.pdf" for field in FORM_FIELDS[:FILE_FIELDS]}
+            answers[str(FILE_FIELDS + 1)] = 'II'
+            answers[str(FILE_FIELDS + 2)] = ['AI', 'Web']
+            response = FormResponse(form_id=form.id, student_id=student.id, responses=json.dumps(answers))
+            db.session.add(response)
+            db.session.flush()
+            for filename in list(answers.values())[:FILE_FIELDS]:
+                storage.put(form_response_prefix(form.id, response.id) + filename, io.BytesIO(b'%PDF-1.4\n'))
+        db.session.commit()
+        return form.id, admin.id
+
+def run_legacy(form_id, admin_id):
+    import openpyxl
+    from app import app, db, Form, FormResponse, Student
+    from storage import get_storage, resolve_form_response_prefix
+
+    with app.app_context():
+        form = db.session.get(Form, form_id)
+        form_fields = json.loads(form.form_fields)
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        headers = ['Student Name', 'Roll Number', 'Student Email', 'Submission Date'] + [f['label'] for f in form_fields]
+        for col, header in enumerate(headers, 1):
+            ws.cell(row=1, column=col, value=header)
+        storage = get_storage()
+        for row, response in enumerate(FormResponse.query.filter_by(form_id=form_id).all(), 2):
+            student = db.session.get(Student, response.student_id)
+            answers = json.loads(response.responses)
+            prefix = resolve_form_response_prefix(form_id, response.id)
+            ws.cell(row=row, column=1, value=student.name)
+            ws.cell(row=row, column=2, value=student.rollnumber)
+            ws.cell(row=row, column=3, value=student.email)
+            ws.cell(row=row, column=4, value=response.submitted_at.strftime('%Y-%m-%d %H:%M:%S'))
+            for col, field in enumerate(form_fields, 5):
+                value = answers.get(str(field['id']), '')
+                if isinstance(value, list):
+                    value = ', '.join(value)
+                elif field['type'] == 'file' and value:
+                    if storage.exists(prefix + value):
+                        url = f"http://localhost:5000/api/admin/forms/{form_id}/responses/{response.id}/files/{value}?admin_id={admin_id}"
+                        value = f'=HYPERLINK("{url}","{value}")'
+                    else:
+                        value = f'File not found: {value}'
+                ws.cell(row=row, column=col, value=value)
+        for column in ws.columns:
+            width = max(len(str(cell.value)) for cell in column)
+            ws.column_dimensions[column[0].column_letter].width = min(width + 2, 50)
+        output = io.BytesIO()
+        wb.save(output)
+        return output.tell()
+
+def run_current(form_id, admin_id):
+    from app import app
+    client = app.test_client()
+    response = client.get(f'/api/admin/forms/{form_id}/responses/download?admin_id={admin_id}')
+    assert response.status_code == 200, response.data[:200]
+    return len(response.data)
+
+MODES = {'legacy': run_legacy, 'current': run_current}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the form responses export')
+    parser.add_argument('--responses', type=int, default=2000)
+    parser.add_argument('--modes', nargs='+', default=['legacy', 'current'])
+    parser.add_argument('--case', nargs=4, metavar=('MODE', 'WORKSPACE', 'FORM', 'ADMIN'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        mode, workspace, form_id, admin_id = args.case
+        use_workspace(workspace)
+        measure(MODES[mode], int(form_id), int(admin_id))
+        return
+
+    print_header()
+    with tempfile.TemporaryDirectory() as workspace:
+        form_id, admin_id = build_workspace(workspace, args.responses)
+        for mode in args.modes:
+            print_row(args.responses, mode, run_case(__file__, mode, workspace, form_id, admin_id))
+
+if __name__ == '__main__':
+    main()
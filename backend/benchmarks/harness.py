@@ -0,0 +1,40 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Every case runs in a fresh interpreter so the peak RSS it reports belongs to
+that case alone: the parent re-invokes the script with --case and reads back
+one line of whitespace-separated measurements.
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+def measure(func, *args):
+    """Run func and print seconds, peak RSS in MB and func's result in MB"""
+    start = time.perf_counter()
+    size = func(*args)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{elapsed:.2f} {peak_mb:.1f} {size / 1024 / 1024:.1f}')
+
+def run_case(script, *case_args):
+    """Run one case of script in a subprocess and return its measurements"""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(script), '--case', *map(str, case_args)],
+        check=True, capture_output=True, text=True
+    )
+    return out.stdout.split()
+
+def print_header():
+    print(f"{'rows':>8} {'mode':>10} {'seconds':>8} {'peak MB':>8} {'file MB':>8}")
+
+def print_row(rows, mode, measurements):
+    seconds, peak_mb, file_mb = measurements
+    print(f'{rows:>8} {mode:>10} {seconds:>8} {peak_mb:>8} {file_mb:>8}')
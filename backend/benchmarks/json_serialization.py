@@ -0,0 +1,95 @@
+"""
+Benchmark serializing the admin certificate listing.
+
+Compares the old path (per-field strftime, Flask's default JSON provider)
+with the shared serializers and FastJSONProvider on an in-memory listing,
+so only dict building and JSON encoding are timed. The provider falls back
+to the standard json module when orjson is not installed.
+
+Usage: python benchmarks/json_serialization.py [--rows 50000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+def legacy_certificate_to_dict(cert, rollnumber, section):
+    return {
+        'id': cert.id,
+        'student_name': cert.name,
+        'rollnumber': rollnumber or 'N/A',
+        'email': cert.email,
+        'branch': cert.branch,
+        'section': section if rollnumber is not None else 'N/A',
+        'year': cert.year,
+        'certificate_name': cert.certificate_name,
+        'event_type': cert.event_type,
+        'start_date': cert.start_date.strftime('%Y-%m-%d') if cert.start_date else None,
+        'end_date': cert.end_date.strftime('%Y-%m-%d') if cert.end_date else None,
+        'status': cert.status,
+        'uploaded_at': cert.uploaded_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'file_path': cert.file_path
+    }
+
+def build_rows(count):
+    uploaded = datetime(2025, 1, 1, 9, 0, 0)
+    return [
+        (
+            SimpleNamespace(
+                id=i, name=f'Student {i}', email=f'student{i}@example.com', branch='COMPUTER SCIENCE AND ENGINEERING',
+                year='II', certificate_name=f'Workshop {i % 50}', event_type='Workshop',
+                start_date=date(2025, 1, 1) + timedelta(days=i % 300), end_date=date(2025, 1, 2) + timedelta(days=i % 300),
+                status=('Pending', 'Approved', 'Rejected')[i % 3], uploaded_at=uploaded + timedelta(seconds=i),
+                file_path=f'certificates/{i}.pdf'
+            ),
+            f'{i:010d}',
+            'ABC'[i % 3]
+        )
+        for i in range(count)
+    ]
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark certificate listing serialization')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workspace:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workspace, 'bench.db')}"
+        os.environ['UPLOAD_FOLDER'] = os.path.join(workspace, 'uploads')
+        from flask.json.provider import DefaultJSONProvider
+        from app import app, admin_certificate_to_dict
+        from json_provider import orjson
+
+        rows = build_rows(args.rows)
+        cases = [
+            ('strftime+json', legacy_certificate_to_dict, DefaultJSONProvider(app)),
+            ('shared+' + ('orjson' if orjson is not None else 'json'), admin_certificate_to_dict, app.json),
+        ]
+
+        print(f"{'mode':>14} {'build ms':>9} {'encode ms':>10} {'total ms':>9} {'MB':>6}")
+        with app.app_context():
+            for mode, serializer, provider in cases:
+                build, listing = best_of(args.repeat, lambda: [serializer(*row) for row in rows])
+                encode, response = best_of(args.repeat, lambda: provider.response({'certificates': listing}))
+                size = len(response.get_data()) / 1024 / 1024
+                print(f'{mode:>14} {build * 1000:>9.1f} {encode * 1000:>10.1f} {(build + encode) * 1000:>9.1f} {size:>6.1f}')
+
+if __name__ == '__main__':
+    main()
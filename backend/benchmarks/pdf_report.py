@@ -0,0 +1,77 @@
+"""
+Benchmark the chunked PDF report writer against a single reportlab table.
+
+Rows are synthetic certificate report rows; each case runs in its own
+process (see harness.py). The single-table layout grows quadratically, so
+expect it to take minutes at 50k rows.
+
+Usage: python benchmarks/pdf_report.py [--rows 1000 10000 50000] [--modes single chunked]
+"""
+
+import argparse
+import io
+
+from harness import measure, print_header, print_row, run_case
+
+HEADERS = ['ID', 'Student Name', 'Roll Number', 'Email', 'Branch', 'Year', 'Event Type', 'Status', 'Uploaded At']
+COLUMN_WIDTHS = [35, 95, 70, 125, 80, 35, 70, 50, 55]
+
+def report_rows(count):
+    for i in range(1, count + 1):
+        yield [
+            str(i), f'Student {i}', f'{i:010d}', f'student{i}@example.com', 'CSE',
+            ('I', 'II', 'III', 'IV')[i % 4], 'Internship', ('Pending', 'Approved')[i % 2], '2025-01-01'
+        ]
+
+def run_single(count):
+    """The previous layout: one table over every row, watermark redrawn per page"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.platypus import SimpleDocTemplate, Table
+    from exports import PDF_TABLE_STYLE
+
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=landscape(letter))
+    table = Table([HEADERS] + list(report_rows(count)), repeatRows=1)
+    table.setStyle(PDF_TABLE_STYLE)
+
+    def add_watermark(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica-Bold', 60)
+        canvas.setFillColor(colors.orange)
+        canvas.setFillAlpha(0.3)
+        canvas.rotate(45)
+        canvas.drawString(200, 0, "SRIT")
+        canvas.restoreState()
+
+    doc.build([table], onFirstPage=add_watermark, onLaterPages=add_watermark)
+    return output.tell()
+
+def run_chunked(count):
+    from exports import write_pdf_report
+    output = write_pdf_report('Certificate Reports', HEADERS, report_rows(count), col_widths=COLUMN_WIDTHS, watermark='SRIT')
+    size = output.seek(0, io.SEEK_END)
+    output.close()
+    return size
+
+MODES = {'single': run_single, 'chunked': run_chunked}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PDF reports')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--modes', nargs='+', default=['single', 'chunked'])
+    parser.add_argument('--case', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        mode, rows = args.case
+        measure(MODES[mode], int(rows))
+        return
+
+    print_header()
+    for rows in args.rows:
+        for mode in args.modes:
+            print_row(rows, mode, run_case(__file__, mode, rows))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark response compression on the large JSON endpoints.
+
+Builds a throwaway database with one branch of students, a certificate
+each and a form every student answered, then requests each endpoint with
+every supported content coding. Reports the bytes on the wire and the CPU
+time per request; the difference to 'identity' is the compression cost.
+Brotli is only measured when the Brotli package is installed.
+
+Usage: python benchmarks/response_compression.py [--students 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+BRANCH = 'COMPUTER SCIENCE AND ENGINEERING'
+FORM_FIELDS = [
+    {'id': 1, 'label': 'Year of study', 'type': 'radio', 'options': ['I', 'II', 'III', 'IV']},
+    {'id': 2, 'label': 'Interests', 'type': 'checkbox', 'options': ['AI', 'Web', 'Systems']},
+    {'id': 3, 'label': 'Statement', 'type': 'textarea'}
+]
+
+def use_workspace(workspace):
+    """Point the app at the benchmark database; call before importing app"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workspace, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workspace, 'uploads')
+
+def build_workspace(students):
+    from app import app, db, ensure_schema, Admin, Certificate, Form, FormResponse, Student
+
+    with app.app_context():
+        ensure_schema()
+        admin = Admin(name='Bench', employee_id='bench@cse', email='bench@example.com', password='x', branch=BRANCH)
+        db.session.add(admin)
+        db.session.flush()
+        form = Form(
+            title='Benchmark form', admin_id=admin.id, branch=BRANCH,
+            deadline=datetime.utcnow() + timedelta(days=7), form_fields=json.dumps(FORM_FIELDS)
+        )
+        db.session.add(form)
+        db.session.flush()
+        for i in range(students):
+            student = Student(
+                name=f'Student {i}', rollnumber=f'{i:010d}', email=f'student{i}@example.com',
+                password='x', branch=BRANCH, year='II', section='A', phone='9000000000', gender='Other'
+            )
+            db.session.add(student)
+            db.session.flush()
+            db.session.add(Certificate(
+                student_id=student.id, certificate_name='Benchmark workshop', name=student.name,
+                email=student.email, branch=BRANCH, year='II', event_type='Workshop',
+                file_path='missing.pdf', status='Pending', uploaded_at=datetime.utcnow()
+            ))
+            db.session.add(FormResponse(form_id=form.id, student_id=student.id, responses=json.dumps({
+                '1': 'II', '2': ['AI', 'Web'], '3': f'I would like to take part because of reason {i}.'
+            })))
+        db.session.commit()
+        return form.id, admin.id
+
+def measure_endpoint(client, url, encoding, repeat):
+    """Return (bytes on the wire, CPU milliseconds per request)"""
+    headers = {'Accept-Encoding': encoding}
+    size = 0
+    start = time.process_time()
+    for _ in range(repeat):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.data[:200]
+        size = len(response.data)
+    return size, (time.process_time() - start) * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark response compression')
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workspace:
+        use_workspace(workspace)
+        form_id, admin_id = build_workspace(args.students)
+        from app import app
+        from compression import brotli
+
+        endpoints = [
+            ('certificates', f'/api/admin/certificates?branch={BRANCH}'),
+            ('students', f'/api/admin/students?branch={BRANCH}'),
+            ('responses', f'/api/admin/forms/{form_id}/responses?admin_id={admin_id}&limit=500'),
+        ]
+        encodings = ['identity', 'gzip'] + (['br'] if brotli is not None else [])
+        client = app.test_client()
+
+        print(f"{'endpoint':>14} {'encoding':>9} {'bytes':>10} {'ratio':>6} {'cpu ms':>8}")
+        for name, url in endpoints:
+            identity_size = None
+            for encoding in encodings:
+                size, cpu_ms = measure_endpoint(client, url, encoding, args.repeat)
+                identity_size = identity_size or size
+                print(f'{name:>14} {encoding:>9} {size:>10} {size / identity_size:>6.2f} {cpu_ms:>8.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+# Cached values are addressed by '<namespace>:<id>' keys (hit/miss metrics are
+# kept per namespace). Entries can be tagged: invalidating a tag replaces its
+# token, and an entry is only returned while every tag still carries the token
+# it was stored under. Backends hold three kinds of keys:
+#   entries:     <key>       -> [tag tokens, value]
+#   tag tokens:  tag:<name>  -> random token
+#   fill locks:  lock:<key>  -> 1, while one caller computes a missing entry
+
+class CacheBackend:
+    """Interface every cache backend implements"""
+
+    shared = False  # Whether every worker process sees the same entries
+
+    def get_many(self, keys):
+        """Return the values stored under keys, None for missing ones"""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def add(self, key, value, ttl=None):
+        """Store value only if key is missing; return whether it was stored"""
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        raise NotImplementedError
+
+    def get(self, key):
+        return self.get_many([key])[0]
+
+class LocalCache(CacheBackend):
+    """Bounded LRU in this process; entries are shared objects, not copies"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [entry[1] if entry else None for entry in (self._live(key, now) for key in keys)]
+
+    def _store(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            if self._live(key, time.monotonic()) is not None:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+class RedisCache(CacheBackend):
+    """Stores JSON-encoded values in Redis (or anything speaking its protocol)"""
+
+    shared = True
+
+    def __init__(self, client, prefix='sat:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, prefix='sat:'):
+        if url.startswith('memory://'):
+            return cls(MemoryRedis(), prefix)
+        import redis  # Only needed when CACHE_BACKEND=redis
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get_many(self, keys):
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [json.loads(value) if value is not None else None for value in values]
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000) if ttl else None, nx=True))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+class MemoryRedis:
+    """In-memory stand-in for the subset of the redis-py client RedisCache uses.
+
+    Lets the Redis code path run without a server (CACHE_REDIS_URL=memory://),
+    e.g. in tests and local development.
+    """
+
+    def __init__(self):
+        self._data = {}  # name -> (expires_at or None, bytes)
+        self._lock = threading.Lock()
+
+    def _get(self, name):
+        entry = self._data.get(name)
+        if entry and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry[1] if entry else None
+
+    def mget(self, names):
+        with self._lock:
+            return [self._get(name) for name in names]
+
+    def set(self, name, value, px=None, nx=False):
+        with self._lock:
+            if nx and self._get(name) is not None:
+                return None
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            self._data[name] = (time.monotonic() + px / 1000 if px else None, value)
+            return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+class Cache:
+    """get/set/delete with TTLs, tags and stampede protection over a backend"""
+
+    def __init__(self, backend, default_ttl=300, lock_seconds=10, poll_seconds=0.05):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.lock_seconds = lock_seconds
+        self.poll_seconds = poll_seconds
+        self._stats = defaultdict(lambda: {'hits': 0, 'misses': 0, 'waits': 0})
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key, metric):
+        with self._stats_lock:
+            self._stats[key.split(':', 1)[0]][metric] += 1
+
+    def stats(self):
+        """Return {namespace: {'hits', 'misses', 'waits'}} counted by this process"""
+        with self._stats_lock:
+            return {namespace: dict(counts) for namespace, counts in self._stats.items()}
+
+    def tag_tokens(self, tags):
+        """Return the current token of every tag, creating missing ones"""
+        tag_keys = [f'tag:{tag}' for tag in tags]
+        tokens = self.backend.get_many(tag_keys) if tag_keys else []
+        for i, token in enumerate(tokens):
+            if token is None:
+                # Any entry stored under a lost token must not validate again
+                self.backend.add(tag_keys[i], uuid.uuid4().hex)
+                tokens[i] = self.backend.get(tag_keys[i])
+        return tokens
+
+    def _lookup(self, key, tags):
+        entry, *tokens = self.backend.get_many([key] + [f'tag:{tag}' for tag in tags])
+        if entry is None or None in tokens or list(entry[0]) != tokens:
+            return False, None
+        return True, entry[1]
+
+    def get(self, key, default=None, tags=()):
+        found, value = self._lookup(key, tags)
+        self._count(key, 'hits' if found else 'misses')
+        return value if found else default
+
+    def set(self, key, value, ttl=None, tags=(), tokens=None):
+        """Store value; tokens, if given, are tag tokens read before value was computed"""
+        if tokens is None:
+            tokens = self.tag_tokens(tags)
+        self.backend.set(key, [tokens, value], ttl if ttl is not None else self.default_ttl)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def invalidate(self, *tags):
+        """Drop every entry stored with any of tags"""
+        for tag in tags:
+            self.backend.set(f'tag:{tag}', uuid.uuid4().hex)
+
+    def get_or_set(self, key, producer, ttl=None, tags=()):
+        """Return the cached value for key, computing it with producer() on a miss.
+
+        Only one caller (across processes, for shared backends) computes a
+        missing entry at a time; the others wait for it for up to
+        lock_seconds before computing it themselves.
+        """
+        found, value = self._lookup(key, tags)
+        if found:
+            self._count(key, 'hits')
+            return value
+        self._count(key, 'misses')
+
+        lock_key = f'lock:{key}'
+        if not self.backend.add(lock_key, 1, self.lock_seconds):
+            self._count(key, 'waits')
+            deadline = time.monotonic() + self.lock_seconds
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_seconds)
+                found, value = self._lookup(key, tags)
+                if found:
+                    return value
+            return producer()
+
+        try:
+            # Tokens are read first, so an invalidation during producer() makes the entry stale
+            tokens = self.tag_tokens(tags)
+            value = producer()
+            self.set(key, value, ttl, tokens=tokens)
+            return value
+        finally:
+            self.backend.delete(lock_key)
+
+def create_cache(config):
+    backend = config.get('CACHE_BACKEND', 'local')
+    if backend == 'local':
+        store = LocalCache(config['CACHE_LOCAL_SIZE'])
+    elif backend == 'redis':
+        store = RedisCache.from_url(config['CACHE_REDIS_URL'])
+    else:
+        raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+    return Cache(store, config['CACHE_DEFAULT_TTL'], config['CACHE_LOCK_SECONDS'])
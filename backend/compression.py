@@ -0,0 +1,95 @@
+import zlib
+from flask import request
+
+from exports import gzip_chunks
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Already-compressed formats, and streams that must reach the client chunk by chunk
+COMPRESSION_SKIP_MIMETYPES = (
+    'application/pdf',
+    'application/zip',
+    'application/gzip',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/octet-stream',
+    'text/event-stream',
+)
+COMPRESSION_SKIP_PREFIXES = ('image/', 'video/', 'audio/')
+
+def brotli_chunks(chunks, quality):
+    """Compress a byte stream with brotli chunk by chunk"""
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+def choose_encoding(accept_encodings):
+    """Return the best content coding both sides support, or None"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def is_compressible(response):
+    mimetype = response.mimetype or ''
+    return (
+        mimetype not in COMPRESSION_SKIP_MIMETYPES
+        and not mimetype.startswith(COMPRESSION_SKIP_PREFIXES)
+        # send_file responses are files on disk, served as they are
+        and not response.direct_passthrough
+    )
+
+def compress_body(data, encoding, gzip_level, brotli_quality):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return compressor.compress(data) + compressor.flush()
+
+def init_compression(app):
+    """Compress responses with gzip or brotli as negotiated by Accept-Encoding.
+
+    Bodies below COMPRESSION_MIN_SIZE, non-2xx responses, responses that are
+    already encoded (such as tabular exports) and the skip-listed formats go
+    out unchanged. Streamed responses are compressed as they are generated.
+    """
+    min_size = app.config['COMPRESSION_MIN_SIZE']
+    gzip_level = app.config['COMPRESSION_GZIP_LEVEL']
+    brotli_quality = app.config['COMPRESSION_BROTLI_QUALITY']
+
+    @app.after_request
+    def compress_response(response):
+        if (not app.config['COMPRESSION_ENABLED'] or request.method == 'HEAD'
+                or not 200 <= response.status_code < 300 or response.status_code == 204
+                or 'Content-Encoding' in response.headers or not is_compressible(response)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            chunks = response.response
+            if encoding == 'br':
+                response.response = brotli_chunks(chunks, brotli_quality)
+            else:
+                response.response = gzip_chunks(chunks, gzip_level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compress_body(data, encoding, gzip_level, brotli_quality))
+
+        response.headers['Content-Encoding'] = encoding
+        # The representation changed, so a strong validator no longer applies
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
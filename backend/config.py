@@ -36,11 +36,86 @@ class Config:
         MAIL_USE_SSL = False
     
     # Database configuration
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///sat_portal.db'
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///sat_portal.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # Secret key
     SECRET_KEY = 'your-secret-key-here'
     
     # Upload folder
-    UPLOAD_FOLDER = 'uploads' 
\ No newline at end of file
+    UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
+    
+    # File storage backend: 'local' (UPLOAD_FOLDER) or 's3' (any S3-compatible
+    # service such as AWS S3 or MinIO; requires boto3). S3_ENDPOINT_URL=memory://
+    # keeps the bucket in memory instead, for tests and local development
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'local')
+    S3_BUCKET = os.getenv('S3_BUCKET')
+    S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')
+    S3_REGION = os.getenv('S3_REGION')
+    S3_ACCESS_KEY_ID = os.getenv('S3_ACCESS_KEY_ID')
+    S3_SECRET_ACCESS_KEY = os.getenv('S3_SECRET_ACCESS_KEY')
+    STORAGE_PRESIGNED_URL_SECONDS = int(os.getenv('STORAGE_PRESIGNED_URL_SECONDS', 300))
+    
+    # Certificate preview thumbnails
+    PREVIEW_CACHE_SECONDS = int(os.getenv('PREVIEW_CACHE_SECONDS', 7 * 24 * 3600))
+    
+    # Staged form uploads that are not submitted within the TTL are garbage collected
+    FORM_STAGING_TTL_SECONDS = int(os.getenv('FORM_STAGING_TTL_SECONDS', 24 * 3600))
+    FORM_STAGING_GC_INTERVAL_SECONDS = int(os.getenv('FORM_STAGING_GC_INTERVAL_SECONDS', 3600))
+    
+    # Response compression (brotli needs the optional Brotli package)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+    
+    # Rendered GET responses kept per process, keyed by ETag (0 disables)
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 256 * 1024))
+    
+    # Parsed form schemas kept per process
+    FORM_SCHEMA_CACHE_SIZE = int(os.getenv('FORM_SCHEMA_CACHE_SIZE', 256))
+    
+    # Shared cache for student profiles and dashboard statistics. 'local' keeps
+    # it per process; use 'redis' when running more than one worker.
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'local')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_LOCAL_SIZE = int(os.getenv('CACHE_LOCAL_SIZE', 4096))
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 300))
+    CACHE_LOCK_SECONDS = int(os.getenv('CACHE_LOCK_SECONDS', 10))
+    
+    # Lifecycle job closing forms once their deadline passes
+    FORM_LIFECYCLE_INTERVAL_SECONDS = int(os.getenv('FORM_LIFECYCLE_INTERVAL_SECONDS', 60))
+    FORM_LIFECYCLE_BATCH_SIZE = int(os.getenv('FORM_LIFECYCLE_BATCH_SIZE', 100))
+    
+    # Event stream (SSE with a long-polling fallback)
+    EVENT_PUMP_SECONDS = float(os.getenv('EVENT_PUMP_SECONDS', 1))
+    EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', 100))
+    # Open streams and long polls per process. In the web process each holds a
+    # gunicorn thread, so keep this below --threads (see Procfile); the gevent
+    # events process (events_server.py) raises it to thousands
+    EVENT_MAX_SUBSCRIBERS = int(os.getenv('EVENT_MAX_SUBSCRIBERS', 24))
+    # Seconds a client turned away for lack of a slot waits before polling again
+    EVENT_BUSY_RETRY_SECONDS = int(os.getenv('EVENT_BUSY_RETRY_SECONDS', 20))
+    EVENT_BACKLOG_LIMIT = int(os.getenv('EVENT_BACKLOG_LIMIT', 200))
+    EVENT_STREAM_SECONDS = int(os.getenv('EVENT_STREAM_SECONDS', 300))
+    EVENT_HEARTBEAT_SECONDS = int(os.getenv('EVENT_HEARTBEAT_SECONDS', 15))
+    EVENT_RETRY_MS = int(os.getenv('EVENT_RETRY_MS', 3000))
+    EVENT_LONG_POLL_SECONDS = int(os.getenv('EVENT_LONG_POLL_SECONDS', 25))
+    EVENT_RETENTION_SECONDS = int(os.getenv('EVENT_RETENTION_SECONDS', 3600))
+    EVENT_GC_INTERVAL_SECONDS = int(os.getenv('EVENT_GC_INTERVAL_SECONDS', 600))
+    
+    # Comma-separated names of the periodic jobs this process runs (all if empty)
+    PERIODIC_JOBS = os.getenv('PERIODIC_JOBS', '')
+    
+    # Background reaper for deleted forms
+    FORM_REAPER_INTERVAL_SECONDS = int(os.getenv('FORM_REAPER_INTERVAL_SECONDS', 60))
+    FORM_REAPER_BATCH_SIZE = int(os.getenv('FORM_REAPER_BATCH_SIZE', 200))
+    FORM_REAPER_LEASE_SECONDS = int(os.getenv('FORM_REAPER_LEASE_SECONDS', 300))
+    
+    # Background report jobs
+    REPORT_JOB_TTL_SECONDS = int(os.getenv('REPORT_JOB_TTL_SECONDS', 3600))
+    REPORT_JOB_TIMEOUT_SECONDS = int(os.getenv('REPORT_JOB_TIMEOUT_SECONDS', 1800))
+    REPORT_JOB_GC_INTERVAL_SECONDS = int(os.getenv('REPORT_JOB_GC_INTERVAL_SECONDS', 600))
+    # Worker processes for the super admin's per-department reports
+    EXPORT_PROCESSES = int(os.getenv('EXPORT_PROCESSES', os.cpu_count() or 2))
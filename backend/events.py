@@ -0,0 +1,96 @@
+import queue
+import threading
+from collections import defaultdict
+
+# Events are written to the events table in the transaction of the change
+# they describe, then read back by every worker and fanned out to the streams
+# connected to it. Channels scope who receives an event:
+#   students:<branch>   form-created, form-deadline, form-closed
+#   admin:<admin_id>    admin-message, admin-message-read
+#   admins:<branch>     certificate-uploaded, certificate-status
+
+class Subscription:
+    """Queue of events for one connected client"""
+
+    def __init__(self, channels, maxsize):
+        self.channels = frozenset(channels)
+        self.queue = queue.Queue(maxsize)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Return the next event, or None if none arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+class EventHub:
+    """Fans events out to the subscriptions of this process.
+
+    A client that falls so far behind that its queue fills up is marked
+    overflowed; its stream then ends so it reconnects and catches up from
+    the events table instead of holding events in memory.
+
+    Every open stream or long poll holds a worker thread while it waits, so
+    at most max_subscribers are open at once; subscribe() returns None
+    beyond that.
+    """
+
+    def __init__(self, queue_size=100, max_subscribers=None):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.last_id = None  # Id of the last event dispatched
+        self._subscribers = defaultdict(set)  # channel -> {Subscription}
+        self._open = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        """Return a new Subscription, or None if max_subscribers are already open"""
+        subscription = Subscription(channels, self.queue_size)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._open) >= self.max_subscribers:
+                return None
+            self._open.add(subscription)
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._open.discard(subscription)
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._open)
+
+    def dispatch(self, events):
+        """Deliver events (dicts of id, channel, type and JSON data) in id order"""
+        for event in events:
+            with self._lock:
+                subscribers = list(self._subscribers.get(event['channel'], ()))
+            for subscription in subscribers:
+                try:
+                    subscription.queue.put_nowait(event)
+                except queue.Full:
+                    subscription.overflowed = True
+            self.last_id = event['id']
+
+def format_sse(event):
+    """Render an event (its data already JSON text) as a text/event-stream message"""
+    lines = [f"id: {event['id']}", f"event: {event['type']}"]
+    lines.extend(f'data: {line}' for line in event['data'].splitlines() or [''])
+    return '\n'.join(lines) + '\n\n'
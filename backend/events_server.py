@@ -0,0 +1,29 @@
+"""
+Serve the event endpoints (/api/events/*) from their own gevent process.
+
+An open stream is an idle greenlet here rather than a thread, so one process
+holds thousands of them. The CPU-bound parts of the portal (PDF previews,
+report jobs, parallel exports) stay in the threaded web process: this one
+answers nothing but the event endpoints and only runs the event pump.
+
+Usage: gunicorn events_server:app --worker-class gevent --worker-connections 2000
+"""
+
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+
+# Read by Config when app is imported below
+os.environ.setdefault('EVENT_MAX_SUBSCRIBERS', '2000')
+os.environ.setdefault('PERIODIC_JOBS', 'event-pump')
+
+from flask import jsonify, request  # noqa: E402
+
+from app import app  # noqa: E402
+
+@app.before_request
+def only_event_routes():
+    if not request.path.startswith('/api/events/'):
+        return jsonify({'error': 'Not found'}), 404
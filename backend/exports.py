@@ -0,0 +1,315 @@
+import csv
+import io
+import itertools
+import json
+import tempfile
+import time
+import zipfile
+import zlib
+import openpyxl
+from flask import Response, request, stream_with_context
+from openpyxl.utils import get_column_letter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+CHUNK_SIZE = 64 * 1024
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024  # Larger exports spill to a temp file on disk
+WIDTH_SAMPLE_ROWS = 500
+MAX_COLUMN_WIDTH = 50
+
+# Rows per table in PDF reports; a header plus this many rows (18pt each with
+# the default leading) fits on a landscape letter page below the title, so
+# tables never need to be split
+PDF_ROWS_PER_TABLE = 20
+
+PDF_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),  # Smaller header font
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 6),  # Much smaller data font
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),  # Thinner grid
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+])
+
+# Line-oriented formats for the data warehouse, keyed by the ?type= value
+TABULAR_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable file object that collects written bytes until drained.
+
+    zipfile detects that it cannot seek and writes data descriptors instead
+    of patching local headers, which lets an archive be streamed.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _copy_chunks(chunks, dest, sink):
+    """Write chunks to an archive member, yielding the archive bytes as they are produced"""
+    for chunk in chunks:
+        dest.write(chunk)
+        data = sink.drain()
+        if data:
+            yield data
+
+def stream_zip(entries):
+    """Yield a ZIP archive chunk by chunk without buffering whole members.
+
+    entries yields (arcname, source) pairs where source is either a
+    storage.StoredObject, streamed as a stored member, in-memory bytes, or
+    a binary file object positioned at its start; the last two are written
+    deflated.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', allowZip64=True) as archive:
+        for arcname, source in entries:
+            if isinstance(source, bytes):
+                archive.writestr(arcname, source, compress_type=zipfile.ZIP_DEFLATED)
+            elif hasattr(source, 'read'):
+                info = zipfile.ZipInfo(arcname, time.localtime()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                # The size is unknown until the end, so allow it to pass 2 GiB
+                with archive.open(info, 'w', force_zip64=True) as dest:
+                    yield from _copy_chunks(iter(lambda: source.read(CHUNK_SIZE), b''), dest, sink)
+            else:
+                info = zipfile.ZipInfo(arcname, time.localtime(source.modified)[:6])
+                # PDFs are already compressed; storing them keeps this disk-bound
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = source.size
+                with archive.open(info, 'w') as dest:
+                    yield from _copy_chunks(source.chunks(CHUNK_SIZE), dest, sink)
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory is written on close
+    yield sink.drain()
+
+def merge_xlsx(sheets):
+    """Combine single-sheet workbooks into one, with a sheet per (title, path)"""
+    wb = openpyxl.Workbook(write_only=True)
+    for title, path in sheets:
+        source = openpyxl.load_workbook(path, read_only=True)
+        ws = wb.create_sheet(title)
+        for row in source.active.iter_rows(values_only=True):
+            ws.append(row)
+        source.close()
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    wb.save(output)
+    output.seek(0)
+    return output
+
+def write_zip(files):
+    """Bundle (arcname, path) files into a ZIP and return it as a spooled file"""
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for arcname, path in files:
+            archive.write(path, arcname)
+    output.seek(0)
+    return output
+
+def column_widths(headers, rows, max_width=MAX_COLUMN_WIDTH):
+    """Return a width per column fitting the longest value among headers and rows"""
+    widths = [len(str(header)) for header in headers]
+    for row in rows:
+        for col, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if col >= len(widths):
+                widths.append(length)
+            elif length > widths[col]:
+                widths[col] = length
+    return [min(width + 2, max_width) for width in widths]
+
+def write_xlsx(title, headers, rows, autosize=False, sample_rows=WIDTH_SAMPLE_ROWS):
+    """Write rows to a single-sheet workbook and return it as a spooled file.
+
+    The workbook is created in write-only mode, so rows go straight to disk as
+    they are consumed and memory stays flat however many rows there are; pass
+    rows as a generator over a yield_per() query. Write-only sheets cannot be
+    resized after the first row, so with autosize the column widths are
+    computed from a sample of the leading rows instead of the whole sheet.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    rows = iter(rows)
+
+    if autosize:
+        sample = list(itertools.islice(rows, sample_rows))
+        for col, width in enumerate(column_widths(headers, sample), 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        rows = itertools.chain(sample, rows)
+
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    wb.save(output)
+    output.seek(0)
+    return output
+
+def _batched(lines, chunk_size=CHUNK_SIZE):
+    """Join small encoded lines into chunks of roughly chunk_size bytes"""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(item) for item in value)
+    return value
+
+def csv_chunks(columns, records):
+    """Yield CSV bytes for dict records, with a header row from columns.
+
+    columns is a list of (key, header) pairs selecting and naming the fields.
+    """
+    line = io.StringIO()
+    writer = csv.writer(line)
+    header = [header for _, header in columns]
+    rows = ([_csv_value(record.get(key)) for key, _ in columns] for record in records)
+
+    def lines():
+        for row in itertools.chain([header], rows):
+            writer.writerow(row)
+            yield line.getvalue().encode('utf-8')
+            line.seek(0)
+            line.truncate()
+
+    return _batched(lines())
+
+def ndjson_chunks(columns, records):
+    """Yield one JSON object per line for dict records"""
+    keys = [key for key, _ in columns]
+    return _batched(
+        (json.dumps({key: record.get(key) for key in keys}, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        for record in records
+    )
+
+def gzip_chunks(chunks, level=6):
+    """Compress a byte stream into a gzip member chunk by chunk"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def tabular_chunks(export_type, columns, records):
+    """Encode records in one of TABULAR_FORMATS"""
+    if export_type == 'csv':
+        return csv_chunks(columns, records)
+    return ndjson_chunks(columns, records)
+
+def spool_chunks(chunks):
+    """Collect a byte stream into a spooled file, for storing it as an artifact"""
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    for chunk in chunks:
+        output.write(chunk)
+    output.seek(0)
+    return output
+
+def tabular_response(export_type, columns, records, download_name):
+    """Stream records as CSV or NDJSON, gzip-encoded when the client accepts it.
+
+    Nothing is buffered beyond one chunk, so the first bytes go out as soon
+    as the query returns its first rows.
+    """
+    mimetype, extension = TABULAR_FORMATS[export_type]
+    chunks = tabular_chunks(export_type, columns, records)
+    headers = {
+        'Content-Disposition': f'attachment; filename="{download_name}.{extension}"',
+        'Vary': 'Accept-Encoding'
+    }
+    if request.accept_encodings['gzip']:
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+def _watermark_painter(text):
+    """Return a page callback drawing text as a watermark.
+
+    The rotated text is recorded once as a form XObject on the first page and
+    every page after that only references it, instead of redrawing the glyphs.
+    """
+    form_name = 'watermark'
+    defined = []
+
+    def paint(canvas, doc):
+        if not defined:
+            canvas.beginForm(form_name)
+            canvas.saveState()
+            canvas.setFont('Helvetica-Bold', 60)
+            canvas.setFillColor(colors.orange)
+            canvas.setFillAlpha(0.3)
+            canvas.rotate(45)
+            canvas.drawString(200, 0, text)
+            canvas.restoreState()
+            canvas.endForm()
+            defined.append(form_name)
+        canvas.doForm(form_name)
+
+    return paint
+
+def write_pdf_report(title, headers, rows, col_widths=None, watermark=None, rows_per_table=PDF_ROWS_PER_TABLE):
+    """Lay rows out as a landscape PDF table and return it as a spooled file.
+
+    Instead of one table over every row, which reportlab splits across pages
+    in quadratic time, rows are emitted as page-sized tables that each repeat
+    the header. Pass col_widths so the columns line up from page to page.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    doc = SimpleDocTemplate(output, pagesize=landscape(letter))
+
+    title_style = getSampleStyleSheet()['Title']
+    title_style.fontSize = 14
+    elements = [Paragraph(title, title_style)]
+
+    rows = iter(rows)
+    chunk = list(itertools.islice(rows, rows_per_table))
+    while True:
+        table = Table([headers] + chunk, colWidths=col_widths, repeatRows=1)
+        table.setStyle(PDF_TABLE_STYLE)
+        elements.append(table)
+        chunk = list(itertools.islice(rows, rows_per_table))
+        if not chunk:
+            break
+        elements.append(PageBreak())
+
+    on_page = _watermark_painter(watermark) if watermark else (lambda canvas, doc: None)
+    doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
+    output.seek(0)
+    return output
@@ -0,0 +1,109 @@
+import json
+import os
+import re
+from datetime import date
+
+FIELD_TYPES = ('text', 'textarea', 'email', 'number', 'date', 'file', 'radio', 'checkbox', 'select')
+CHOICE_FIELD_TYPES = ('radio', 'checkbox', 'select')
+TEXT_MAX_LENGTH = 10000
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+class FormSchemaError(ValueError):
+    """A form definition or a submitted response that does not fit the expected shape"""
+
+def parse_form_schema(form_fields):
+    """Parse and check a Form.form_fields JSON string, returning a tuple of field dicts.
+
+    The result may be shared through a cache, so callers must not modify it.
+    """
+    try:
+        fields = json.loads(form_fields) if form_fields else []
+    except ValueError as e:
+        raise FormSchemaError(f'Form fields are not valid JSON: {e}')
+    if not isinstance(fields, list):
+        raise FormSchemaError('Form fields must be a list')
+
+    seen = set()
+    for field in fields:
+        if not isinstance(field, dict) or field.get('id') in (None, ''):
+            raise FormSchemaError('Every form field needs an id')
+        if str(field['id']) in seen:
+            raise FormSchemaError(f"Duplicate form field id: {field['id']}")
+        seen.add(str(field['id']))
+        if not str(field.get('label') or '').strip():
+            raise FormSchemaError('Every form field needs a label')
+        if field.get('type') not in FIELD_TYPES:
+            raise FormSchemaError(f"Unknown type for field {field['label']}: {field.get('type')}")
+        if field['type'] in CHOICE_FIELD_TYPES and not isinstance(field.get('options'), list):
+            raise FormSchemaError(f"Options are required for field {field['label']}")
+    return tuple(fields)
+
+def _is_empty(value):
+    return value is None or value == '' or value == []
+
+def _field_error(field, value):
+    """Return why value does not fit field, or None if it does"""
+    field_type = field['type']
+    if field_type in ('text', 'textarea'):
+        if not isinstance(value, str):
+            return 'must be text'
+        if len(value) > TEXT_MAX_LENGTH:
+            return f'must be at most {TEXT_MAX_LENGTH} characters'
+    elif field_type == 'email':
+        if not isinstance(value, str) or not EMAIL_PATTERN.match(value):
+            return 'must be a valid email address'
+    elif field_type == 'number':
+        try:
+            if isinstance(value, bool):
+                raise ValueError
+            float(value)
+        except (TypeError, ValueError):
+            return 'must be a number'
+    elif field_type == 'date':
+        try:
+            date.fromisoformat(str(value))
+        except ValueError:
+            return 'must be a date (YYYY-MM-DD)'
+    elif field_type in ('radio', 'select'):
+        if value not in field['options']:
+            return 'must be one of the listed options'
+    elif field_type == 'checkbox':
+        if not isinstance(value, list) or any(item not in field['options'] for item in value):
+            return 'must only contain listed options'
+        if len(set(value)) != len(value):
+            return 'must not repeat an option'
+    elif field_type == 'file':
+        filenames = value if isinstance(value, list) else [value]
+        if not all(isinstance(name, str) and name and name == os.path.basename(name) for name in filenames):
+            return 'must be an uploaded file'
+    return None
+
+def validate_form_response(fields, responses):
+    """Check a submitted {field_id: value} mapping against parsed form fields.
+
+    Raises FormSchemaError describing every problem found.
+    """
+    if not isinstance(responses, dict):
+        raise FormSchemaError('Responses must be an object keyed by field id')
+
+    known = {str(field['id']) for field in fields}
+    unknown = [key for key in responses if str(key) not in known]
+    if unknown:
+        raise FormSchemaError(f"Unknown form fields: {', '.join(map(str, unknown))}")
+
+    missing = []
+    problems = []
+    for field in fields:
+        value = responses.get(str(field['id']))
+        if _is_empty(value):
+            if field.get('required'):
+                missing.append(field['label'])
+            continue
+        error = _field_error(field, value)
+        if error:
+            problems.append(f"{field['label']} {error}")
+
+    if missing:
+        problems.insert(0, f"Please fill in all required fields: {', '.join(missing)}")
+    if problems:
+        raise FormSchemaError('; '.join(problems))
@@ -0,0 +1,42 @@
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+    """Bounded per-process LRU of rendered response bodies keyed by ETag.
+
+    An ETag already names the exact data a body was rendered from, so
+    entries never need invalidating; stale ones simply stop being requested
+    and age out.
+    """
+
+    def __init__(self, maxsize, max_body_bytes):
+        self.maxsize = maxsize
+        self.max_body_bytes = max_body_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # etag -> (body, mimetype)
+        self._lock = threading.Lock()
+
+    def get(self, etag):
+        """Return (body, mimetype) for etag, or None"""
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return entry
+
+    def put(self, etag, body, mimetype):
+        if self.maxsize <= 0 or len(body) > self.max_body_bytes:
+            return
+        with self._lock:
+            self._entries[etag] = (body, mimetype)
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,11 +1,11 @@
-from app import app, db, Admin, Student, Certificate, OTP
+from app import app, db, Admin, Student, Certificate, OTP, ensure_schema
 from app import hash_password
 from datetime import datetime
 
 def init_database():
     with app.app_context():
-        # Create all tables
-        db.create_all()
+        # Create all tables (and add any columns missing from older databases)
+        ensure_schema()
         
         # Admin credentials
         admin_credentials = [
@@ -0,0 +1,101 @@
+"""
+Move existing uploads into the sharded key layout.
+
+Safe to run while the portal is serving traffic: read paths resolve both the
+legacy and the sharded key, files are moved through the storage backend and
+Certificate.file_path is updated in small committed batches. The script is
+idempotent, so it can be interrupted and re-run.
+
+Usage: python migrate_uploads.py [--batch-size 200] [--pause 0.5] [--dry-run]
+"""
+
+import argparse
+import re
+import time
+
+from app import app, db, Certificate
+from previews import preview_key_for
+from storage import (
+    certificate_key, form_response_prefix, get_storage, is_sharded_certificate_key,
+    normalize_certificate_key
+)
+
+# forms/<form_id>/<response_id>/<filename>: response files from before sharding
+LEGACY_FORM_FILE = re.compile(r'^forms/(\d+)/(\d+)/(.+)$')
+
+def migrate_certificates(storage, batch_size, pause, dry_run):
+    moved = missing = 0
+    last_id = 0
+    while True:
+        batch = (
+            Certificate.query
+            .filter(Certificate.id > last_id)
+            .order_by(Certificate.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        for cert in batch:
+            if not cert.file_path:
+                continue
+            old_key = normalize_certificate_key(cert.file_path)
+            if is_sharded_certificate_key(old_key):
+                if cert.file_path != old_key and not dry_run:
+                    cert.file_path = old_key
+                continue
+            new_key = certificate_key(old_key.rsplit('/', 1)[-1])
+            if storage.exists(old_key):
+                if not dry_run:
+                    storage.move(old_key, new_key)
+                    if storage.exists(preview_key_for(old_key)):
+                        storage.move(preview_key_for(old_key), preview_key_for(new_key))
+            elif not storage.exists(new_key):
+                # Nothing to move; leave the row alone so it stays visible as missing
+                missing += 1
+                continue
+            # A previous interrupted run may already have moved the file
+            if not dry_run:
+                cert.file_path = new_key
+            moved += 1
+
+        if not dry_run:
+            db.session.commit()
+        print(f"Certificates up to id {last_id}: {moved} moved, {missing} missing")
+        time.sleep(pause)
+    return moved
+
+def migrate_form_responses(storage, pause, dry_run):
+    moved = 0
+    # The listing is consumed lazily, a page at a time. Files moved meanwhile
+    # land under forms/<form_id>/responses/, which the pattern never matches.
+    for obj in storage.list_prefix('forms/'):
+        match = LEGACY_FORM_FILE.match(obj.key)
+        if not match:
+            continue
+        form_id, response_id, filename = match.groups()
+        if not dry_run:
+            storage.move(obj.key, form_response_prefix(form_id, response_id) + filename)
+        moved += 1
+        if moved % 200 == 0:
+            print(f"{moved} form response files moved so far")
+            time.sleep(pause)
+    return moved
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate uploads to the sharded layout')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--pause', type=float, default=0.5, help='seconds to sleep between batches')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    with app.app_context():
+        storage = get_storage()
+        certificates = migrate_certificates(storage, args.batch_size, args.pause, args.dry_run)
+        responses = migrate_form_responses(storage, args.pause, args.dry_run)
+    print(f"Done: {certificates} certificates and {responses} form response files migrated")
+
+if __name__ == '__main__':
+    main()
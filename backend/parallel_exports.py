@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_process_pool(max_workers):
+    """Return the shared export process pool, creating it on first use.
+
+    Workers are spawned rather than forked: the parent has live threads and
+    pooled database connections that must not be copied into a child.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+def _discard_process_pool(pool):
+    """Drop a pool whose worker died so the next export starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _build_branch_report(branch, report_type, filters, base_url, out_dir, index):
+    # Runs in a worker process; importing app there gives the worker its own
+    # app, engine and connection pool
+    from app import app, build_certificate_report, certificate_report_query
+    with app.app_context():
+        query = certificate_report_query(dict(filters, branch=branch))
+        output, _, download_name = build_certificate_report(query, report_type, base_url)
+        path = os.path.join(out_dir, f'{index}_{download_name}')
+        with output, open(path, 'wb') as dest:
+            shutil.copyfileobj(output, dest)
+    return path
+
+def build_branch_reports(branches, report_type, filters, base_url, out_dir, max_workers, on_progress=None):
+    """Build one certificate report per branch in parallel worker processes.
+
+    Returns {branch: path of the report file in out_dir}. on_progress, if
+    given, is called with the number of branches finished so far.
+    """
+    pool = get_process_pool(max_workers)
+    futures = {
+        pool.submit(_build_branch_report, branch, report_type, filters, base_url, out_dir, index): branch
+        for index, branch in enumerate(branches)
+    }
+    paths = {}
+    try:
+        for future in as_completed(futures):
+            paths[futures[future]] = future.result()
+            if on_progress:
+                on_progress(len(paths))
+    except BrokenProcessPool:
+        _discard_process_pool(pool)
+        raise
+    return paths
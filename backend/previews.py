@@ -0,0 +1,51 @@
+import io
+from PIL import Image
+from storage import get_storage
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+PREVIEW_SUFFIX = '.preview.webp'
+PREVIEW_WIDTH = 320
+PREVIEW_QUALITY = 70
+
+def preview_key_for(key):
+    """Return the key of the thumbnail stored next to a certificate PDF"""
+    root = key.rsplit('.', 1)[0] if '.' in key.rsplit('/', 1)[-1] else key
+    return root + PREVIEW_SUFFIX
+
+def previews_supported():
+    return fitz is not None
+
+def render_preview(key, width=PREVIEW_WIDTH):
+    """Render the first page of a stored PDF to a WebP thumbnail next to it.
+
+    Returns the preview key, or None if the PDF cannot be rendered.
+    """
+    storage = get_storage()
+    if fitz is None or not key or not storage.exists(key):
+        return None
+
+    with fitz.open(stream=storage.read(key), filetype='pdf') as doc:
+        if doc.page_count == 0:
+            return None
+        page = doc.load_page(0)
+        zoom = width / page.rect.width
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        image = Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+
+    output = io.BytesIO()
+    image.save(output, 'WEBP', quality=PREVIEW_QUALITY)
+    output.seek(0)
+    preview_key = preview_key_for(key)
+    storage.put(preview_key, output, content_type='image/webp')
+    return preview_key
+
+def ensure_preview(key):
+    """Return an existing preview key, rendering it first if missing"""
+    preview_key = preview_key_for(key)
+    if get_storage().exists(preview_key):
+        return preview_key
+    return render_preview(key)
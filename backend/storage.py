@@ -0,0 +1,505 @@
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+from flask import Response, current_app, redirect, send_file
+
+CHUNK_SIZE = 64 * 1024
+
+# Files are addressed by storage keys: '/'-separated paths relative to the
+# storage root (the upload folder locally, the bucket on S3). Keys are spread
+# over hashed prefixes so no single directory grows with the number of files:
+#   certificates:   <ab>/<cd>/<filename>
+#   form responses: forms/<form_id>/responses/<ab>/<response_id>/<filename>
+#   staged uploads: forms/<form_id>/staging/<student_id>/<upload_session>/<filename>
+
+class StoredObject:
+    """Metadata about a stored file, able to stream its content"""
+
+    def __init__(self, backend, key, size, modified, body=None):
+        self.backend = backend
+        self.key = key
+        self.size = size
+        self.modified = modified  # POSIX timestamp
+        self._body = body  # Content already opened by StorageBackend.fetch()
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        if self._body is not None:
+            body, self._body = self._body, None
+            return body
+        return self.backend.iter_chunks(self.key, chunk_size)
+
+class StorageBackend:
+    """Interface every storage backend implements"""
+
+    def put(self, key, fileobj, content_type=None):
+        raise NotImplementedError
+
+    def iter_chunks(self, key, chunk_size=CHUNK_SIZE):
+        raise NotImplementedError
+
+    def stat(self, key):
+        """Return a StoredObject for key, or None if it does not exist"""
+        raise NotImplementedError
+
+    def fetch(self, key, chunk_size=CHUNK_SIZE):
+        """Return a StoredObject for key with its content opened in the same request.
+
+        Raises FileNotFoundError if key does not exist.
+        """
+        obj = self.stat(key)
+        if obj is None:
+            raise FileNotFoundError(key)
+        return obj
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def list_prefix(self, prefix):
+        """Yield a StoredObject for every key starting with prefix"""
+        raise NotImplementedError
+
+    def move(self, src_key, dst_key):
+        raise NotImplementedError
+
+    def presigned_url(self, key, expires_in, download_name=None, mimetype=None):
+        """Return a time-limited direct download URL, or None if unsupported"""
+        return None
+
+    def local_path(self, key):
+        """Return a filesystem path for key, or None if not stored locally"""
+        return None
+
+    def exists(self, key):
+        return self.stat(key) is not None
+
+    def read(self, key):
+        return b''.join(self.iter_chunks(key))
+
+    def has_prefix(self, prefix):
+        return next(iter(self.list_prefix(prefix)), None) is not None
+
+    def delete_prefix(self, prefix):
+        for obj in list(self.list_prefix(prefix)):
+            self.delete(obj.key)
+
+class LocalStorage(StorageBackend):
+    """Stores files under a directory on the local filesystem"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def local_path(self, key):
+        parts = key.split('/')
+        if any(part in ('', '.', '..') for part in parts):
+            raise ValueError(f'Invalid storage key: {key}')
+        return os.path.join(self.root, *parts)
+
+    def put(self, key, fileobj, content_type=None):
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp name first so readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as dest:
+            shutil.copyfileobj(fileobj, dest, CHUNK_SIZE)
+        os.replace(tmp_path, path)
+
+    def iter_chunks(self, key, chunk_size=CHUNK_SIZE):
+        yield from _read_chunks(open(self.local_path(key), 'rb'), chunk_size)
+
+    def fetch(self, key, chunk_size=CHUNK_SIZE):
+        src = open(self.local_path(key), 'rb')
+        st = os.fstat(src.fileno())
+        return StoredObject(self, key, st.st_size, st.st_mtime, _read_chunks(src, chunk_size))
+
+    def stat(self, key):
+        path = self.local_path(key)
+        if not os.path.isfile(path):
+            return None
+        st = os.stat(path)
+        return StoredObject(self, key, st.st_size, st.st_mtime)
+
+    def delete(self, key):
+        path = self.local_path(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        self._prune(os.path.dirname(path))
+
+    def list_prefix(self, prefix):
+        # Only walk the deepest directory the prefix fully names
+        base_dir = prefix.rsplit('/', 1)[0] if '/' in prefix else ''
+        start = self.local_path(base_dir) if base_dir else self.root
+        for dirpath, _, filenames in os.walk(start):
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            for filename in filenames:
+                key = filename if rel_dir == '.' else f"{rel_dir}/{filename}"
+                if key.startswith(prefix) and not key.endswith('.tmp'):
+                    obj = self.stat(key)
+                    if obj:
+                        yield obj
+
+    def delete_prefix(self, prefix):
+        if prefix.endswith('/'):
+            path = self.local_path(prefix.rstrip('/'))
+            shutil.rmtree(path, ignore_errors=True)
+            self._prune(os.path.dirname(path))
+        else:
+            super().delete_prefix(prefix)
+
+    def move(self, src_key, dst_key):
+        src_path = self.local_path(src_key)
+        dst_path = self.local_path(dst_key)
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        os.replace(src_path, dst_path)
+        self._prune(os.path.dirname(src_path))
+
+    def _prune(self, directory):
+        """Remove directories left empty, stopping at the storage root"""
+        root = os.path.abspath(self.root)
+        directory = os.path.abspath(directory)
+        while directory != root and directory.startswith(root):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break  # Not empty (or already gone)
+            directory = os.path.dirname(directory)
+
+def _read_chunks(src, chunk_size):
+    with src:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def _body_chunks(body, chunk_size):
+    try:
+        for chunk in body.iter_chunks(chunk_size):
+            yield chunk
+    finally:
+        body.close()
+
+MISSING_OBJECT_CODES = ('404', 'NoSuchKey', 'NotFound')
+
+class S3Storage(StorageBackend):
+    """Stores files in an S3-compatible bucket (AWS S3, MinIO, ...)"""
+
+    def __init__(self, bucket, client):
+        self.bucket = bucket
+        self.client = client
+
+    @classmethod
+    def connect(cls, bucket, endpoint_url=None, region=None, access_key_id=None, secret_access_key=None):
+        if endpoint_url == 'memory://':
+            return cls(bucket, MemoryS3())
+        import boto3  # Only needed when STORAGE_BACKEND=s3
+        return cls(bucket, boto3.client(
+            's3',
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key
+        ))
+
+    def _is_missing(self, error):
+        return error.response.get('Error', {}).get('Code') in MISSING_OBJECT_CODES
+
+    def put(self, key, fileobj, content_type=None):
+        extra_args = {'ContentType': content_type} if content_type else None
+        self.client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs=extra_args)
+
+    def iter_chunks(self, key, chunk_size=CHUNK_SIZE):
+        yield from _body_chunks(self.client.get_object(Bucket=self.bucket, Key=key)['Body'], chunk_size)
+
+    def stat(self, key):
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            if self._is_missing(e):
+                return None
+            raise
+        return StoredObject(self, key, head['ContentLength'], head['LastModified'].timestamp())
+
+    def fetch(self, key, chunk_size=CHUNK_SIZE):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(key) from e
+            raise
+        return StoredObject(
+            self, key, response['ContentLength'], response['LastModified'].timestamp(),
+            _body_chunks(response['Body'], chunk_size)
+        )
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_prefix(self, prefix):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get('Contents', []):
+                yield StoredObject(self, item['Key'], item['Size'], item['LastModified'].timestamp())
+
+    def delete_prefix(self, prefix):
+        batch = []
+        for obj in self.list_prefix(prefix):
+            batch.append({'Key': obj.key})
+            if len(batch) == 1000:  # DeleteObjects limit
+                self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': batch})
+                batch = []
+        if batch:
+            self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': batch})
+
+    def move(self, src_key, dst_key):
+        self.client.copy_object(
+            Bucket=self.bucket, Key=dst_key,
+            CopySource={'Bucket': self.bucket, 'Key': src_key}
+        )
+        self.client.delete_object(Bucket=self.bucket, Key=src_key)
+
+    def presigned_url(self, key, expires_in, download_name=None, mimetype=None):
+        params = {'Bucket': self.bucket, 'Key': key}
+        if download_name:
+            params['ResponseContentDisposition'] = f'attachment; filename="{download_name}"'
+        if mimetype:
+            params['ResponseContentType'] = mimetype
+        return self.client.generate_presigned_url('get_object', Params=params, ExpiresIn=expires_in)
+
+class MemoryS3ClientError(Exception):
+    """Shaped like botocore's ClientError: the error code is in response['Error']['Code']"""
+
+    def __init__(self, code, operation):
+        super().__init__(f'An error occurred ({code}) when calling the {operation} operation')
+        self.response = {'Error': {'Code': code}}
+
+class MemoryS3Body:
+    def __init__(self, data):
+        self._data = data
+        self.closed = False
+
+    def iter_chunks(self, chunk_size):
+        for start in range(0, len(self._data), chunk_size):
+            yield self._data[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+class MemoryS3Paginator:
+    def __init__(self, client):
+        self._client = client
+
+    def paginate(self, Bucket, Prefix=''):
+        # Like S3, each page continues after the last key of the previous one,
+        # so objects written or deleted during the listing show up accordingly
+        start_after = ''
+        while True:
+            page = self._client.list_page(Bucket, Prefix, start_after)
+            yield {'Contents': page, 'KeyCount': len(page)}
+            if len(page) < self._client.page_size:
+                break
+            start_after = page[-1]['Key']
+
+class MemoryS3:
+    """In-memory stand-in for the subset of the boto3 S3 client S3Storage uses.
+
+    Behaves like a MinIO or S3 bucket for S3Storage (missing keys raise the
+    same error codes, listings are paged) so the S3 code path runs without a
+    server (S3_ENDPOINT_URL=memory://), e.g. in tests and local development.
+    It has no presigned URLs, so downloads stream through the app.
+    """
+
+    exceptions = type('exceptions', (), {'ClientError': MemoryS3ClientError})
+
+    def __init__(self, page_size=1000):
+        self.page_size = page_size  # Keys per list_objects_v2 page, 1000 on S3
+        self._objects = {}  # (bucket, key) -> (bytes, LastModified)
+        self._lock = threading.Lock()
+
+    def list_page(self, bucket, prefix, start_after):
+        with self._lock:
+            keys = sorted(
+                key for name, key in self._objects
+                if name == bucket and key.startswith(prefix) and key > start_after
+            )[:self.page_size]
+            return [
+                {'Key': key, 'Size': len(self._objects[(bucket, key)][0]), 'LastModified': self._objects[(bucket, key)][1]}
+                for key in keys
+            ]
+
+    def lookup(self, bucket, key):
+        with self._lock:
+            return self._objects.get((bucket, key))
+
+    def _require(self, bucket, key, code, operation):
+        item = self.lookup(bucket, key)
+        if item is None:
+            raise MemoryS3ClientError(code, operation)
+        return item
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        data = fileobj.read()
+        with self._lock:
+            self._objects[(bucket, key)] = (data, datetime.now(timezone.utc))
+
+    def get_object(self, Bucket, Key):
+        data, modified = self._require(Bucket, Key, 'NoSuchKey', 'GetObject')
+        return {'Body': MemoryS3Body(data), 'ContentLength': len(data), 'LastModified': modified}
+
+    def head_object(self, Bucket, Key):
+        data, modified = self._require(Bucket, Key, '404', 'HeadObject')
+        return {'ContentLength': len(data), 'LastModified': modified}
+
+    def delete_object(self, Bucket, Key):
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket, Delete):
+        with self._lock:
+            for item in Delete['Objects']:
+                self._objects.pop((Bucket, item['Key']), None)
+        return {'Deleted': Delete['Objects']}
+
+    def copy_object(self, Bucket, Key, CopySource):
+        data, _ = self._require(CopySource['Bucket'], CopySource['Key'], 'NoSuchKey', 'CopyObject')
+        with self._lock:
+            self._objects[(Bucket, Key)] = (data, datetime.now(timezone.utc))
+        return {}
+
+    def get_paginator(self, operation_name):
+        if operation_name != 'list_objects_v2':
+            raise NotImplementedError(operation_name)
+        return MemoryS3Paginator(self)
+
+    def generate_presigned_url(self, ClientMethod, Params=None, ExpiresIn=3600):
+        return None
+
+def create_storage(config):
+    backend = config.get('STORAGE_BACKEND', 'local')
+    if backend == 'local':
+        return LocalStorage(config['UPLOAD_FOLDER'])
+    if backend == 's3':
+        return S3Storage.connect(
+            config['S3_BUCKET'],
+            endpoint_url=config.get('S3_ENDPOINT_URL'),
+            region=config.get('S3_REGION'),
+            access_key_id=config.get('S3_ACCESS_KEY_ID'),
+            secret_access_key=config.get('S3_SECRET_ACCESS_KEY')
+        )
+    raise ValueError(f'Unknown STORAGE_BACKEND: {backend}')
+
+def get_storage():
+    """Return the storage backend configured for the current app"""
+    storage = current_app.extensions.get('storage')
+    if storage is None:
+        storage = current_app.extensions['storage'] = create_storage(current_app.config)
+    return storage
+
+def send_stored_file(key, mimetype=None, as_attachment=False, download_name=None, max_age=None):
+    """Respond with a stored file: redirect to a presigned URL when the backend
+    has one, serve local files directly, otherwise stream through the app"""
+    storage = get_storage()
+    if as_attachment and not download_name:
+        download_name = key.rsplit('/', 1)[-1]
+    url = storage.presigned_url(
+        key,
+        current_app.config['STORAGE_PRESIGNED_URL_SECONDS'],
+        download_name=download_name if as_attachment else None,
+        mimetype=mimetype
+    )
+    if url:
+        return redirect(url)
+    path = storage.local_path(key)
+    if path:
+        return send_file(
+            path,
+            mimetype=mimetype,
+            as_attachment=as_attachment,
+            download_name=download_name,
+            max_age=max_age,
+            conditional=True
+        )
+    headers = {'Content-Disposition': f'attachment; filename="{download_name}"'} if as_attachment else {}
+    return Response(storage.iter_chunks(key), mimetype=mimetype, headers=headers)
+
+# Key layout
+
+def shard_prefix(name, levels=2):
+    """Return the hashed prefix for name, e.g. 'ab/cd'"""
+    digest = hashlib.sha1(str(name).encode('utf-8')).hexdigest()
+    return '/'.join(digest[i * 2:i * 2 + 2] for i in range(levels))
+
+def certificate_key(filename):
+    """Sharded key for a newly uploaded certificate PDF"""
+    return f"{shard_prefix(filename)}/{filename}"
+
+def normalize_certificate_key(file_path):
+    """Turn a stored Certificate.file_path into a storage key.
+
+    Older rows hold filesystem paths such as 'uploads/<name>.pdf' or
+    'uploads/ab/cd/<name>.pdf'; newer rows hold the key itself.
+    """
+    key = file_path.replace('\\', '/')
+    root = current_app.config['UPLOAD_FOLDER'].replace('\\', '/').rstrip('/') + '/'
+    if key.startswith(root):
+        key = key[len(root):]
+    return key
+
+def is_sharded_certificate_key(key):
+    return key == certificate_key(key.rsplit('/', 1)[-1])
+
+def resolve_certificate_key(file_path):
+    """Return the key a certificate PDF currently lives under.
+
+    While uploads are being migrated the stored path may still point at the
+    flat legacy location after the file moved, so the sharded key is checked
+    as well. Returns None if the file exists under neither.
+    """
+    if not file_path:
+        return None
+    storage = get_storage()
+    key = normalize_certificate_key(file_path)
+    if storage.exists(key):
+        return key
+    sharded = certificate_key(key.rsplit('/', 1)[-1])
+    if sharded != key and storage.exists(sharded):
+        return sharded
+    return None
+
+def form_prefix(form_id):
+    return f"forms/{int(form_id)}/"
+
+def form_response_prefix(form_id, response_id):
+    """Sharded prefix holding the uploaded files of one form response"""
+    return f"{form_prefix(form_id)}responses/{shard_prefix(response_id, levels=1)}/{int(response_id)}/"
+
+def legacy_form_response_prefix(form_id, response_id):
+    return f"{form_prefix(form_id)}{int(response_id)}/"
+
+def resolve_form_response_prefix(form_id, response_id):
+    """Return the prefix a response's files live under, sharded or legacy"""
+    sharded = form_response_prefix(form_id, response_id)
+    storage = get_storage()
+    if storage.has_prefix(sharded):
+        return sharded
+    legacy = legacy_form_response_prefix(form_id, response_id)
+    if storage.has_prefix(legacy):
+        return legacy
+    return sharded
+
+# Staging area of clients that send no upload session; too short to be a
+# valid session name, so no client can name it explicitly
+DEFAULT_UPLOAD_SESSION = 'default'
+
+def form_staging_prefix(form_id, student_id, upload_session=None):
+    """Prefix holding a student's not-yet-submitted uploads for a form"""
+    return f"{form_prefix(form_id)}staging/{int(student_id)}/{upload_session or DEFAULT_UPLOAD_SESSION}/"
+
+def legacy_form_staging_prefix(form_id):
+    """Area shared by every student that uploads without a session used to go to"""
+    return f"{form_prefix(form_id)}temp/"
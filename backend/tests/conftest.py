@@ -0,0 +1,130 @@
+"""
+Fixtures shared by the tests: the app on a throwaway SQLite database and
+upload folder, with periodic jobs and outgoing mail switched off, and the
+per-process caches emptied between tests.
+
+Usage: cd backend && python -m pytest tests
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+WORKSPACE = tempfile.mkdtemp(prefix='sat-tests-')
+UPLOAD_FOLDER = os.path.join(WORKSPACE, 'uploads')
+
+# Read by Config when the app is imported
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKSPACE, 'test.db')}"
+os.environ['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+os.environ['PERIODIC_JOBS'] = 'none'  # Tests run the jobs they need themselves
+
+import app as portal  # noqa: E402
+from cache import Cache, LocalCache, create_cache  # noqa: E402
+from events import EventHub  # noqa: E402
+
+portal.app.config['TESTING'] = True
+portal.app.extensions['mail'].suppress = True
+
+BRANCH = 'COMPUTER SCIENCE AND ENGINEERING'
+
+# A minimal valid PDF, enough for uploads and previews
+PDF_BYTES = (
+    b'%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n'
+    b'2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n'
+    b'3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]>>endobj\n'
+    b'trailer<</Root 1 0 R>>\n%%EOF\n'
+)
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(WORKSPACE, ignore_errors=True)
+
+def run_now(app, func, *args, **kwargs):
+    """submit_task stand-in that runs the task before returning its future"""
+    future = Future()
+    with app.app_context():
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+    return future
+
+@pytest.fixture
+def app(monkeypatch):
+    config = portal.app.config
+    monkeypatch.setattr(portal, 'submit_task', run_now)
+    shutil.rmtree(UPLOAD_FOLDER, ignore_errors=True)
+    os.makedirs(UPLOAD_FOLDER)
+    portal.cache = create_cache(config)
+    portal.schema_cache = Cache(LocalCache(config['FORM_SCHEMA_CACHE_SIZE']), default_ttl=None)
+    portal.response_cache.clear()
+    portal.roster_sizes.clear()
+    portal.event_hub = EventHub(config['EVENT_QUEUE_SIZE'], config['EVENT_MAX_SUBSCRIBERS'])
+    with portal.app.app_context():
+        portal.db.drop_all()
+        portal.ensure_schema()
+        yield portal.app
+        portal.db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def department(app):
+    """An admin and three students of one branch"""
+    admin = portal.Admin(
+        name='CSE Admin', employee_id='admin@test', email='admin@example.com',
+        password=portal.hash_password('secret'), branch=BRANCH
+    )
+    students = [
+        portal.Student(
+            name=f'Student {i}', rollnumber=f'24TEST{i:04d}', email=f'student{i}@example.com',
+            password='x', branch=BRANCH, year='II', section='A'
+        )
+        for i in range(3)
+    ]
+    portal.db.session.add_all([admin, *students])
+    portal.db.session.commit()
+    return SimpleNamespace(admin_id=admin.id, student_ids=[student.id for student in students], branch=BRANCH)
+
+CHOICE_FIELDS = [
+    {'id': 1, 'label': 'Track', 'type': 'radio', 'options': ['Web', 'ML']},
+    {'id': 2, 'label': 'Tools', 'type': 'checkbox', 'options': ['git', 'docker', 'k8s']},
+    {'id': 3, 'label': 'Comments', 'type': 'text'},
+]
+
+@pytest.fixture
+def make_form(client, department):
+    """Create a form through the API and return its id"""
+    def make(fields=CHOICE_FIELDS, title='Survey'):
+        response = client.post('/api/admin/forms', json={
+            'admin_id': department.admin_id,
+            'title': title,
+            'deadline': (datetime.utcnow() + timedelta(days=2)).isoformat(),
+            'form_fields': fields
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['form_id']
+    return make
+
+def submit(client, form_id, student_id, responses, **extra):
+    return client.post(f'/api/student/forms/{form_id}/submit', json={
+        'student_id': student_id, 'responses': responses, **extra
+    })
+
+def upload_form_file(client, form_id, student_id, field_id, upload_session=None, name='doc.pdf'):
+    data = {'student_id': str(student_id), 'field_id': str(field_id), 'file': (io.BytesIO(PDF_BYTES), name)}
+    if upload_session:
+        data['upload_session'] = upload_session
+    return client.post(f'/api/student/forms/{form_id}/upload-file', data=data, content_type='multipart/form-data')
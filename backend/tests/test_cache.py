@@ -0,0 +1,93 @@
+"""
+Cache facade over both backends (Redis through the in-memory stand-in), and
+the app's invalidation on commit.
+"""
+
+import time
+
+import pytest
+
+import app as portal
+from cache import Cache, LocalCache, MemoryRedis, RedisCache
+
+@pytest.fixture(params=['local', 'redis'])
+def cache(request):
+    backend = LocalCache(100) if request.param == 'local' else RedisCache(MemoryRedis())
+    return Cache(backend, default_ttl=60, lock_seconds=0.2, poll_seconds=0.01)
+
+def test_tags_invalidate_entries(cache):
+    cache.set('student:1', {'name': 'Asha'}, tags=('student:1', 'students'))
+    cache.set('student:2', {'name': 'Ravi'}, tags=('student:2', 'students'))
+    assert cache.get('student:1', tags=('student:1', 'students')) == {'name': 'Asha'}
+
+    cache.invalidate('student:1')
+    assert cache.get('student:1', tags=('student:1', 'students')) is None
+    assert cache.get('student:2', tags=('student:2', 'students')) == {'name': 'Ravi'}
+
+    cache.invalidate('students')
+    assert cache.get('student:2', tags=('student:2', 'students')) is None
+    assert cache.stats()['student'] == {'hits': 2, 'misses': 2, 'waits': 0}
+
+def test_ttl_expires_entries(cache):
+    cache.set('report:1', 'rows', ttl=0.05)
+    assert cache.get('report:1') == 'rows'
+    time.sleep(0.1)
+    assert cache.get('report:1') is None
+
+def test_get_or_set_computes_once(cache):
+    calls = []
+    producer = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_set('count:1', producer, tags=('counts',)) == 1
+    assert cache.get_or_set('count:1', producer, tags=('counts',)) == 1
+    cache.invalidate('counts')
+    assert cache.get_or_set('count:1', producer, tags=('counts',)) == 2
+
+def test_invalidation_during_fill_leaves_entry_stale(cache):
+    def producer():
+        cache.invalidate('counts')  # A write commits while the value is computed
+        return 'stale'
+    assert cache.get_or_set('count:1', producer, tags=('counts',)) == 'stale'
+    assert cache.get('count:1', tags=('counts',)) is None
+
+def test_held_fill_lock_times_out(cache):
+    cache.backend.add('lock:count:1', 1, 10)  # Another caller is computing the entry
+    assert cache.get_or_set('count:1', lambda: 'computed') == 'computed'
+    assert cache.stats()['count']['waits'] == 1
+
+def test_local_cache_is_bounded():
+    backend = LocalCache(2)
+    backend.set('a', 1)
+    backend.set('b', 2)
+    backend.get('a')  # Most recently used now
+    backend.set('c', 3)
+    assert backend.get_many(['a', 'b', 'c']) == [1, None, 3]
+
+def test_tags_are_invalidated_only_on_commit(app):
+    cache = portal.cache
+    cache.set('student:1', 'cached', tags=('students',))
+
+    portal.bump_data_version('students')
+    portal.db.session.rollback()
+    assert cache.get('student:1', tags=('students',)) == 'cached'
+
+    portal.bump_data_version('students')
+    portal.db.session.commit()
+    assert cache.get('student:1', tags=('students',)) is None
+
+def test_local_entries_follow_other_workers_writes(client, department):
+    student_id = department.student_ids[0]
+    assert portal.student_profile(student_id)['name'] == 'Student 0'
+
+    # Another worker renames the student; its tag invalidation never reaches this process
+    student = portal.db.session.get(portal.Student, student_id)
+    student.name = 'Renamed'
+    portal.bump_data_version('students')
+    portal.db.session.info.pop('invalidate_tags')
+    portal.db.session.commit()
+    assert portal.student_profile(student_id)['name'] == 'Renamed'
+
+def test_shared_backend_keys_are_unversioned(app, monkeypatch):
+    monkeypatch.setattr(portal, 'cache', Cache(RedisCache(MemoryRedis())))
+    assert portal.cache_key('student:1', 'students') == 'student:1'
+    monkeypatch.setattr(portal, 'cache', Cache(LocalCache(10)))
+    assert portal.cache_key('student:1', 'students') == 'student:1@0'
@@ -0,0 +1,84 @@
+"""
+Events are numbered in commit order, replayed after a client's last seen id,
+and replaced by a resync when too many were missed.
+"""
+
+import app as portal
+
+def publish(department, *titles):
+    for title in titles:
+        portal.publish_event(f'students:{department.branch}', 'form-created', {'title': title})
+    portal.db.session.commit()
+    portal.sequence_events()
+
+def stream_ids(response):
+    """Return (id, type) of every message in an event stream"""
+    blocks = response.get_data(as_text=True).split('\n\n')
+    messages = [dict(line.split(': ', 1) for line in block.splitlines()) for block in blocks if block.startswith('id: ')]
+    return [(int(message['id']), message['event']) for message in messages]
+
+def test_late_commits_are_numbered_after_delivered_events(app, department):
+    channels = [f'students:{department.branch}']
+    portal.db.session.add(portal.Event(id=10, channel=channels[0], type='form-created', data='{}'))
+    portal.db.session.commit()
+    portal.sequence_events()
+
+    # An event that took its id earlier but commits later
+    portal.db.session.add(portal.Event(id=5, channel=channels[0], type='form-closed', data='{}'))
+    portal.db.session.commit()
+    assert portal.events_after(channels, 1, 10) == []  # Not visible until sequenced
+    portal.sequence_events()
+    assert [event['type'] for event in portal.events_after(channels, 1, 10)] == ['form-closed']
+    assert portal.db.session.get(portal.Event, 5).seq == 2
+
+def test_pump_dispatches_in_sequence(app, department):
+    publish(department, 'before')
+    portal.pump_events()  # Starts from the latest event
+    subscription = portal.event_hub.subscribe([f'students:{department.branch}'])
+    publish(department, 'one', 'two')
+    portal.pump_events()
+    assert [event['id'] for event in subscription.drain()] == [2, 3]
+
+def test_stream_replays_after_last_event_id(client, department, monkeypatch):
+    monkeypatch.setitem(portal.app.config, 'EVENT_STREAM_SECONDS', 0)  # Only the replay
+    publish(department, 'one', 'two', 'three')
+    response = client.get(
+        '/api/events/stream', query_string={'student_id': department.student_ids[0]}, headers={'Last-Event-ID': '1'}
+    )
+    assert response.mimetype == 'text/event-stream'
+    assert stream_ids(response) == [(2, 'form-created'), (3, 'form-created')]
+    assert portal.event_hub.subscriber_count() == 0
+
+def test_stream_resyncs_when_too_far_behind(client, department, monkeypatch):
+    monkeypatch.setitem(portal.app.config, 'EVENT_STREAM_SECONDS', 0)
+    monkeypatch.setitem(portal.app.config, 'EVENT_BACKLOG_LIMIT', 2)
+    publish(department, 'one', 'two', 'three')
+    response = client.get(
+        '/api/events/stream', query_string={'student_id': department.student_ids[0], 'last_event_id': '0'}
+    )
+    assert stream_ids(response) == [(3, 'resync')]
+
+def poll(client, department, **args):
+    return client.get('/api/events/poll', query_string={'student_id': department.student_ids[0], 'timeout': 0, **args})
+
+def test_poll_replays_and_resyncs(client, department, monkeypatch):
+    publish(department, 'one', 'two', 'three')
+    assert poll(client, department).get_json() == {'events': [], 'last_id': 3}
+
+    data = poll(client, department, after=1).get_json()
+    assert [(event['id'], event['data']['title']) for event in data['events']] == [(2, 'two'), (3, 'three')]
+    assert data['last_id'] == 3
+
+    monkeypatch.setitem(portal.app.config, 'EVENT_BACKLOG_LIMIT', 2)
+    assert poll(client, department, after=0).get_json() == {'events': [], 'last_id': 3, 'resync': True}
+
+def test_poll_answers_at_once_when_slots_are_full(client, department, monkeypatch):
+    monkeypatch.setattr(portal.event_hub, 'max_subscribers', 0)
+    publish(department, 'one')
+    response = poll(client, department, after=1, timeout=30)
+    assert response.status_code == 200
+    assert response.get_json() == {'events': [], 'last_id': 1}
+    assert response.headers['Retry-After'] == str(portal.app.config['EVENT_BUSY_RETRY_SECONDS'])
+
+    stream = client.get('/api/events/stream', query_string={'student_id': department.student_ids[0]})
+    assert stream.status_code == 503
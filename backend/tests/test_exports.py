@@ -0,0 +1,55 @@
+"""
+CSV and NDJSON export encoders and the streamed students download.
+"""
+
+import csv
+import gzip
+import io
+import json
+
+from exports import csv_chunks, ndjson_chunks
+
+COLUMNS = [('name', 'Name'), ('tags', 'Tags'), ('note', 'Note')]
+
+RECORDS = [
+    {'name': 'Asha', 'tags': ['web', 'ml'], 'note': 'says "hi", twice', 'ignored': 1},
+    {'name': 'Ravi', 'tags': [], 'note': None},
+]
+
+def test_csv_header_quoting_and_lists():
+    data = b''.join(csv_chunks(COLUMNS, RECORDS)).decode('utf-8')
+    assert list(csv.reader(io.StringIO(data))) == [
+        ['Name', 'Tags', 'Note'],
+        ['Asha', 'web, ml', 'says "hi", twice'],
+        ['Ravi', '', ''],
+    ]
+
+def test_ndjson_selects_columns():
+    lines = b''.join(ndjson_chunks(COLUMNS, RECORDS)).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'name': 'Asha', 'tags': ['web', 'ml'], 'note': 'says "hi", twice'},
+        {'name': 'Ravi', 'tags': [], 'note': None},
+    ]
+
+def test_large_exports_are_chunked():
+    records = ({'name': f'Student {i}', 'tags': [], 'note': 'x' * 100} for i in range(2000))
+    chunks = list(csv_chunks(COLUMNS, records))
+    assert len(chunks) > 1
+    assert b''.join(chunks).count(b'\n') == 2001
+
+def test_students_download_streams_csv(client, department):
+    response = client.get('/api/admin/students/download', query_string={'type': 'csv', 'branch': department.branch})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'students_report.csv' in response.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0][:3] == ['ID', 'Name', 'Roll Number']
+    assert len(rows) == 1 + len(department.student_ids)
+
+def test_students_download_gzips_ndjson(client, department):
+    response = client.get(
+        '/api/admin/students/download', query_string={'type': 'ndjson'}, headers={'Accept-Encoding': 'gzip'}
+    )
+    assert response.headers['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(response.get_data()).decode('utf-8').splitlines()
+    assert sorted(json.loads(line)['rollnumber'] for line in lines) == ['24TEST0000', '24TEST0001', '24TEST0002']
@@ -0,0 +1,45 @@
+"""
+Deleting a form tombstones it at once and the reaper removes its files and
+rows in batches.
+"""
+
+import app as portal
+from conftest import submit, upload_form_file
+
+FILE_FIELDS = [{'id': 1, 'label': 'Resume', 'type': 'file'}]
+
+def test_delete_tombstones_then_reaps(client, department, make_form, monkeypatch):
+    form_id = make_form(FILE_FIELDS)
+    for student_id in department.student_ids:
+        filename = upload_form_file(client, form_id, student_id, 1).get_json()['filename']
+        assert submit(client, form_id, student_id, {'1': filename}).status_code == 201
+
+    # Nothing is reaped during the request; the tombstone alone hides the form
+    monkeypatch.setattr(portal, 'submit_task', lambda *args, **kwargs: None)
+    response = client.delete(f'/api/admin/forms/{form_id}', query_string={'admin_id': department.admin_id})
+    assert response.status_code == 202
+    assert response.get_json()['deletion']['responses_total'] == 3
+    assert client.get('/api/admin/forms', query_string={'admin_id': department.admin_id}).get_json()['forms'] == []
+    assert portal.get_storage().has_prefix(portal.form_prefix(form_id))
+
+    monkeypatch.setitem(portal.app.config, 'FORM_REAPER_BATCH_SIZE', 2)  # Several batches
+    portal.reap_deleted_forms()
+
+    status = client.get(f'/api/admin/forms/{form_id}/deletion', query_string={'admin_id': department.admin_id}).get_json()
+    assert status['deletion']['status'] == 'Done'
+    assert status['deletion']['responses_deleted'] == 3
+    assert status['deletion']['files_deleted'] == 3
+    assert not portal.get_storage().has_prefix(portal.form_prefix(form_id))
+    assert portal.FormResponse.query.filter_by(form_id=form_id).count() == 0
+    assert portal.FormAnswer.query.count() == 0
+    assert portal.FormFieldCount.query.filter_by(form_id=form_id).count() == 0
+    assert portal.db.session.get(portal.Form, form_id) is None
+
+def test_claimed_deletion_is_not_reaped_twice(client, department, make_form, monkeypatch):
+    form_id = make_form()
+    monkeypatch.setattr(portal, 'submit_task', lambda *args, **kwargs: None)
+    client.delete(f'/api/admin/forms/{form_id}', query_string={'admin_id': department.admin_id})
+    deletion = portal.FormDeletion.query.filter_by(form_id=form_id).one()
+
+    assert portal.claim_form_deletion(deletion.id)
+    assert not portal.claim_form_deletion(deletion.id)  # Running and its lease is fresh
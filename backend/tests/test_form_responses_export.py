@@ -0,0 +1,45 @@
+"""
+The form responses workbook checks every uploaded file against a single
+storage listing.
+"""
+
+import io
+
+import openpyxl
+
+import app as portal
+from conftest import submit, upload_form_file
+
+FIELDS = [
+    {'id': 1, 'label': 'Resume', 'type': 'file'},
+    {'id': 2, 'label': 'Track', 'type': 'radio', 'options': ['Web', 'ML']},
+]
+
+def test_workbook_links_stored_files_with_one_listing(client, department, make_form, monkeypatch):
+    form_id = make_form(FIELDS)
+    for student_id in department.student_ids:
+        filename = upload_form_file(client, form_id, student_id, 1).get_json()['filename']
+        assert submit(client, form_id, student_id, {'1': filename, '2': 'Web'}).status_code == 201
+
+    # Lose one response's file
+    storage = portal.get_storage()
+    first = portal.FormResponse.query.filter_by(form_id=form_id).order_by(portal.FormResponse.id).first()
+    storage.delete_prefix(portal.form_response_prefix(form_id, first.id))
+
+    listings = []
+    list_prefix = storage.list_prefix
+    monkeypatch.setattr(storage, 'list_prefix', lambda prefix: listings.append(prefix) or list_prefix(prefix))
+    monkeypatch.setattr(storage, 'exists', None)  # Any per-file check would fail
+
+    response = client.get(f'/api/admin/forms/{form_id}/responses/download', query_string={'admin_id': department.admin_id})
+    assert response.status_code == 200
+    assert listings == [portal.form_prefix(form_id)]
+
+    sheet = openpyxl.load_workbook(io.BytesIO(response.get_data())).active
+    rows = list(sheet.iter_rows(min_row=2, values_only=True))
+    assert len(rows) == 3
+    assert rows[0][4].startswith('File not found: ')
+    assert all(row[4].startswith('=HYPERLINK(') for row in rows[1:])
+    assert [row[5] for row in rows] == ['Web'] * 3
+    # Columns are sized from the data
+    assert sheet.column_dimensions['C'].width > len('Student Email')
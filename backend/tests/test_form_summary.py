@@ -0,0 +1,70 @@
+"""
+Submitted answers land in form_answers and the summary counters, which the
+summary and responses endpoints read instead of the raw responses.
+"""
+
+import pytest
+
+import app as portal
+from conftest import submit
+
+ANSWERS = [
+    {'1': 'Web', '2': ['git', 'docker'], '3': 'Great'},
+    {'1': 'ML', '2': ['git'], '3': ''},
+    {'1': 'Web', '2': ['git', 'k8s']},
+]
+
+def submit_all(client, department, form_id):
+    for student_id, answers in zip(department.student_ids, ANSWERS):
+        assert submit(client, form_id, student_id, answers).status_code == 201
+
+def summary(client, department, form_id):
+    response = client.get(f'/api/admin/forms/{form_id}/summary', query_string={'admin_id': department.admin_id})
+    assert response.status_code == 200
+    return response.get_json()
+
+def options(data, field_id):
+    field = next(field for field in data['fields'] if field['id'] == field_id)
+    return {option['value']: option['count'] for option in field['options']}
+
+@pytest.mark.parametrize('upsert', [True, False], ids=['upsert', 'update-or-insert'])
+def test_counters_follow_submissions(client, department, make_form, monkeypatch, upsert):
+    if not upsert:
+        monkeypatch.setattr(portal, 'UPSERT_INSERTS', {})
+    form_id = make_form()
+    submit_all(client, department, form_id)
+
+    assert portal.FormAnswer.query.filter_by(form_id=form_id).count() == 9
+    data = summary(client, department, form_id)
+    assert data['total_responses'] == 3
+    assert data['eligible_students'] == 3
+    assert data['response_rate'] == 100.0
+    assert [field['answered'] for field in data['fields']] == [3, 3, 1]
+    assert options(data, 1) == {'Web': 2, 'ML': 1}
+    assert options(data, 2) == {'git': 3, 'docker': 1, 'k8s': 1}
+    assert [day['cumulative'] for day in data['daily']] == [3]
+
+def test_rebuild_matches_incremental_counters(client, department, make_form):
+    form_id = make_form()
+    submit_all(client, department, form_id)
+    before = summary(client, department, form_id)
+
+    portal.rebuild_form_summary(form_id)
+    portal.db.session.commit()
+    assert summary(client, department, form_id) == before
+
+def test_responses_filter_on_answers(client, department, make_form):
+    form_id = make_form()
+    submit_all(client, department, form_id)
+
+    def responses(**args):
+        response = client.get(
+            f'/api/admin/forms/{form_id}/responses', query_string={'admin_id': department.admin_id, **args}
+        )
+        return response.get_json()
+
+    assert responses()['total'] == 3  # From the daily counters
+    matched = responses(answer_1='Web', answer_2='git')
+    assert matched['total'] == 2
+    assert [record['responses']['1'] for record in matched['responses']] == ['Web', 'Web']
+    assert responses(answer_2='k8s', limit=0)['total'] == 1
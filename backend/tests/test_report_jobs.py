@@ -0,0 +1,73 @@
+"""
+Data version counters, and report jobs reused while their data is unchanged
+and evicted once expired.
+"""
+
+from datetime import timedelta
+
+import app as portal
+
+def versions():
+    return dict(portal.db.session.query(portal.DataVersion.name, portal.DataVersion.version))
+
+def bump(*names):
+    portal.bump_data_version(*names)
+    portal.db.session.commit()
+
+def test_bump_upserts_counters(app):
+    bump('students')
+    bump('students', 'certificates')
+    assert versions() == {'students': 2, 'certificates': 1}
+    assert portal.current_data_version('certificates', 'students', 'forms') == '1.2.0'
+
+def test_bump_without_upsert_support(app, monkeypatch):
+    monkeypatch.setattr(portal, 'UPSERT_INSERTS', {})
+    assert not portal.supports_upsert()
+    bump('students')
+    bump('students', 'forms')
+    assert versions() == {'students': 2, 'forms': 1}
+
+def request_report(client, department, **filters):
+    return client.post('/api/admin/reports', json={
+        'admin_id': department.admin_id, 'kind': 'students', 'type': 'csv', 'filters': filters
+    })
+
+def test_job_is_reused_until_its_data_changes(client, department):
+    first = request_report(client, department, branch=department.branch)
+    assert first.status_code == 202
+    job = client.get(f"/api/admin/reports/{first.get_json()['job']['id']}").get_json()['job']
+    assert job['status'] == 'Done' and job['total_rows'] == 3
+
+    again = request_report(client, department, branch=department.branch)
+    assert again.status_code == 200
+    assert again.get_json()['job']['id'] == job['id']
+
+    # Other filters are another report
+    assert request_report(client, department, year='II').status_code == 202
+
+    bump('students')
+    fresh = request_report(client, department, branch=department.branch)
+    assert fresh.status_code == 202
+    assert fresh.get_json()['job']['id'] != job['id']
+
+    download = client.get(f"/api/admin/reports/{job['id']}/download")
+    assert download.status_code == 200
+    assert download.get_data(as_text=True).count('\n') == 4
+
+def test_expired_jobs_are_evicted_with_their_artifacts(client, department):
+    expired = request_report(client, department, branch=department.branch).get_json()['job']['id']
+    kept = request_report(client, department, year='II').get_json()['job']['id']
+    job = portal.db.session.get(portal.ReportJob, expired)
+    job.expires_at = portal.utcnow_naive() - timedelta(seconds=1)
+    portal.db.session.commit()
+
+    # An expired job is no longer handed out
+    assert request_report(client, department, branch=department.branch).get_json()['job']['id'] != expired
+
+    portal.evict_report_jobs()
+    storage = portal.get_storage()
+    assert portal.db.session.get(portal.ReportJob, expired) is None
+    assert not storage.has_prefix(f'reports/{expired}/')
+    assert client.get(f'/api/admin/reports/{expired}').status_code == 404
+    assert storage.has_prefix(f'reports/{kept}/')
+    assert client.get(f'/api/admin/reports/{kept}').get_json()['job']['status'] == 'Done'
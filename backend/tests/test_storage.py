@@ -0,0 +1,121 @@
+"""
+Storage backend contract, run against the local filesystem and against
+S3Storage on the in-memory S3 stand-in (the same code path used with MinIO).
+
+Usage: cd backend && python -m pytest tests  (or python -m unittest discover tests)
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from storage import LocalStorage, MemoryS3, S3Storage, create_storage
+
+class StorageContract:
+    """Checks every backend must pass; subclasses provide make_storage()"""
+
+    def setUp(self):
+        self.storage = self.make_storage()
+
+    def put(self, key, data=b'%PDF-1.4 test'):
+        self.storage.put(key, io.BytesIO(data), 'application/pdf')
+
+    def test_put_stat_and_read(self):
+        self.put('ab/cd/one.pdf', b'hello')
+        obj = self.storage.stat('ab/cd/one.pdf')
+        self.assertEqual(obj.size, 5)
+        self.assertGreater(obj.modified, 0)
+        self.assertEqual(self.storage.read('ab/cd/one.pdf'), b'hello')
+        self.assertEqual(b''.join(obj.chunks(2)), b'hello')
+
+    def test_missing_key(self):
+        self.assertIsNone(self.storage.stat('ab/cd/missing.pdf'))
+        self.assertFalse(self.storage.exists('ab/cd/missing.pdf'))
+        with self.assertRaises(FileNotFoundError):
+            self.storage.fetch('ab/cd/missing.pdf')
+
+    def test_fetch_streams_content(self):
+        self.put('ab/cd/one.pdf', b'x' * 10)
+        obj = self.storage.fetch('ab/cd/one.pdf', chunk_size=4)
+        self.assertEqual(obj.size, 10)
+        self.assertEqual([len(chunk) for chunk in obj.chunks()], [4, 4, 2])
+
+    def test_list_prefix(self):
+        for key in ('forms/1/temp/a.pdf', 'forms/1/staging/2/session01/b.pdf', 'forms/10/temp/c.pdf', 'ab/cd/d.pdf'):
+            self.put(key)
+        self.assertEqual(
+            sorted(obj.key for obj in self.storage.list_prefix('forms/1/')),
+            ['forms/1/staging/2/session01/b.pdf', 'forms/1/temp/a.pdf']
+        )
+        self.assertEqual(len(list(self.storage.list_prefix('forms/'))), 3)
+        self.assertTrue(self.storage.has_prefix('forms/10/'))
+        self.assertFalse(self.storage.has_prefix('forms/2/'))
+
+    def test_move_while_listing(self):
+        # migrate_uploads moves files while it consumes the listing lazily
+        for i in range(5):
+            self.put(f'forms/4/{i}/doc.pdf')
+        for obj in self.storage.list_prefix('forms/'):
+            if '/responses/' not in obj.key:
+                self.storage.move(obj.key, obj.key.replace('forms/4/', 'forms/4/responses/'))
+        self.assertEqual(
+            sorted(obj.key for obj in self.storage.list_prefix('forms/')),
+            [f'forms/4/responses/{i}/doc.pdf' for i in range(5)]
+        )
+
+    def test_move_and_delete(self):
+        self.put('forms/1/temp/a.pdf', b'data')
+        self.storage.move('forms/1/temp/a.pdf', 'forms/1/responses/ab/5/a.pdf')
+        self.assertFalse(self.storage.exists('forms/1/temp/a.pdf'))
+        self.assertEqual(self.storage.read('forms/1/responses/ab/5/a.pdf'), b'data')
+        self.storage.delete('forms/1/responses/ab/5/a.pdf')
+        self.assertFalse(self.storage.exists('forms/1/responses/ab/5/a.pdf'))
+        self.storage.delete('forms/1/responses/ab/5/a.pdf')  # Deleting twice is fine
+
+    def test_delete_prefix(self):
+        for i in range(5):
+            self.put(f'forms/3/staging/7/session01/{i}.pdf')
+        self.put('forms/3/staging/8/session02/keep.pdf')
+        self.storage.delete_prefix('forms/3/staging/7/session01/')
+        self.assertEqual(
+            [obj.key for obj in self.storage.list_prefix('forms/3/')],
+            ['forms/3/staging/8/session02/keep.pdf']
+        )
+
+class LocalStorageTest(StorageContract, unittest.TestCase):
+    def make_storage(self):
+        workspace = tempfile.TemporaryDirectory()
+        self.addCleanup(workspace.cleanup)
+        return LocalStorage(workspace.name)
+
+class S3StorageTest(StorageContract, unittest.TestCase):
+    def make_storage(self):
+        # Small pages so listings and prefix deletes cross page boundaries
+        return S3Storage('sat-portal-uploads', MemoryS3(page_size=2))
+
+    def test_create_storage_with_memory_endpoint(self):
+        storage = create_storage({'STORAGE_BACKEND': 's3', 'S3_BUCKET': 'uploads', 'S3_ENDPOINT_URL': 'memory://'})
+        self.assertIsInstance(storage.client, MemoryS3)
+
+    def test_fetch_uses_one_request(self):
+        self.put('ab/cd/one.pdf')
+        calls = []
+        get_object = self.storage.client.get_object
+        self.storage.client.get_object = lambda **kwargs: calls.append(kwargs) or get_object(**kwargs)
+        self.storage.client.head_object = None  # Any HEAD would fail
+        obj = self.storage.fetch('ab/cd/one.pdf')
+        self.assertEqual(b''.join(obj.chunks()), b'%PDF-1.4 test')
+        self.assertEqual(len(calls), 1)
+
+    def test_presigned_url_falls_back_to_streaming(self):
+        self.put('ab/cd/one.pdf')
+        self.assertIsNone(self.storage.presigned_url('ab/cd/one.pdf', 60))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+The student home endpoint answers revalidations with 304 until a write
+bumps one of the data versions it depends on.
+"""
+
+import app as portal
+from conftest import submit
+
+def home(client, student_id, etag=None):
+    headers = {'If-None-Match': etag} if etag else {}
+    return client.get('/api/student/home', query_string={'student_id': student_id}, headers=headers)
+
+def fail(*args, **kwargs):
+    raise AssertionError('should not be called')
+
+def test_revalidation_skips_the_view(client, department, make_form, monkeypatch):
+    make_form()
+    student_id = department.student_ids[0]
+    first = home(client, student_id)
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    etag = first.headers['ETag'].strip('"')
+    assert first.get_json()['unresponded_count'] == 1
+
+    monkeypatch.setattr(portal, 'student_open_forms', fail)
+    revalidated = home(client, student_id, etag)
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+    assert revalidated.headers['ETag'].strip('"') == etag
+
+    # A plain GET is served from the response cache
+    cached = home(client, student_id)
+    assert cached.status_code == 200
+    assert cached.get_json() == first.get_json()
+
+def test_writes_change_the_etag(client, department, make_form):
+    form_id = make_form()
+    student_id = department.student_ids[0]
+    etag = home(client, student_id).headers['ETag'].strip('"')
+    assert home(client, department.student_ids[1]).headers['ETag'].strip('"') != etag
+
+    assert submit(client, form_id, student_id, {'1': 'Web'}).status_code == 201
+    after = home(client, student_id, etag)
+    assert after.status_code == 200
+    assert after.headers['ETag'].strip('"') != etag
+    assert after.get_json()['unresponded_count'] == 0
+
+def test_errors_are_not_cached(client, department, monkeypatch):
+    monkeypatch.setattr(portal.response_cache, 'put', fail)
+    missing = home(client, 9999)
+    assert missing.status_code == 404
+    assert 'ETag' not in missing.headers
@@ -28,5 +28,10 @@ def validate_password(password):
     return True, "Password is valid"
 
 def format_datetime(dt):
-    """Format datetime for display"""
-    return dt.strftime('%Y-%m-%d %H:%M:%S') if dt else None 
\ No newline at end of file
+    """Format datetime for display as YYYY-MM-DD HH:MM:SS"""
+    # isoformat renders the same text as strftime at a fraction of the cost
+    return dt.isoformat(' ', 'seconds') if dt else None
+
+def format_date(d):
+    """Format date for display as YYYY-MM-DD"""
+    return d.isoformat() if d else None
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Navbar, Nav, Container, Dropdown, Badge } from 'react-bootstrap';
 import { useNavigate, useLocation } from 'react-router-dom';
-import { studentAPI, adminAPI } from '../services/api';
+import { studentAPI, adminAPI, subscribeEvents } from '../services/api';
 
 const NavigationBar = ({ user, userType, onLogout, onShowProfile, onShowMessage }) => {
   const navigate = useNavigate();
@@ -14,17 +14,25 @@ const NavigationBar = ({ user, userType, onLogout, onShowProfile, onShowMessage
     if (userType === 'student' && user?.id) {
       const loadNotifications = async () => {
         try {
-          const response = await studentAPI.getFormNotifications(user.id);
-          setNotifications(response.data);
+          // Shares the dashboard's cached home response; unchanged polls are a 304
+          const response = await studentAPI.getHome(user.id);
+          setNotifications({
+            unresponded_count: response.data.unresponded_count,
+            forms: response.data.forms.filter(form => !form.has_responded)
+          });
         } catch (error) {
           console.error('Failed to load notifications:', error);
         }
       };
 
       loadNotifications();
-      // Refresh notifications every 30 seconds
-      const interval = setInterval(loadNotifications, 30000);
-      return () => clearInterval(interval);
+      // Reload when a form of the student's branch is created, nears its deadline or closes
+      const unsubscribe = subscribeEvents(
+        { student_id: user.id },
+        ['form-created', 'form-deadline', 'form-closed'],
+        loadNotifications
+      );
+      return unsubscribe;
     } else if (userType === 'admin' && user?.id) {
       const loadAdminMessages = async () => {
         try {
@@ -37,8 +45,12 @@ const NavigationBar = ({ user, userType, onLogout, onShowProfile, onShowMessage
       };
 
       loadAdminMessages();
-      // Refresh messages every 30 seconds
-      const interval = setInterval(loadAdminMessages, 30000);
+      // Reload when a message arrives or is read in another tab
+      const unsubscribe = subscribeEvents(
+        { admin_id: user.id },
+        ['admin-message', 'admin-message-read'],
+        loadAdminMessages
+      );
       
       // Listen for refresh events
       const handleRefresh = () => {
@@ -47,7 +59,7 @@ const NavigationBar = ({ user, userType, onLogout, onShowProfile, onShowMessage
       window.addEventListener('refreshMessages', handleRefresh);
       
       return () => {
-        clearInterval(interval);
+        unsubscribe();
         window.removeEventListener('refreshMessages', handleRefresh);
       };
     }
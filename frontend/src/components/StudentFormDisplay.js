@@ -9,6 +9,12 @@ const StudentFormDisplay = ({ form, studentId, onFormSubmitted }) => {
   const [success, setSuccess] = useState('');
   const [submittedResponses, setSubmittedResponses] = useState(null);
   const [loadingResponses, setLoadingResponses] = useState(false);
+  // Groups this visit's file uploads so the server only moves files we submit
+  const [uploadSession] = useState(() => (
+    window.crypto?.randomUUID
+      ? window.crypto.randomUUID().replace(/-/g, '')
+      : `${Date.now().toString(16)}${Math.random().toString(16).slice(2)}`
+  ));
 
   // Load submitted responses if student has already responded
   useEffect(() => {
@@ -73,7 +79,8 @@ const StudentFormDisplay = ({ form, studentId, onFormSubmitted }) => {
     try {
       await studentAPI.submitFormResponse(form.id, {
         student_id: studentId,
-        responses
+        responses,
+        upload_session: uploadSession
       });
 
       setSuccess('Form submitted successfully!');
@@ -139,6 +146,7 @@ const StudentFormDisplay = ({ form, studentId, onFormSubmitted }) => {
                     formData.append('file', file);
                     formData.append('student_id', studentId);
                     formData.append('field_id', fieldId);
+                    formData.append('upload_session', uploadSession);
                     
                     const response = await studentAPI.uploadFormFile(form.id, formData);
                     handleInputChange(fieldId, response.data.filename);
@@ -1,13 +1,83 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { 
   Row, Col, Card, Button, Table, Badge, Form, Alert, Spinner,
   Modal, Dropdown, Tabs, Tab, ButtonGroup
 } from 'react-bootstrap';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
-import { adminAPI } from '../services/api';
+import { adminAPI, studentAPI, subscribeEvents } from '../services/api';
 import FormCreationModal from '../components/FormCreationModal';
 import { useLocation, useNavigate } from 'react-router-dom';
 
+// Certificate events carry the status the certificates moved to, their ids,
+// and counts per (year, event type, previous status); previous_status is null
+// for uploads. These helpers apply them to already loaded data.
+const STATISTIC_KEYS = {
+  Pending: 'pending_certificates',
+  Approved: 'approved_certificates',
+  Rejected: 'rejected_certificates'
+};
+
+// Add delta to the entry of stats whose key is value, dropping entries that reach zero
+const adjustCount = (stats, key, value, delta) => {
+  const list = stats || [];
+  const updated = list.some((entry) => entry[key] === value)
+    ? list.map((entry) => (entry[key] === value ? { ...entry, count: entry.count + delta } : entry))
+    : [...list, { [key]: value, count: delta }];
+  return updated.filter((entry) => entry.count > 0);
+};
+
+const matchesFilters = (cert, filters) =>
+  ['year', 'event_type', 'status'].every((key) => !filters[key] || cert[key] === filters[key]);
+
+const applyDashboardDelta = (data, event) => {
+  if (!data) return data;
+  const statistics = { ...data.statistics };
+  event.groups.forEach((group) => {
+    if (group.previous_status) {
+      statistics[STATISTIC_KEYS[group.previous_status]] -= group.count;
+    } else {
+      statistics.total_certificates += group.count;
+    }
+    statistics[STATISTIC_KEYS[event.status]] += group.count;
+  });
+  const ids = new Set(event.ids);
+  let recent = data.recent_certificates.map((cert) => (ids.has(cert.id) ? { ...cert, status: event.status } : cert));
+  if (event.certificate) {
+    recent = [event.certificate, ...recent].slice(0, 10);
+  }
+  return { ...data, statistics, recent_certificates: recent };
+};
+
+// scope holds the branch, year and event type filters the analytics were loaded with
+const applyAnalyticsDelta = (analytics, event, scope) => {
+  if (!analytics) return analytics;
+  let { branch_stats, year_stats, event_stats, status_stats } = analytics;
+  event.groups
+    .filter((group) => (!scope.year || group.year === scope.year) && (!scope.event_type || group.event_type === scope.event_type))
+    .forEach((group) => {
+      if (group.previous_status) {
+        status_stats = adjustCount(status_stats, 'status', group.previous_status, -group.count);
+      } else {
+        branch_stats = adjustCount(branch_stats, 'branch', scope.branch, group.count);
+        year_stats = adjustCount(year_stats, 'year', group.year, group.count);
+        event_stats = adjustCount(event_stats, 'event_type', group.event_type, group.count);
+      }
+      status_stats = adjustCount(status_stats, 'status', event.status, group.count);
+    });
+  return { ...analytics, branch_stats, year_stats, event_stats, status_stats };
+};
+
+const applyCertificateListDelta = (list, event, filters) => {
+  const ids = new Set(event.ids);
+  let updated = list
+    .map((cert) => (ids.has(cert.id) ? { ...cert, status: event.status } : cert))
+    .filter((cert) => !ids.has(cert.id) || matchesFilters(cert, filters));
+  if (event.certificate && matchesFilters(event.certificate, filters) && !updated.some((cert) => cert.id === event.certificate.id)) {
+    updated = [event.certificate, ...updated];
+  }
+  return updated;
+};
+
 const AdminDashboard = ({ user }) => {
   const location = useLocation();
   const navigate = useNavigate();
@@ -31,9 +101,13 @@ const AdminDashboard = ({ user }) => {
   const [showResponsesModal, setShowResponsesModal] = useState(false);
   const [selectedForm, setSelectedForm] = useState(null);
   const [formResponses, setFormResponses] = useState([]);
+  const [formSummary, setFormSummary] = useState(null);
+  const [responsesTotal, setResponsesTotal] = useState(0);
+  const [responsesNextAfter, setResponsesNextAfter] = useState(null);
   const [showUnsubmittedModal, setShowUnsubmittedModal] = useState(false);
   const [unsubmitted, setUnsubmitted] = useState([]);
   const [unsubmittedCount, setUnsubmittedCount] = useState(0);
+  const [unsubmittedNextAfter, setUnsubmittedNextAfter] = useState(null);
   const [unsubmittedFilters, setUnsubmittedFilters] = useState({ year: '', section: '' });
   
   // Password change state
@@ -48,6 +122,10 @@ const AdminDashboard = ({ user }) => {
   const [superAdminView, setSuperAdminView] = useState(false);
   const [departmentName, setDepartmentName] = useState('');
 
+  // Filters of the loaded certificate list and analytics, for applying pushed changes
+  const filtersRef = useRef({});
+  const analyticsScope = useRef({});
+
   // Admin credentials mapping
   const adminCredentials = {
     'admin@cse': { branch: 'COMPUTER SCIENCE AND ENGINEERING', password: 'Cse@srit' },
@@ -97,6 +175,7 @@ const AdminDashboard = ({ user }) => {
       console.log('Setting analytics data:', analyticsRes.data);
       setDashboardData(dashboardRes.data);
       setAnalytics(analyticsRes.data);
+      analyticsScope.current = { branch };
     } catch (error) {
       setMessage('Failed to load dashboard data.');
     } finally {
@@ -120,6 +199,28 @@ const AdminDashboard = ({ user }) => {
     loadInitialData();
   }, [loadDashboardData]);
 
+  // Apply uploads and reviews in this branch, including other admins', as they happen
+  useEffect(() => {
+    const branch = superAdminView ? location.state?.forceBranch : userBranch;
+    if (!user?.id || !branch) {
+      return undefined;
+    }
+    return subscribeEvents(
+      { admin_id: user.id, branch },
+      ['certificate-uploaded', 'certificate-status'],
+      (type, event) => {
+        if (type === 'resync') {
+          loadDashboardData();
+          loadCertificates(filtersRef.current);
+          return;
+        }
+        setDashboardData((data) => applyDashboardDelta(data, event));
+        setAnalytics((data) => applyAnalyticsDelta(data, event, analyticsScope.current));
+        setCertificates((list) => applyCertificateListDelta(list, event, filtersRef.current));
+      }
+    );
+  }, [user?.id, userBranch, superAdminView, location.state?.forceBranch]);
+
   const loadCertificates = async (filters = {}) => {
     try {
       // Add department filter for department-specific admins
@@ -129,6 +230,7 @@ const AdminDashboard = ({ user }) => {
       }
       const response = await adminAPI.getCertificates(filters);
       setCertificates(response.data.certificates);
+      filtersRef.current = filters;
     } catch (error) {
       setMessage('Failed to load certificates.');
     }
@@ -181,6 +283,7 @@ const AdminDashboard = ({ user }) => {
       }
       const response = await adminAPI.getAnalytics(filters);
       setAnalytics(response.data);
+      analyticsScope.current = filters;
     } catch (error) {
       setMessage('Failed to load analytics.');
     }
@@ -231,44 +334,59 @@ const AdminDashboard = ({ user }) => {
     }
   };
 
+  // Reports are built by a background job; poll it and download the result
+  const runReportJob = async (kind, type, reportFilters) => {
+    const response = await adminAPI.createReportJob({
+      kind,
+      type,
+      filters: reportFilters,
+      admin_id: user.id
+    });
+    let job = response.data.job;
+    while (job.status === 'Pending' || job.status === 'Running') {
+      setMessage(`Generating report... ${job.progress}%`);
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      job = (await adminAPI.getReportJob(job.id)).data.job;
+    }
+    if (job.status !== 'Done') {
+      throw new Error(job.error || 'Report generation failed.');
+    }
+    const link = document.createElement('a');
+    link.href = adminAPI.getReportJobDownloadUrl(job.id);
+    link.setAttribute('download', job.download_name);
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    setMessage('');
+  };
+
   const handleReportDownload = async (type = 'excel') => {
     try {
       const branch = superAdminView ? location.state?.forceBranch : userBranch;
-      const response = await adminAPI.generateReport({
-        type,
-        ...filters,
-        branch: branch
-      });
-      
-      const url = window.URL.createObjectURL(new Blob([response.data]));
-      const link = document.createElement('a');
-      link.href = url;
-      link.setAttribute('download', `certificates_report.${type === 'excel' ? 'xlsx' : 'pdf'}`);
-      document.body.appendChild(link);
-      link.click();
-      link.remove();
+      await runReportJob('certificates', type, { ...filters, branch: branch });
     } catch (error) {
-      const errorMessage = error.response?.data?.error || 'Failed to generate report.';
+      const errorMessage = error.response?.data?.error || error.message || 'Failed to generate report.';
       setMessage(errorMessage);
     }
   };
 
+  const handleCertificatesZipDownload = () => {
+    const branch = superAdminView ? location.state?.forceBranch : userBranch;
+    const params = Object.fromEntries(
+      Object.entries({ ...filters, branch: branch }).filter(([, value]) => value)
+    );
+    const link = document.createElement('a');
+    link.href = adminAPI.getCertificatesZipUrl(params);
+    link.setAttribute('download', 'certificates.zip');
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+  };
+
   const handleStudentsDownload = async () => {
     try {
       const branch = superAdminView ? location.state?.forceBranch : userBranch;
-      const params = { branch: branch, ...studentFilters };
-      const response = await adminAPI.downloadStudentsExcel(params);
-      
-      // Create download link
-      const url = window.URL.createObjectURL(new Blob([response.data]));
-      const link = document.createElement('a');
-      link.href = url;
-      link.setAttribute('download', 'students_report.xlsx');
-      document.body.appendChild(link);
-      link.click();
-      link.remove();
-      window.URL.revokeObjectURL(url);
-      
+      await runReportJob('students', 'excel', { branch: branch, ...studentFilters });
       setMessage('Students report downloaded successfully!');
     } catch (error) {
       setMessage('Failed to download students report.');
@@ -286,21 +404,38 @@ const AdminDashboard = ({ user }) => {
 
   const handleViewResponses = async (formId) => {
     try {
-      const response = await adminAPI.getFormResponses(formId, user.id);
+      const [response, summary] = await Promise.all([
+        adminAPI.getFormResponses(formId, user.id),
+        adminAPI.getFormSummary(formId, user.id)
+      ]);
       setSelectedForm(response.data.form);
       setFormResponses(response.data.responses);
+      setResponsesTotal(response.data.total);
+      setResponsesNextAfter(response.data.next_after);
+      setFormSummary(summary.data);
       setShowResponsesModal(true);
     } catch (error) {
       setMessage('Failed to load form responses.');
     }
   };
 
+  const handleLoadMoreResponses = async () => {
+    try {
+      const response = await adminAPI.getFormResponses(selectedForm.id, user.id, { after: responsesNextAfter });
+      setFormResponses(prev => [...prev, ...response.data.responses]);
+      setResponsesNextAfter(response.data.next_after);
+    } catch (error) {
+      setMessage('Failed to load more responses.');
+    }
+  };
+
   const handleViewUnsubmitted = async (form) => {
     try {
       const res = await adminAPI.getUnsubmittedStudents(form.id, user.id, unsubmittedFilters);
       setSelectedForm(form);
       setUnsubmitted(res.data.unsubmitted || []);
       setUnsubmittedCount(res.data.count || 0);
+      setUnsubmittedNextAfter(res.data.next_after);
       setShowUnsubmittedModal(true);
     } catch (error) {
       setMessage('Failed to load unsubmitted students.');
@@ -315,10 +450,25 @@ const AdminDashboard = ({ user }) => {
         const res = await adminAPI.getUnsubmittedStudents(selectedForm.id, user.id, next);
         setUnsubmitted(res.data.unsubmitted || []);
         setUnsubmittedCount(res.data.count || 0);
+        setUnsubmittedNextAfter(res.data.next_after);
       } catch (_) {}
     }
   };
 
+  const handleLoadMoreUnsubmitted = async () => {
+    try {
+      const res = await adminAPI.getUnsubmittedStudents(selectedForm.id, user.id, {
+        ...unsubmittedFilters,
+        after: unsubmittedNextAfter
+      });
+      setUnsubmitted(prev => [...prev, ...(res.data.unsubmitted || [])]);
+      setUnsubmittedCount(res.data.count || 0);
+      setUnsubmittedNextAfter(res.data.next_after);
+    } catch (error) {
+      setMessage('Failed to load more unsubmitted students.');
+    }
+  };
+
   const handleDownloadUnsubmitted = async () => {
     if (!selectedForm) return;
     try {
@@ -615,6 +765,15 @@ const AdminDashboard = ({ user }) => {
                         <Dropdown.Item onClick={() => handleReportDownload('pdf')}>
                            PDF Report
                         </Dropdown.Item>
+                        <Dropdown.Item onClick={() => handleReportDownload('csv')}>
+                           CSV Export
+                        </Dropdown.Item>
+                        <Dropdown.Item onClick={() => handleReportDownload('ndjson')}>
+                           NDJSON Export
+                        </Dropdown.Item>
+                        <Dropdown.Item onClick={handleCertificatesZipDownload}>
+                           Certificate PDFs (ZIP)
+                        </Dropdown.Item>
                       </Dropdown.Menu>
                     </Dropdown>
                   </ButtonGroup>
@@ -731,6 +890,7 @@ const AdminDashboard = ({ user }) => {
               <Table responsive>
                 <thead>
                   <tr>
+                    <th>Preview</th>
                     <th>Student Name</th>
                     <th>Roll Number</th>
                     <th>Branch</th>
@@ -746,6 +906,16 @@ const AdminDashboard = ({ user }) => {
                 <tbody>
                   {certificates.map((cert) => (
                     <tr key={cert.id}>
+                      <td>
+                        <img
+                          src={studentAPI.getCertificatePreviewUrl(cert.id)}
+                          alt="Certificate preview"
+                          loading="lazy"
+                          width={80}
+                          style={{ border: '1px solid #dee2e6' }}
+                          onError={(e) => { e.target.style.visibility = 'hidden'; }}
+                        />
+                      </td>
                       <td>{cert.student_name}</td>
                       <td>{cert.rollnumber}</td>
                       <td>{cert.branch}</td>
@@ -1184,7 +1354,7 @@ const AdminDashboard = ({ user }) => {
             </Col>
             <Col md={6} className="d-flex align-items-end">
               <div className="text-muted">
-                <small>Showing {unsubmittedCount} unsubmitted students</small>
+                <small>Showing {unsubmitted.length} of {unsubmittedCount} unsubmitted students</small>
               </div>
             </Col>
           </Row>
@@ -1216,6 +1386,13 @@ const AdminDashboard = ({ user }) => {
               ))}
             </tbody>
           </Table>
+          {unsubmittedNextAfter && (
+            <div className="text-center">
+              <Button variant="outline-primary" onClick={handleLoadMoreUnsubmitted}>
+                Load more
+              </Button>
+            </div>
+          )}
         </Modal.Body>
         <Modal.Footer>
           <Button 
@@ -1255,7 +1432,28 @@ const AdminDashboard = ({ user }) => {
              </div>
            )}
            
-           <h6>Responses ({formResponses.length})</h6>
+           {formSummary && formSummary.total_responses > 0 && (
+             <div className="mb-4">
+               <h6>Summary</h6>
+               <p>
+                 <strong>{formSummary.total_responses}</strong> of {formSummary.eligible_students} students responded
+                 {formSummary.response_rate !== null && ` (${formSummary.response_rate}%)`}
+               </p>
+               {formSummary.fields.filter(field => field.options || field.type === 'file').map(field => (
+                 <div key={field.id} className="mb-2">
+                   <strong>{field.label}:</strong>{' '}
+                   {field.options
+                     ? field.options.map(option => `${option.value} (${option.count})`).join(', ')
+                     : `${field.files_uploaded} file(s) from ${field.answered} student(s)`}
+                 </div>
+               ))}
+               <small className="text-muted">
+                 By day: {formSummary.daily.map(day => `${day.date}: ${day.count}`).join(', ')}
+               </small>
+             </div>
+           )}
+           
+           <h6>Responses ({responsesTotal})</h6>
            {formResponses.map((response, index) => (
              <Card key={response.id} className="mb-3">
                <Card.Header>
@@ -1281,6 +1479,13 @@ const AdminDashboard = ({ user }) => {
              </Card>
            ))}
            
+           {responsesNextAfter && (
+             <div className="text-center">
+               <Button variant="outline-primary" onClick={handleLoadMoreResponses}>
+                 Load more ({formResponses.length} of {responsesTotal} shown)
+               </Button>
+             </div>
+           )}
            {formResponses.length === 0 && (
              <p className="text-muted text-center">No responses yet</p>
            )}
@@ -58,15 +58,11 @@ const StudentDashboard = ({ user }) => {
   const loadData = useCallback(async () => {
     try {
       setLoading(true);
-      const [profileRes, certificatesRes, formsRes] = await Promise.all([
-        studentAPI.getProfile(user.id),
-        studentAPI.getCertificates(user.id),
-        studentAPI.getForms(user.id)
-      ]);
+      const response = await studentAPI.getHome(user.id);
       
-      setProfile(profileRes.data);
-      setCertificates(certificatesRes.data.certificates);
-      setForms(formsRes.data.forms);
+      setProfile(response.data.profile);
+      setCertificates(response.data.certificates);
+      setForms(response.data.forms);
     } catch (error) {
       setMessage('Failed to load data. Please try again.');
     } finally {
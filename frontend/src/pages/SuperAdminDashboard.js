@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { Row, Col, Card, Button, Table, Modal, Form, Alert, Badge } from 'react-bootstrap';
+import { Row, Col, Card, Button, Table, Modal, Form, Alert, Badge, Dropdown } from 'react-bootstrap';
 import { superAdminAPI } from '../services/api';
 import { useNavigate } from 'react-router-dom';
 
@@ -66,6 +66,29 @@ const SuperAdminDashboard = ({ user }) => {
   };
 
 
+  const handleAllBranchesDownload = async (type) => {
+    try {
+      let job = (await superAdminAPI.createBranchesReportJob(type, {}, user.id)).data.job;
+      while (job.status === 'Pending' || job.status === 'Running') {
+        setMessage(`Generating reports for all departments... ${job.progress}%`);
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        job = (await superAdminAPI.getReportJob(job.id)).data.job;
+      }
+      if (job.status !== 'Done') {
+        throw new Error(job.error || 'Report generation failed.');
+      }
+      const link = document.createElement('a');
+      link.href = superAdminAPI.getReportJobDownloadUrl(job.id);
+      link.setAttribute('download', job.download_name);
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      setMessage('');
+    } catch (error) {
+      setMessage(error.response?.data?.error || error.message || 'Failed to generate reports.');
+    }
+  };
+
   const openMessageModal = (admin) => {
     setSelectedAdmin(admin);
     setMsgSubject('');
@@ -91,6 +114,19 @@ const SuperAdminDashboard = ({ user }) => {
           <h2>Super Admin Dashboard</h2>
           <p className="text-muted">Manage department admins and navigate to department dashboards</p>
         </Col>
+        <Col xs="auto" className="d-flex align-items-center">
+          <Dropdown>
+            <Dropdown.Toggle variant="success">
+              All Departments Report
+            </Dropdown.Toggle>
+            <Dropdown.Menu>
+              <Dropdown.Item onClick={() => handleAllBranchesDownload('excel')}>Excel (sheet per department)</Dropdown.Item>
+              <Dropdown.Item onClick={() => handleAllBranchesDownload('pdf')}>PDF (ZIP)</Dropdown.Item>
+              <Dropdown.Item onClick={() => handleAllBranchesDownload('csv')}>CSV (ZIP)</Dropdown.Item>
+              <Dropdown.Item onClick={() => handleAllBranchesDownload('ndjson')}>NDJSON (ZIP)</Dropdown.Item>
+            </Dropdown.Menu>
+          </Dropdown>
+        </Col>
       </Row>
 
       {message && (
@@ -1,6 +1,8 @@
 import axios from 'axios';
 
 const API_BASE_URL = 'http://localhost:5000/api';
+// Event streams may be served by a separate process (see DEPLOYMENT.md)
+const EVENTS_BASE_URL = process.env.REACT_APP_EVENTS_URL || API_BASE_URL;
 
 // Create axios instance
 const api = axios.create({
@@ -22,6 +24,9 @@ export const authAPI = {
 
 // Student API
 export const studentAPI = {
+  // Profile, certificates, open forms and notification count in one request;
+  // the browser revalidates it with the ETag and reuses the cached body on 304
+  getHome: (studentId) => api.get(`/student/home?student_id=${studentId}`),
   getProfile: (studentId) => api.get(`/student/profile?student_id=${studentId}`),
   updateProfile: (data) => api.put('/student/profile', data),
   uploadCertificate: (formData) => {
@@ -38,6 +43,8 @@ export const studentAPI = {
   viewCertificate: (certificateId) => api.get(`/student/certificate/${certificateId}/view`, {
     responseType: 'blob',
   }),
+  // Plain URL so <img> tags can load (and the browser can cache) the thumbnail
+  getCertificatePreviewUrl: (certificateId) => `${API_BASE_URL}/student/certificate/${certificateId}/preview`,
   // Form Management
   getForms: (studentId) => api.get(`/student/forms?student_id=${studentId}`),
   submitFormResponse: (formId, data) => api.post(`/student/forms/${formId}/submit`, data),
@@ -84,10 +91,26 @@ export const adminAPI = {
       responseType: 'blob',
     });
   },
+  // Background report jobs: create, poll until Done, then download
+  createReportJob: (data) => api.post('/admin/reports', data),
+  getReportJob: (jobId) => api.get(`/admin/reports/${jobId}`),
+  getReportJobDownloadUrl: (jobId) => `${API_BASE_URL}/admin/reports/${jobId}/download`,
+  // Streamed straight to disk by the browser instead of buffering a blob
+  getCertificatesZipUrl: (params) => {
+    const queryParams = new URLSearchParams(params);
+    return `${API_BASE_URL}/admin/report/zip?${queryParams}`;
+  },
   // Form Management
   createForm: (data) => api.post('/admin/forms', data),
   getForms: (adminId) => api.get(`/admin/forms?admin_id=${adminId}`),
-  getFormResponses: (formId, adminId) => api.get(`/admin/forms/${formId}/responses?admin_id=${adminId}`),
+  // params: answer_<field_id> filters, fields projection, after/limit paging
+  getFormResponses: (formId, adminId, params = {}) => api.get(`/admin/forms/${formId}/responses`, {
+    params: { admin_id: adminId, ...params }
+  }),
+  getFormSummary: (formId, adminId) => api.get(`/admin/forms/${formId}/summary?admin_id=${adminId}`),
+  getFormAnswerCounts: (formId, fieldId, adminId, answerFilters = {}) => api.get(`/admin/forms/${formId}/answers/${fieldId}/counts`, {
+    params: { admin_id: adminId, ...answerFilters }
+  }),
   downloadFormResponses: (formId, adminId) => api.get(`/admin/forms/${formId}/responses/download?admin_id=${adminId}`, {
     responseType: 'blob',
   }),
@@ -103,6 +126,7 @@ export const adminAPI = {
   },
   sendDeadlineReminders: (adminId) => api.post(`/admin/forms/send-deadline-reminders?admin_id=${adminId}`),
   deleteForm: (formId, adminId) => api.delete(`/admin/forms/${formId}?admin_id=${adminId}`),
+  getFormDeletionStatus: (formId, adminId) => api.get(`/admin/forms/${formId}/deletion?admin_id=${adminId}`),
   changePassword: (data, adminId) => api.put('/admin/change-password', data, {
     headers: { 'X-Admin-ID': adminId }
   }),
@@ -116,6 +140,79 @@ export const superAdminAPI = {
   changeAdminPassword: (adminId, newPassword) => api.put(`/superadmin/admins/${adminId}/password`, { new_password: newPassword }),
   deleteAdmin: (adminId) => api.delete(`/superadmin/admins/${adminId}`),
   sendMessageToAdmin: (adminId, subject, body) => api.post('/superadmin/messages', { admin_id: adminId, subject, body }),
+  createBranchesReportJob: (type, filters, adminId) => api.post('/admin/reports', { kind: 'branches', type, filters, admin_id: adminId }),
+  getReportJob: (jobId) => api.get(`/admin/reports/${jobId}`),
+  getReportJobDownloadUrl: (jobId) => `${API_BASE_URL}/admin/reports/${jobId}/download`,
+};
+
+// Events API: pushes form and message notifications instead of polling
+export const eventsAPI = {
+  getStreamUrl: (params) => `${EVENTS_BASE_URL}/events/stream?${new URLSearchParams(params)}`,
+  poll: (params) => api.get('/events/poll', { baseURL: EVENTS_BASE_URL, params, timeout: 60000 }),
+};
+
+// Call onEvent(type, data) for each event of the given types pushed to a
+// student ({ student_id }) or admin ({ admin_id }). Uses a server-sent event
+// stream, falling back to long polling where EventSource is unavailable or
+// the server turns the stream away because it is busy. Returns a function
+// that stops listening.
+export const subscribeEvents = (params, types, onEvent) => {
+  let stopped = false;
+  let after = '';
+
+  // Seconds to wait before the next poll, from Retry-After when the server sends one
+  const retryAfter = (headers, fallback) => {
+    const seconds = parseInt(headers && headers['retry-after'], 10);
+    return Number.isNaN(seconds) ? fallback : seconds;
+  };
+  const sleep = (seconds) => new Promise((resolve) => setTimeout(resolve, seconds * 1000));
+
+  const poll = async () => {
+    while (!stopped) {
+      try {
+        const response = await eventsAPI.poll({ ...params, after });
+        if (stopped) break;
+        if (after !== '' && response.data.resync) onEvent('resync', {});
+        response.data.events
+          .filter((event) => types.includes(event.type))
+          .forEach((event) => onEvent(event.type, event.data));
+        after = response.data.last_id;
+        // Sent when the server had no slot to hold the poll open
+        const wait = retryAfter(response.headers, 0);
+        if (wait) await sleep(wait);
+      } catch (error) {
+        console.error('Event polling failed:', error);
+        await sleep(retryAfter(error.response && error.response.headers, 5));
+      }
+    }
+  };
+
+  if (!window.EventSource) {
+    poll();
+    return () => { stopped = true; };
+  }
+
+  const source = new EventSource(eventsAPI.getStreamUrl(params));
+  types.forEach((type) => {
+    source.addEventListener(type, (e) => {
+      after = e.lastEventId;
+      onEvent(type, JSON.parse(e.data));
+    });
+  });
+  // Sent when too much was missed to replay; the caller should reload
+  source.addEventListener('resync', (e) => {
+    after = e.lastEventId;
+    onEvent('resync', {});
+  });
+  // EventSource retries dropped connections itself but gives up on error
+  // responses, such as the 503 sent when the server has no stream slots left
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED && !stopped) poll();
+  };
+  return () => {
+    stopped = true;
+    source.close();
+  };
 };
 
 export default api; 
\ No newline at end of file